@@ -0,0 +1,101 @@
+"""
+Accounts for Productivity Dashboard
+Salted PBKDF2 password hashes per user id, kept in one small SQLite file
+"""
+
+import hashlib
+import hmac
+import os
+import sqlite3
+import threading
+from typing import Optional
+
+from registry import normalize_user_id
+
+# Kept next to the per-user databases in the registry's data directory
+ACCOUNTS_FILE = "accounts.db"
+
+MIN_PASSWORD_LENGTH = 8
+
+_ITERATIONS = 600_000
+
+
+def _hash(password: str, salt: bytes, iterations: int) -> bytes:
+    return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
+
+
+class AccountStore:
+    """Thread-safe user id -> password hash store
+
+    Unknown users are checked against a dummy hash, so a failed sign-in takes
+    the same time whether or not the user exists.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS accounts (
+                user_id TEXT PRIMARY KEY,
+                salt BLOB NOT NULL,
+                iterations INTEGER NOT NULL,
+                password_hash BLOB NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        self._dummy_salt = os.urandom(16)
+
+    def _row(self, user_id: str) -> Optional[tuple]:
+        with self._lock:
+            return self._conn.execute(
+                'SELECT salt, iterations, password_hash FROM accounts WHERE user_id = ?',
+                (user_id,)
+            ).fetchone()
+
+    def __contains__(self, user_id: str) -> bool:
+        return self._row(normalize_user_id(user_id)) is not None
+
+    def set_password(self, user_id: str, password: str):
+        """Create the account or change its password; raises ValueError for a short password"""
+        self._store(user_id, password, '''
+            ON CONFLICT (user_id) DO UPDATE SET
+                salt = excluded.salt, iterations = excluded.iterations,
+                password_hash = excluded.password_hash
+        ''')
+
+    def create(self, user_id: str, password: str):
+        """Create a new account; raises ValueError if the user id is taken"""
+        try:
+            self._store(user_id, password)
+        except sqlite3.IntegrityError:
+            raise ValueError("That user name is taken") from None
+
+    def _store(self, user_id: str, password: str, on_conflict: str = ""):
+        if len(password or "") < MIN_PASSWORD_LENGTH:
+            raise ValueError(f"Passwords are at least {MIN_PASSWORD_LENGTH} characters")
+        user_id = normalize_user_id(user_id)
+        salt = os.urandom(16)
+        digest = _hash(password, salt, _ITERATIONS)
+        with self._lock:
+            self._conn.execute(
+                'INSERT INTO accounts (user_id, salt, iterations, password_hash) VALUES (?, ?, ?, ?)'
+                + on_conflict,
+                (user_id, salt, _ITERATIONS, digest)
+            )
+
+    def verify(self, user_id: str, password: str) -> bool:
+        """Whether password is right for user_id (False for unknown or invalid ids)"""
+        try:
+            row = self._row(normalize_user_id(user_id))
+        except ValueError:
+            row = None
+        if row is None:
+            _hash(password or "", self._dummy_salt, _ITERATIONS)
+            return False
+        salt, iterations, digest = row
+        return hmac.compare_digest(_hash(password or "", salt, iterations), digest)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,93 @@
+"""
+Analytics queries for Productivity Dashboard
+Aggregates in SQL and returns compact {column: [values]} results, one entry per category
+Queries read the *_all views, so archived rows still count
+"""
+
+from datetime import date
+from typing import Dict, List
+
+import habit_history
+from database import Database
+
+Columns = Dict[str, List]
+
+# Statuses in workflow order, so each one keeps its chart color
+TASK_STATUSES = ("pending", "in_progress", "completed")
+
+
+def task_status_counts(db: Database) -> Columns:
+    """Number of tasks per status: {'status': [...], 'tasks': [...]}"""
+    return db.query_columns('''
+        SELECT status, SUM(tasks) AS tasks
+        FROM (
+            SELECT status, COUNT(*) AS tasks FROM tasks GROUP BY status
+            UNION ALL
+            SELECT status, COUNT(*) FROM tasks_archive GROUP BY status
+        )
+        GROUP BY status
+        ORDER BY CASE status WHEN ? THEN 0 WHEN ? THEN 1 WHEN ? THEN 2 ELSE 3 END, status
+    ''', TASK_STATUSES, tables=('tasks',))
+
+
+def daily_mood_means(db: Database, days: int = 30) -> Columns:
+    """Mean mood per calendar day over the last N days: {'day', 'mean_score', 'entries'}"""
+    return db.query_columns('''
+        SELECT date(logged_at) AS day,
+               AVG(mood_score) AS mean_score,
+               COUNT(*) AS entries
+        FROM mood_entries_all
+        WHERE logged_at >= datetime('now', ?) AND mood_score IS NOT NULL
+        GROUP BY day
+        ORDER BY day
+    ''', (f'-{int(days)} days',), tables=('mood_entries',))
+
+
+def habit_completion_rates(db: Database, days: int = 30) -> Columns:
+    """Per-habit streaks and completion rate over the last N days
+
+    Returns {'habit_id', 'name', 'frequency', 'streak', 'longest_streak',
+    'streak_unit', 'completions', 'completion_rate', 'completed_today'}. Weekly
+    and N-per-week habits count streaks in weeks, as on the Habits page. The
+    rate is a percentage of the days in the window, or of the days since the
+    habit was created if that is fewer.
+    """
+    today = date.today().isoformat()
+    rates = db.query_columns('''
+        SELECT h.id AS habit_id,
+               h.name,
+               h.frequency,
+               CASE WHEN julianday(:today) - julianday(s.last_logged_date) IN (0, 1)
+                    THEN s.current_streak ELSE 0 END AS streak,
+               COALESCE(s.longest_streak, 0) AS longest_streak,
+               COALESCE(l.completions, 0) AS completions,
+               MIN(100.0, ROUND(100.0 * COALESCE(l.completions, 0) / MAX(1, MIN(
+                   :days, julianday(:today) - julianday(date(h.created_at)) + 1
+               )), 1)) AS completion_rate,
+               COALESCE(l.last_date = :today, 0) AS completed_today
+        FROM habits h
+        LEFT JOIN habit_streaks s ON s.habit_id = h.id
+        LEFT JOIN (
+            SELECT habit_id, COUNT(*) AS completions, MAX(logged_date) AS last_date
+            FROM habit_logs_all
+            WHERE completed = 1
+              AND logged_date > date(:today, :window) AND logged_date <= :today
+            GROUP BY habit_id
+        ) l ON l.habit_id = h.id
+        ORDER BY h.created_at DESC
+    ''', {'today': today, 'days': int(days), 'window': f'-{int(days)} days'},
+        tables=('habits', 'habit_logs', 'habit_streaks'))
+
+    rates['streak_unit'] = ["days"] * len(rates['habit_id'])
+    # Daily streaks above come from the counters; only scheduled habits need their logs
+    scheduled = [habit_id for habit_id, frequency in zip(rates['habit_id'], rates['frequency'])
+                 if habit_history.parse_frequency(frequency)[1] > 1]
+    if scheduled:
+        histories = habit_history.load_histories(db, habit_ids=scheduled)
+        for i, habit_id in enumerate(rates['habit_id']):
+            history = histories.get(habit_id)
+            if history is not None:
+                rates['streak'][i] = history.current_streak()
+                rates['longest_streak'][i] = history.longest_streak()
+                rates['streak_unit'][i] = history.unit
+    return rates
@@ -1,1061 +1,1297 @@
-"""
-🎯 Productivity Command Center
-A comprehensive personal productivity dashboard built with Streamlit
-"""
-
-import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import pandas as pd
-from datetime import datetime, date, timedelta
-from textblob import TextBlob
-from database import Database
-
-# Page configuration
-st.set_page_config(
-    page_title="Productivity Dashboard",
-    page_icon="🎯",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
-
-# ============ MINIMAL LIGHT THEME CSS - FIXED TEXT VISIBILITY ============
-
-st.markdown("""
-<style>
-    /* Import clean font */
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap');
-    
-    /* Global text color fix */
-    * {
-        font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
-    }
-    
-    /* Main app background */
-    .stApp {
-        background-color: #f8f9fa;
-    }
-    
-    /* ===== SIDEBAR FIXES ===== */
-    section[data-testid="stSidebar"] {
-        background-color: #ffffff;
-        border-right: 1px solid #e0e0e0;
-    }
-    
-    section[data-testid="stSidebar"] * {
-        color: #1a1a1a !important;
-    }
-    
-    section[data-testid="stSidebar"] .stMarkdown p,
-    section[data-testid="stSidebar"] .stMarkdown span,
-    section[data-testid="stSidebar"] .stMarkdown h1,
-    section[data-testid="stSidebar"] .stMarkdown h2,
-    section[data-testid="stSidebar"] .stMarkdown h3,
-    section[data-testid="stSidebar"] .stMarkdown h4,
-    section[data-testid="stSidebar"] .stMarkdown h5,
-    section[data-testid="stSidebar"] .stMarkdown h6 {
-        color: #1a1a1a !important;
-    }
-    
-    section[data-testid="stSidebar"] .stRadio label {
-        color: #1a1a1a !important;
-    }
-    
-    section[data-testid="stSidebar"] .stRadio label span {
-        color: #1a1a1a !important;
-    }
-    
-    /* Sidebar metric text */
-    section[data-testid="stSidebar"] [data-testid="metric-container"] label {
-        color: #555555 !important;
-    }
-    
-    section[data-testid="stSidebar"] [data-testid="metric-container"] [data-testid="stMetricValue"] {
-        color: #1a1a1a !important;
-    }
-    
-    section[data-testid="stSidebar"] [data-testid="stMetricDelta"] {
-        color: #555555 !important;
-    }
-    
-    /* Sidebar info box */
-    section[data-testid="stSidebar"] .stAlert p {
-        color: #1a1a1a !important;
-    }
-    
-    /* ===== MAIN CONTENT TEXT FIXES ===== */
-    .stMarkdown, .stMarkdown p, .stMarkdown span, .stMarkdown li {
-        color: #1a1a1a !important;
-    }
-    
-    .stMarkdown h1, .stMarkdown h2, .stMarkdown h3, 
-    .stMarkdown h4, .stMarkdown h5, .stMarkdown h6 {
-        color: #1a1a1a !important;
-    }
-    
-    /* Strong/Bold text */
-    .stMarkdown strong, .stMarkdown b {
-        color: #1a1a1a !important;
-        font-weight: 600;
-    }
-    
-    /* Caption text */
-    .stCaption, .stMarkdown small, .stCaptionContainer {
-        color: #555555 !important;
-    }
-    
-    /* ===== METRIC CONTAINERS ===== */
-    [data-testid="metric-container"] {
-        background: #ffffff;
-        border: 1px solid #e0e0e0;
-        border-radius: 10px;
-        padding: 1rem;
-    }
-    
-    [data-testid="metric-container"] label {
-        color: #555555 !important;
-    }
-    
-    [data-testid="metric-container"] [data-testid="stMetricValue"] {
-        color: #1a1a1a !important;
-        font-weight: 600;
-    }
-    
-    [data-testid="metric-container"] [data-testid="stMetricDelta"] {
-        color: #666666 !important;
-    }
-    
-    /* ===== INPUT FIELDS ===== */
-    .stTextInput label, .stTextArea label, .stSelectbox label,
-    .stSlider label, .stDateInput label, .stNumberInput label {
-        color: #1a1a1a !important;
-        font-weight: 500;
-    }
-    
-    .stTextInput input, .stTextArea textarea {
-        color: #1a1a1a !important;
-        background-color: #ffffff !important;
-        border: 1px solid #d0d0d0 !important;
-    }
-    
-    .stTextInput input::placeholder, .stTextArea textarea::placeholder {
-        color: #888888 !important;
-    }
-    
-    /* Select box */
-    .stSelectbox > div > div {
-        color: #1a1a1a !important;
-        background-color: #ffffff !important;
-    }
-    
-    .stSelectbox [data-baseweb="select"] {
-        background-color: #ffffff;
-    }
-    
-    .stSelectbox [data-baseweb="select"] * {
-        color: #1a1a1a !important;
-    }
-    
-    /* Number input */
-    .stNumberInput input {
-        color: #1a1a1a !important;
-        background-color: #ffffff !important;
-    }
-    
-    /* Date input */
-    .stDateInput input {
-        color: #1a1a1a !important;
-        background-color: #ffffff !important;
-    }
-    
-    /* ===== SLIDER ===== */
-    .stSlider label {
-        color: #1a1a1a !important;
-    }
-    
-    .stSlider [data-baseweb="slider"] div {
-        color: #1a1a1a !important;
-    }
-    
-    /* ===== BUTTONS ===== */
-    .stButton > button {
-        color: #1a1a1a !important;
-        background-color: #ffffff;
-        border: 1px solid #d0d0d0;
-        font-weight: 500;
-    }
-    
-    .stButton > button:hover {
-        background-color: #f0f0f0;
-        border-color: #b0b0b0;
-        color: #1a1a1a !important;
-    }
-    
-    .stButton > button[kind="primary"],
-    .stButton > button[data-testid="baseButton-primary"] {
-        background-color: #5c6bc0 !important;
-        color: #ffffff !important;
-        border: none;
-    }
-    
-    .stButton > button[kind="primary"]:hover,
-    .stButton > button[data-testid="baseButton-primary"]:hover {
-        background-color: #4a5ab0 !important;
-        color: #ffffff !important;
-    }
-    
-    /* ===== EXPANDER ===== */
-    .streamlit-expanderHeader {
-        color: #1a1a1a !important;
-        background-color: #ffffff;
-        border: 1px solid #e0e0e0;
-        font-weight: 500;
-    }
-    
-    .streamlit-expanderHeader:hover {
-        color: #1a1a1a !important;
-    }
-    
-    .streamlit-expanderHeader p {
-        color: #1a1a1a !important;
-    }
-    
-    .streamlit-expanderContent {
-        background-color: #ffffff;
-        border: 1px solid #e0e0e0;
-        border-top: none;
-    }
-    
-    /* Expander icon */
-    .streamlit-expanderHeader svg {
-        fill: #1a1a1a !important;
-    }
-    
-    /* ===== ALERTS/INFO BOXES ===== */
-    .stAlert, [data-testid="stAlert"] {
-        background-color: #ffffff;
-        border: 1px solid #e0e0e0;
-    }
-    
-    .stAlert p, [data-testid="stAlert"] p {
-        color: #1a1a1a !important;
-    }
-    
-    /* Success alert */
-    .stSuccess, [data-testid="stAlert"][data-baseweb="notification"]:has(svg[data-testid="stIconSuccess"]) {
-        background-color: #e8f5e9 !important;
-        border-left: 4px solid #4caf50;
-    }
-    
-    .stSuccess p {
-        color: #1a1a1a !important;
-    }
-    
-    /* Info alert */
-    .stInfo {
-        background-color: #e3f2fd !important;
-        border-left: 4px solid #2196f3;
-    }
-    
-    .stInfo p {
-        color: #1a1a1a !important;
-    }
-    
-    /* Warning alert */
-    .stWarning {
-        background-color: #fff8e1 !important;
-        border-left: 4px solid #ff9800;
-    }
-    
-    .stWarning p {
-        color: #1a1a1a !important;
-    }
-    
-    /* Error alert */
-    .stError {
-        background-color: #ffebee !important;
-        border-left: 4px solid #f44336;
-    }
-    
-    .stError p {
-        color: #1a1a1a !important;
-    }
-    
-    /* ===== DATAFRAME ===== */
-    .stDataFrame {
-        background-color: #ffffff;
-    }
-    
-    .stDataFrame * {
-        color: #1a1a1a !important;
-    }
-    
-    [data-testid="stDataFrame"] {
-        background-color: #ffffff;
-    }
-    
-    /* ===== PROGRESS BAR ===== */
-    .stProgress > div > div > div {
-        background: linear-gradient(90deg, #5c6bc0, #7986cb);
-    }
-    
-    .stProgress > div > div {
-        background-color: #e0e0e0;
-    }
-    
-    /* Progress text */
-    .stProgress p {
-        color: #1a1a1a !important;
-    }
-    
-    /* ===== RADIO BUTTONS ===== */
-    .stRadio > label {
-        color: #1a1a1a !important;
-    }
-    
-    .stRadio label span {
-        color: #1a1a1a !important;
-    }
-    
-    .stRadio [data-baseweb="radio"] span {
-        color: #1a1a1a !important;
-    }
-    
-    /* ===== CHECKBOX ===== */
-    .stCheckbox label span {
-        color: #1a1a1a !important;
-    }
-    
-    /* ===== TABS ===== */
-    .stTabs [data-baseweb="tab-list"] {
-        background-color: #f0f0f0;
-        border-radius: 8px;
-        padding: 4px;
-    }
-    
-    .stTabs [data-baseweb="tab"] {
-        color: #555555 !important;
-    }
-    
-    .stTabs [data-baseweb="tab"][aria-selected="true"] {
-        color: #1a1a1a !important;
-        background-color: #ffffff;
-    }
-    
-    /* ===== DIVIDER ===== */
-    hr {
-        border-color: #e0e0e0 !important;
-    }
-    
-    /* ===== CUSTOM HEADER ===== */
-    .main-header {
-        font-size: 2.2rem;
-        font-weight: 700;
-        color: #1a1a1a;
-        text-align: center;
-        padding: 1rem 0;
-        margin-bottom: 1rem;
-    }
-    
-    .main-header span {
-        background: linear-gradient(135deg, #5c6bc0 0%, #7e57c2 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-    }
-    
-    /* ===== FOOTER ===== */
-    .footer {
-        text-align: center;
-        color: #666666;
-        font-size: 0.9rem;
-        padding: 2rem 0;
-        margin-top: 2rem;
-    }
-    
-    /* ===== TOOLTIP ===== */
-    [data-baseweb="tooltip"] {
-        background-color: #333333 !important;
-        color: #ffffff !important;
-    }
-    
-    /* ===== PLOTLY CHART TEXT ===== */
-    .js-plotly-plot .plotly text {
-        fill: #1a1a1a !important;
-    }
-    
-    .js-plotly-plot .plotly .gtitle {
-        fill: #1a1a1a !important;
-    }
-    
-    /* ===== STRIKETHROUGH TEXT ===== */
-    s, strike, del {
-        color: #888888 !important;
-    }
-    
-    /* ===== HIDE STREAMLIT BRANDING ===== */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    header {visibility: hidden;}
-</style>
-""", unsafe_allow_html=True)
-
-# Initialize database
-@st.cache_resource
-def get_database():
-    return Database()
-
-db = get_database()
-
-# Mood emoji mapping
-MOOD_EMOJIS = {
-    1: "😢",
-    2: "😔", 
-    3: "😐",
-    4: "🙂",
-    5: "😊",
-    6: "😄",
-    7: "🤩"
-}
-
-PRIORITY_COLORS = {
-    "low": "🟢",
-    "medium": "🟡", 
-    "high": "🔴"
-}
-
-# Chart color scheme
-CHART_COLORS = {
-    'primary': '#5c6bc0',
-    'secondary': '#7e57c2',
-    'success': '#66bb6a',
-    'warning': '#ffa726',
-    'danger': '#ef5350',
-    'gray': '#9e9e9e',
-    'light_gray': '#e0e0e0',
-    'text': '#1a1a1a'
-}
-
-def analyze_sentiment(text: str) -> float:
-    """Analyze sentiment of text using TextBlob"""
-    if not text:
-        return 0.0
-    blob = TextBlob(text)
-    return blob.sentiment.polarity
-
-def create_minimal_chart(fig, height=300):
-    """Apply minimal theme to Plotly charts with visible text"""
-    fig.update_layout(
-        height=height,
-        margin=dict(l=20, r=20, t=40, b=20),
-        paper_bgcolor='rgba(255,255,255,1)',
-        plot_bgcolor='rgba(255,255,255,1)',
-        font=dict(color='#1a1a1a', family='Inter, sans-serif', size=12),
-        title_font=dict(color='#1a1a1a', size=14),
-        xaxis=dict(
-            gridcolor='#e0e0e0',
-            linecolor='#cccccc',
-            tickfont=dict(color='#1a1a1a', size=11),
-            title_font=dict(color='#1a1a1a', size=12)
-        ),
-        yaxis=dict(
-            gridcolor='#e0e0e0',
-            linecolor='#cccccc',
-            tickfont=dict(color='#1a1a1a', size=11),
-            title_font=dict(color='#1a1a1a', size=12)
-        ),
-        legend=dict(
-            font=dict(color='#1a1a1a', size=11),
-            bgcolor='rgba(255,255,255,0.9)'
-        )
-    )
-    return fig
-
-# ============ SIDEBAR ============
-with st.sidebar:
-    st.markdown("### 🎯 Productivity")
-    st.caption("Your personal dashboard")
-    
-    st.markdown("---")
-    
-    # Navigation
-    page = st.radio(
-        "Navigate",
-        ["📊 Dashboard", "✅ Tasks", "🔄 Habits", "😊 Mood", "🎯 Goals", "📈 Analytics"],
-        label_visibility="collapsed"
-    )
-    
-    st.markdown("---")
-    
-    # Today's date
-    st.markdown("##### 📅 Today")
-    st.markdown(f"**{datetime.now().strftime('%B %d, %Y')}**")
-    st.caption(datetime.now().strftime('%A'))
-    
-    st.markdown("---")
-    
-    # Quick stats
-    stats = db.get_productivity_stats()
-    
-    st.markdown("##### 📊 Overview")
-    
-    col1, col2 = st.columns(2)
-    with col1:
-        st.metric("Tasks", f"{stats['completed_tasks']}/{stats['total_tasks']}")
-    with col2:
-        st.metric("Mood", f"{stats['average_mood']:.1f}")
-    
-    st.metric("Active Goals", stats['active_goals'])
-
-# ============ DASHBOARD PAGE ============
-if page == "📊 Dashboard":
-    st.markdown('<h1 class="main-header"><span>Productivity Dashboard</span></h1>', unsafe_allow_html=True)
-    
-    # Metrics row
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.metric(
-            label="Task Completion",
-            value=f"{stats['completion_rate']:.0f}%",
-            delta="Today"
-        )
-    
-    with col2:
-        st.metric(
-            label="Habit Streak",
-            value=stats['total_habit_completions'],
-            delta="Total"
-        )
-    
-    with col3:
-        st.metric(
-            label="Average Mood",
-            value=f"{stats['average_mood']:.1f}/7",
-            delta="30 days"
-        )
-    
-    with col4:
-        st.metric(
-            label="Active Goals",
-            value=stats['active_goals'],
-            delta="In progress"
-        )
-    
-    st.markdown("---")
-    
-    # Today's overview
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("##### 📋 Today's Tasks")
-        pending_tasks = db.get_all_tasks(status="pending")[:5]
-        if pending_tasks:
-            for idx, task in enumerate(pending_tasks):
-                priority_emoji = PRIORITY_COLORS.get(task['priority'], "⚪")
-                
-                with st.container():
-                    task_col1, task_col2 = st.columns([0.85, 0.15])
-                    with task_col1:
-                        st.markdown(f"{priority_emoji} {task['title']}")
-                    with task_col2:
-                        if st.button("✓", key=f"complete_dash_task_{task['id']}_{idx}", help="Complete"):
-                            db.update_task_status(task['id'], 'completed')
-                            st.rerun()
-        else:
-            st.success("🎉 All tasks completed!")
-    
-    with col2:
-        st.markdown("##### 🔄 Today's Habits")
-        habits = db.get_all_habits()[:5]
-        if habits:
-            for idx, habit in enumerate(habits):
-                status = "✅" if habit['completed_today'] else "○"
-                streak_text = f" · 🔥{habit['streak']}" if habit['streak'] > 0 else ""
-                
-                with st.container():
-                    habit_col1, habit_col2 = st.columns([0.85, 0.15])
-                    with habit_col1:
-                        st.markdown(f"{status} {habit['name']}{streak_text}")
-                    with habit_col2:
-                        if not habit['completed_today']:
-                            if st.button("✓", key=f"complete_dash_habit_{habit['id']}_{idx}", help="Complete"):
-                                db.log_habit(habit['id'])
-                                st.rerun()
-        else:
-            st.info("No habits yet. Add some!")
-    
-    st.markdown("---")
-    
-    # Weekly activity chart
-    st.markdown("##### 📈 Weekly Activity")
-    
-    weekly_data = db.get_weekly_activity()
-    dates = [(datetime.now() - timedelta(days=i)).strftime('%Y-%m-%d') for i in range(6, -1, -1)]
-    day_names = [(datetime.now() - timedelta(days=i)).strftime('%a') for i in range(6, -1, -1)]
-    
-    tasks_data = [weekly_data['tasks_by_day'].get(d, 0) for d in dates]
-    habits_data = [weekly_data['habits_by_day'].get(d, 0) for d in dates]
-    
-    fig = go.Figure()
-    fig.add_trace(go.Bar(
-        name='Tasks', 
-        x=day_names, 
-        y=tasks_data, 
-        marker_color=CHART_COLORS['primary'],
-        marker_line_width=0
-    ))
-    fig.add_trace(go.Bar(
-        name='Habits', 
-        x=day_names, 
-        y=habits_data, 
-        marker_color=CHART_COLORS['secondary'],
-        marker_line_width=0
-    ))
-    
-    fig.update_layout(barmode='group')
-    fig = create_minimal_chart(fig, height=280)
-    st.plotly_chart(fig, use_container_width=True)
-
-# ============ TASKS PAGE ============
-elif page == "✅ Tasks":
-    st.markdown("## ✅ Tasks")
-    st.caption("Manage your to-do list")
-    
-    # Add new task form
-    with st.expander("➕ Add New Task", expanded=False):
-        col1, col2 = st.columns([3, 1])
-        
-        with col1:
-            new_task_title = st.text_input("Title", placeholder="What needs to be done?", key="new_task_title")
-            new_task_desc = st.text_area("Description", height=80, placeholder="Add details...", key="new_task_desc")
-        
-        with col2:
-            new_task_priority = st.selectbox("Priority", ["low", "medium", "high"], key="new_task_priority")
-            new_task_due = st.date_input("Due Date", value=None, key="new_task_due")
-        
-        if st.button("Add Task", type="primary", key="add_task_btn"):
-            if new_task_title:
-                due_date = new_task_due.isoformat() if new_task_due else None
-                db.add_task(new_task_title, new_task_desc, new_task_priority, due_date)
-                st.success("Task added!")
-                st.rerun()
-            else:
-                st.error("Please enter a title")
-    
-    st.markdown("---")
-    
-    # Task filters
-    status_filter = st.selectbox(
-        "Filter",
-        ["all", "pending", "in_progress", "completed"],
-        key="task_status_filter",
-        label_visibility="collapsed"
-    )
-    
-    # Display tasks
-    all_tasks = db.get_all_tasks(status_filter if status_filter != "all" else None)
-    
-    if all_tasks:
-        for idx, task in enumerate(all_tasks):
-            col1, col2, col3, col4 = st.columns([0.08, 0.52, 0.3, 0.1])
-            
-            with col1:
-                priority_emoji = PRIORITY_COLORS.get(task['priority'], "⚪")
-                st.markdown(f"{priority_emoji}")
-            
-            with col2:
-                if task['status'] == 'completed':
-                    st.markdown(f"~~{task['title']}~~")
-                else:
-                    st.markdown(f"**{task['title']}**")
-                if task['description']:
-                    st.caption(task['description'][:50] + "..." if len(task['description']) > 50 else task['description'])
-            
-            with col3:
-                new_status = st.selectbox(
-                    "Status",
-                    ["pending", "in_progress", "completed"],
-                    index=["pending", "in_progress", "completed"].index(task['status']),
-                    key=f"task_status_{task['id']}_{idx}",
-                    label_visibility="collapsed"
-                )
-                if new_status != task['status']:
-                    db.update_task_status(task['id'], new_status)
-                    st.rerun()
-            
-            with col4:
-                if st.button("×", key=f"del_task_{task['id']}_{idx}", help="Delete"):
-                    db.delete_task(task['id'])
-                    st.rerun()
-            
-            st.divider()
-    else:
-        st.info("No tasks found. Add one above!")
-
-# ============ HABITS PAGE ============
-elif page == "🔄 Habits":
-    st.markdown("## 🔄 Habits")
-    st.caption("Track your daily routines")
-    
-    # Add new habit
-    with st.expander("➕ Add New Habit", expanded=False):
-        col1, col2 = st.columns([2, 1])
-        
-        with col1:
-            new_habit_name = st.text_input("Habit Name", placeholder="e.g., Exercise, Read...", key="new_habit_name")
-            new_habit_desc = st.text_input("Description", placeholder="Optional details", key="new_habit_desc")
-        
-        with col2:
-            new_habit_freq = st.selectbox("Frequency", ["daily", "weekly"], key="new_habit_freq")
-        
-        if st.button("Add Habit", type="primary", key="add_habit_btn"):
-            if new_habit_name:
-                db.add_habit(new_habit_name, new_habit_desc, new_habit_freq)
-                st.success("Habit added!")
-                st.rerun()
-    
-    st.markdown("---")
-    
-    # Display habits
-    all_habits = db.get_all_habits()
-    
-    if all_habits:
-        for idx, habit in enumerate(all_habits):
-            col1, col2, col3, col4 = st.columns([0.1, 2.4, 1, 0.5])
-            
-            with col1:
-                status = "✅" if habit['completed_today'] else "○"
-                st.markdown(f"### {status}")
-            
-            with col2:
-                st.markdown(f"**{habit['name']}**")
-                if habit['description']:
-                    st.caption(habit['description'])
-            
-            with col3:
-                if habit['streak'] > 0:
-                    st.markdown(f"🔥 **{habit['streak']}** days")
-                else:
-                    st.caption("Start streak!")
-                
-                if not habit['completed_today']:
-                    if st.button("Complete", key=f"complete_habit_{habit['id']}_{idx}", type="primary"):
-                        db.log_habit(habit['id'])
-                        st.rerun()
-            
-            with col4:
-                if st.button("×", key=f"del_habit_{habit['id']}_{idx}"):
-                    db.delete_habit(habit['id'])
-                    st.rerun()
-            
-            st.divider()
-        
-        # Streak visualization
-        st.markdown("---")
-        st.markdown("##### 🏆 Streaks")
-        
-        streak_data = pd.DataFrame([
-            {"Habit": h['name'], "Streak": h['streak']} 
-            for h in all_habits
-        ])
-        streak_data = streak_data.sort_values('Streak', ascending=True)
-        
-        fig = px.bar(
-            streak_data, 
-            x='Streak', 
-            y='Habit', 
-            orientation='h',
-            color='Streak',
-            color_continuous_scale=[[0, CHART_COLORS['light_gray']], [1, CHART_COLORS['primary']]]
-        )
-        fig.update_traces(marker_line_width=0)
-        fig.update_layout(showlegend=False, coloraxis_showscale=False)
-        fig = create_minimal_chart(fig, height=250)
-        st.plotly_chart(fig, use_container_width=True)
-    else:
-        st.info("No habits yet. Add one above!")
-
-# ============ MOOD PAGE ============
-elif page == "😊 Mood":
-    st.markdown("## 😊 Mood")
-    st.caption("Track how you're feeling")
-    
-    col1, col2 = st.columns([1, 2])
-    
-    with col1:
-        st.markdown("##### How are you feeling?")
-        mood_score = st.slider(
-            "Mood Level",
-            min_value=1,
-            max_value=7,
-            value=4,
-            help="1 = Very Low, 7 = Excellent",
-            key="mood_slider",
-            label_visibility="collapsed"
-        )
-        st.markdown(f"<div style='text-align: center; font-size: 3rem;'>{MOOD_EMOJIS[mood_score]}</div>", unsafe_allow_html=True)
-    
-    with col2:
-        mood_notes = st.text_area(
-            "Notes",
-            placeholder="What's on your mind today?",
-            height=120,
-            key="mood_notes",
-            label_visibility="collapsed"
-        )
-    
-    if st.button("Log Mood", type="primary", key="log_mood_btn"):
-        sentiment = analyze_sentiment(mood_notes)
-        db.add_mood_entry(mood_score, MOOD_EMOJIS[mood_score], mood_notes, sentiment)
-        sentiment_label = 'Positive 😊' if sentiment > 0 else 'Neutral 😐' if sentiment == 0 else 'Reflective 💭'
-        st.success(f"Mood logged! ({sentiment_label})")
-        st.balloons()
-        st.rerun()
-    
-    st.markdown("---")
-    
-    # Mood history
-    st.markdown("##### 📈 Mood Trend")
-    
-    mood_entries = db.get_mood_entries(30)
-    
-    if mood_entries:
-        mood_df = pd.DataFrame(mood_entries)
-        mood_df['date'] = pd.to_datetime(mood_df['logged_at']).dt.date
-        
-        fig = go.Figure()
-        
-        fig.add_trace(go.Scatter(
-            x=mood_df['date'], 
-            y=mood_df['mood_score'],
-            mode='lines+markers',
-            name='Mood',
-            line=dict(color=CHART_COLORS['primary'], width=2),
-            marker=dict(size=8, color=CHART_COLORS['primary']),
-            fill='tozeroy',
-            fillcolor='rgba(92, 107, 192, 0.15)'
-        ))
-        
-        fig = create_minimal_chart(fig, height=280)
-        fig.update_yaxes(range=[0, 8])
-        st.plotly_chart(fig, use_container_width=True)
-        
-        # Recent entries
-        st.markdown("##### 📝 Recent Entries")
-        for idx, entry in enumerate(mood_entries[:5]):
-            col1, col2 = st.columns([0.12, 0.88])
-            with col1:
-                st.markdown(f"### {entry['mood_emoji']}")
-            with col2:
-                st.markdown(f"**{entry['logged_at'][:10]}** · {entry['mood_score']}/7")
-                if entry['notes']:
-                    st.caption(entry['notes'][:80] + "..." if len(entry['notes']) > 80 else entry['notes'])
-            st.divider()
-    else:
-        st.info("No mood entries yet. Log your first mood above!")
-
-# ============ GOALS PAGE ============
-elif page == "🎯 Goals":
-    st.markdown("## 🎯 Goals")
-    st.caption("Track your progress")
-    
-    # Add new goal
-    with st.expander("➕ Add New Goal", expanded=False):
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            goal_title = st.text_input("Goal", placeholder="e.g., Read 24 books", key="goal_title")
-            goal_desc = st.text_area("Description", height=80, placeholder="Why is this important?", key="goal_desc")
-        
-        with col2:
-            col2a, col2b = st.columns(2)
-            with col2a:
-                target_value = st.number_input("Target", min_value=1, value=100, key="goal_target")
-            with col2b:
-                unit = st.text_input("Unit", placeholder="books, km...", key="goal_unit")
-            deadline = st.date_input("Deadline", value=None, key="goal_deadline")
-        
-        if st.button("Add Goal", type="primary", key="add_goal_btn"):
-            if goal_title and target_value > 0:
-                deadline_str = deadline.isoformat() if deadline else None
-                db.add_goal(goal_title, target_value, unit, goal_desc, deadline_str)
-                st.success("Goal added!")
-                st.rerun()
-    
-    st.markdown("---")
-    
-    # Display goals
-    all_goals = db.get_all_goals()
-    
-    if all_goals:
-        for idx, goal in enumerate(all_goals):
-            st.markdown(f"**{goal['title']}**")
-            
-            col1, col2, col3 = st.columns([3, 1.5, 0.5])
-            
-            with col1:
-                progress = goal['progress']
-                st.progress(progress / 100)
-                st.caption(f"{goal['current_value']:.0f} / {goal['target_value']} {goal['unit']} ({progress:.0f}%)")
-            
-            with col2:
-                new_value = st.number_input(
-                    "Progress",
-                    min_value=0.0,
-                    max_value=float(goal['target_value']),
-                    value=float(goal['current_value']),
-                    key=f"goal_progress_{goal['id']}_{idx}",
-                    label_visibility="collapsed"
-                )
-                if st.button("Update", key=f"update_goal_{goal['id']}_{idx}"):
-                    db.update_goal_progress(goal['id'], new_value)
-                    st.rerun()
-            
-            with col3:
-                if st.button("×", key=f"del_goal_{goal['id']}_{idx}"):
-                    db.delete_goal(goal['id'])
-                    st.rerun()
-            
-            if goal['deadline']:
-                days_left = (date.fromisoformat(goal['deadline']) - date.today()).days
-                if days_left > 0:
-                    st.caption(f"⏰ {days_left} days left")
-                elif days_left == 0:
-                    st.warning("Due today!")
-                else:
-                    st.error("Overdue")
-            
-            st.markdown("---")
-    else:
-        st.info("No goals yet. Set one above!")
-
-# ============ ANALYTICS PAGE ============
-elif page == "📈 Analytics":
-    st.markdown("## 📈 Analytics")
-    st.caption("Your productivity insights")
-    
-    stats = db.get_productivity_stats()
-    
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.metric("Total Tasks", stats['total_tasks'])
-    with col2:
-        st.metric("Completed", stats['completed_tasks'])
-    with col3:
-        st.metric("Completion %", f"{stats['completion_rate']:.0f}%")
-    with col4:
-        st.metric("Avg Mood", f"{stats['average_mood']:.1f}")
-    
-    st.markdown("---")
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("##### Task Distribution")
-        all_tasks = db.get_all_tasks()
-        
-        if all_tasks:
-            status_counts = {}
-            for task in all_tasks:
-                status = task['status']
-                status_counts[status] = status_counts.get(status, 0) + 1
-            
-            colors = [CHART_COLORS['warning'], CHART_COLORS['primary'], CHART_COLORS['success']]
-            
-            fig = px.pie(
-                values=list(status_counts.values()),
-                names=list(status_counts.keys()),
-                color_discrete_sequence=colors,
-                hole=0.4
-            )
-            fig.update_traces(
-                textposition='inside', 
-                textinfo='percent+label',
-                textfont=dict(color='#ffffff', size=12)
-            )
-            fig = create_minimal_chart(fig, height=280)
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            st.info("No data yet")
-    
-    with col2:
-        st.markdown("##### Mood Trend")
-        mood_entries = db.get_mood_entries(30)
-        
-        if mood_entries:
-            mood_df = pd.DataFrame(mood_entries)
-            mood_df['date'] = pd.to_datetime(mood_df['logged_at']).dt.date
-            daily_mood = mood_df.groupby('date')['mood_score'].mean().reset_index()
-            
-            fig = px.line(daily_mood, x='date', y='mood_score', markers=True)
-            fig.update_traces(
-                line_color=CHART_COLORS['primary'], 
-                line_width=2,
-                marker_size=6
-            )
-            fig = create_minimal_chart(fig, height=280)
-            fig.update_yaxes(range=[0, 8])
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            st.info("No data yet")
-    
-    # Habit performance
-    st.markdown("##### Habit Performance")
-    all_habits = db.get_all_habits()
-    
-    if all_habits:
-        habit_data = pd.DataFrame([
-            {
-                "Habit": h['name'],
-                "Streak": h['streak'],
-                "Status": "✅ Done" if h['completed_today'] else "○ Pending"
-            }
-            for h in all_habits
-        ])
-        st.dataframe(habit_data, use_container_width=True, hide_index=True)
-    else:
-        st.info("No habits tracked yet")
-    
-    # Goal progress
-    st.markdown("##### Goal Progress")
-    all_goals = db.get_all_goals()
-    
-    if all_goals:
-        goal_data = pd.DataFrame([
-            {
-                "Goal": g['title'][:25] + "..." if len(g['title']) > 25 else g['title'],
-                "Progress": g['progress']
-            }
-            for g in all_goals
-        ])
-        
-        fig = px.bar(
-            goal_data,
-            x='Goal',
-            y='Progress',
-            color='Progress',
-            color_continuous_scale=[[0, CHART_COLORS['light_gray']], [1, CHART_COLORS['success']]],
-            text='Progress'
-        )
-        fig.update_traces(
-            texttemplate='%{text:.0f}%', 
-            textposition='outside', 
-            marker_line_width=0,
-            textfont=dict(color='#1a1a1a', size=11)
-        )
-        fig.update_layout(coloraxis_showscale=False)
-        fig = create_minimal_chart(fig, height=300)
-        fig.update_yaxes(range=[0, 110])
-        st.plotly_chart(fig, use_container_width=True)
-    else:
-        st.info("No goals set yet")
-
-# Footer
-st.markdown("""
-<div class="footer">
-    Productivity Dashboard · Built by Dakxh_69
-</div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+"""
+🎯 Productivity Command Center
+A comprehensive personal productivity dashboard built with Streamlit
+"""
+
+import html
+import os
+import streamlit as st
+import streamlit.components.v1 as components
+from datetime import datetime, date, timedelta, timezone
+import analytics
+import habit_history
+from accounts import ACCOUNTS_FILE, AccountStore
+from cache import MISSING, ReadCache
+from instrumentation import NullTimer, Recorder
+from registry import DatabaseRegistry, normalize_user_id
+from sentiment import SentimentWorker
+from theme import build_stylesheet, theme_markup
+
+# Page configuration
+st.set_page_config(
+    page_title="Productivity Dashboard",
+    page_icon="🎯",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+# Set DASHBOARD_DEBUG=1 to record queries and section timings (shown in a sidebar panel);
+# DASHBOARD_METRICS_FILE=path.json|path.prom also writes them out after every run
+@st.cache_resource
+def get_recorder():
+    return Recorder() if os.environ.get("DASHBOARD_DEBUG") else None
+
+recorder = get_recorder()
+timer = recorder.render() if recorder else NullTimer()
+
+# ============ MINIMAL LIGHT THEME CSS - FIXED TEXT VISIBILITY ============
+
+# Built and minified once per server process from assets/theme.css
+@st.cache_resource
+def get_theme_markup():
+    return theme_markup(build_stylesheet())
+
+def inject_theme():
+    """Install the theme in the page <head> on a session's first run; it stays through reruns"""
+    if st.session_state.get("theme_injected"):
+        return
+    components.html(get_theme_markup(), height=0)
+    st.session_state.theme_injected = True
+
+inject_theme()
+
+# One database file per user under DASHBOARD_DATA_DIR, with a bounded set kept open
+@st.cache_resource
+def get_registry():
+    db_kwargs = {"connection_factory": recorder.connection_factory()} if recorder else {}
+    return DatabaseRegistry(
+        os.environ.get("DASHBOARD_DATA_DIR", os.path.join("data", "users")),
+        max_open=int(os.environ.get("DASHBOARD_MAX_OPEN_DBS", 32)),
+        **db_kwargs
+    )
+
+registry = get_registry()
+
+@st.cache_resource
+def get_accounts():
+    return AccountStore(os.path.join(registry.data_dir, ACCOUNTS_FILE))
+
+accounts = get_accounts()
+
+def sign_in():
+    """Ask for a user name and password, remember the user for the session and stop this run"""
+    st.markdown('<h1 class="main-header"><span>Productivity Dashboard</span></h1>', unsafe_allow_html=True)
+    # Self sign-up is opt-in; otherwise accounts come from `manage.py --user NAME set-password`
+    allow_signup = os.environ.get("DASHBOARD_ALLOW_SIGNUP") == "1"
+    with st.form("sign_in"):
+        user_name = st.text_input("User name", placeholder="e.g. alex", key="sign_in_name")
+        password = st.text_input("Password", type="password")
+        submit_col1, submit_col2 = st.columns(2)
+        with submit_col1:
+            signing_in = st.form_submit_button("Sign in", type="primary")
+        with submit_col2:
+            signing_up = allow_signup and st.form_submit_button("Create account")
+        
+        if signing_up:
+            try:
+                # A database from before accounts existed is not up for grabs
+                if os.path.exists(registry.path_for(user_name)):
+                    raise ValueError("That user name is taken")
+                accounts.create(user_name, password)
+            except ValueError as exc:
+                st.error(str(exc))
+            else:
+                signing_in = True
+        if signing_in:
+            if accounts.verify(user_name, password):
+                st.session_state.user_id = normalize_user_id(user_name)
+                st.rerun()
+            elif not signing_up:
+                st.error("Wrong user name or password")
+    st.stop()
+
+# Users sign in with a password; DASHBOARD_USER pins one user and skips sign-in,
+# which is only for single-user installs
+user_id = os.environ.get("DASHBOARD_USER") or st.session_state.get("user_id")
+if not user_id:
+    sign_in()
+
+# A single-user install upgrading from one productivity.db keeps its data: the first run
+# copies the old file in as DASHBOARD_USER's database (the old file is left in place)
+@st.cache_resource
+def adopt_legacy_database(user_id):
+    legacy = os.environ.get("DASHBOARD_LEGACY_DB", "productivity.db")
+    if os.path.exists(legacy) and not os.path.exists(registry.path_for(user_id)):
+        try:
+            registry.adopt(user_id, legacy)
+        except FileExistsError:
+            pass
+
+if os.environ.get("DASHBOARD_USER"):
+    adopt_legacy_database(user_id)
+
+# Fragments and widget callbacks outlive the full run that defined them, so db looks up
+# the user's handle on every call and holds it only while the call runs; the registry
+# can close idle users' handles, and their next click reopens them
+db = registry.bind(user_id)
+
+# Scores mood notes off the script thread
+@st.cache_resource
+def get_sentiment_worker():
+    return SentimentWorker()
+
+sentiment_worker = get_sentiment_worker()
+
+# Mood emoji mapping
+MOOD_EMOJIS = {
+    1: "😢",
+    2: "😔", 
+    3: "😐",
+    4: "🙂",
+    5: "😊",
+    6: "😄",
+    7: "🤩"
+}
+
+PRIORITY_COLORS = {
+    "low": "🟢",
+    "medium": "🟡", 
+    "high": "🔴"
+}
+
+TASKS_PER_PAGE = 25
+
+# How often the sidebar and Dashboard stats re-read while the page is open (seconds);
+# between writes the read is a cache hit, so an idle tick runs no SQL
+STATS_REFRESH_SECONDS = 5
+
+# Mood trend windows (days, None = all time) and the most points a trend chart draws
+MOOD_RANGES = {
+    "Last 30 days": 30,
+    "Last 90 days": 90,
+    "Last year": 365,
+    "All time": None
+}
+MOOD_CHART_POINTS = 200
+
+# Session lengths offered when starting a pomodoro (minutes)
+POMODORO_LENGTHS = [15, 25, 50]
+
+# What search looks through, and how many of the best matches it shows
+SEARCH_KINDS = {
+    "tasks": "✅ Tasks",
+    "goals": "🎯 Goals",
+    "mood_entries": "😊 Mood"
+}
+SEARCH_RESULTS = 20
+
+# Chart color scheme
+CHART_COLORS = {
+    'primary': '#5c6bc0',
+    'secondary': '#7e57c2',
+    'success': '#66bb6a',
+    'warning': '#ffa726',
+    'danger': '#ef5350',
+    'gray': '#9e9e9e',
+    'light_gray': '#e0e0e0',
+    'text': '#1a1a1a'
+}
+
+def sentiment_label(score) -> str:
+    """Short label for a mood entry's sentiment score (None while it is being scored)"""
+    if score is None:
+        return "⏳ Analyzing..."
+    return 'Positive 😊' if score > 0 else 'Neutral 😐' if score == 0 else 'Reflective 💭'
+
+def highlighted(text) -> str:
+    """Escape search result text for HTML and mark its matched terms"""
+    return (html.escape(text or "")
+            .replace(db.HIGHLIGHT_START, "<mark>")
+            .replace(db.HIGHLIGHT_END, "</mark>"))
+
+def with_schedule_streaks(habits):
+    """Count streaks of weekly and N-per-week habits in weeks; sets 'streak_unit' on each habit"""
+    # Daily habits keep the counter-backed streaks get_all_habits returned
+    scheduled = [h['id'] for h in habits if habit_history.parse_frequency(h['frequency'])[1] > 1]
+    histories = habit_history.load_histories(db, habit_ids=scheduled) if scheduled else {}
+    for habit in habits:
+        history = histories.get(habit['id'])
+        if history is not None:
+            habit['streak'] = history.current_streak()
+            habit['longest_streak'] = history.longest_streak()
+        habit['streak_unit'] = history.unit if history is not None else "days"
+    return habits
+
+def create_minimal_chart(fig, height=300):
+    """Apply minimal theme to Plotly charts with visible text"""
+    fig.update_layout(
+        height=height,
+        margin=dict(l=20, r=20, t=40, b=20),
+        paper_bgcolor='rgba(255,255,255,1)',
+        plot_bgcolor='rgba(255,255,255,1)',
+        font=dict(color='#1a1a1a', family='Inter, sans-serif', size=12),
+        title_font=dict(color='#1a1a1a', size=14),
+        xaxis=dict(
+            gridcolor='#e0e0e0',
+            linecolor='#cccccc',
+            tickfont=dict(color='#1a1a1a', size=11),
+            title_font=dict(color='#1a1a1a', size=12)
+        ),
+        yaxis=dict(
+            gridcolor='#e0e0e0',
+            linecolor='#cccccc',
+            tickfont=dict(color='#1a1a1a', size=11),
+            title_font=dict(color='#1a1a1a', size=12)
+        ),
+        legend=dict(
+            font=dict(color='#1a1a1a', size=11),
+            bgcolor='rgba(255,255,255,0.9)'
+        )
+    )
+    return fig
+
+# Heavy modules (plotly, pandas) are imported inside the chart builders so that
+# pages without charts never pay for them; keep coldstart.PAGE_IMPORTS in sync.
+
+# ============ CHARTS ============
+
+# Finished Figure objects, keyed by chart and the version of the tables it reads;
+# shared by all users, whose databases have distinct names. A hit hands the stored
+# Figure straight to st.plotly_chart, so it is neither rebuilt nor re-validated.
+@st.cache_resource
+def get_figure_cache():
+    return ReadCache(maxsize=256)
+
+def show_chart(chart, tables, build, *args):
+    """Render a chart, rebuilding its figure only when the data behind it has changed"""
+    cache = get_figure_cache()
+    key = (chart, db.db_name, db.data_version(*tables), date.today(), args)
+    fig = cache.get(key)
+    if fig is MISSING:
+        fig = build(*args)
+        cache.put(key, fig, tables)
+    if fig is None:
+        return False
+    # st.plotly_chart serialises a copy, so the shared Figure is never modified
+    st.plotly_chart(fig, use_container_width=True)
+    return True
+
+def weekly_activity_figure():
+    import plotly.graph_objects as go
+    
+    weekly_data = db.get_weekly_activity()
+    dates = [(datetime.now() - timedelta(days=i)).strftime('%Y-%m-%d') for i in range(6, -1, -1)]
+    day_names = [(datetime.now() - timedelta(days=i)).strftime('%a') for i in range(6, -1, -1)]
+    
+    tasks_data = [weekly_data['tasks_by_day'].get(d, 0) for d in dates]
+    habits_data = [weekly_data['habits_by_day'].get(d, 0) for d in dates]
+    
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        name='Tasks', 
+        x=day_names, 
+        y=tasks_data, 
+        marker_color=CHART_COLORS['primary'],
+        marker_line_width=0
+    ))
+    fig.add_trace(go.Bar(
+        name='Habits', 
+        x=day_names, 
+        y=habits_data, 
+        marker_color=CHART_COLORS['secondary'],
+        marker_line_width=0
+    ))
+    
+    fig.update_layout(barmode='group')
+    return create_minimal_chart(fig, height=280)
+
+def streak_figure():
+    import pandas as pd
+    import plotly.express as px
+    
+    streak_data = pd.DataFrame([
+        {"Habit": h['name'], "Streak": h['streak']} 
+        for h in with_schedule_streaks(db.get_all_habits())
+    ])
+    if streak_data.empty:
+        return None
+    streak_data = streak_data.sort_values('Streak', ascending=True)
+    
+    fig = px.bar(
+        streak_data, 
+        x='Streak', 
+        y='Habit', 
+        orientation='h',
+        color='Streak',
+        color_continuous_scale=[[0, CHART_COLORS['light_gray']], [1, CHART_COLORS['primary']]]
+    )
+    fig.update_traces(marker_line_width=0)
+    fig.update_layout(showlegend=False, coloraxis_showscale=False)
+    return create_minimal_chart(fig, height=250)
+
+def habit_heatmap_figure(habit_id):
+    import plotly.graph_objects as go
+    
+    # 52 full weeks plus the current one, starting on a Monday
+    end = date.today()
+    start = end - timedelta(days=364 + (end - timedelta(days=364)).weekday())
+    habit_ids, matrix = habit_history.completion_matrix(db, start, end)
+    if habit_id is None:
+        daily, most = matrix.sum(axis=0), max(len(habit_ids), 1)
+    else:
+        rows = matrix[habit_ids == habit_id]
+        if not len(rows):
+            return None
+        daily, most = rows[0], 1
+    
+    grid = habit_history.week_grid(daily, start)
+    fig = go.Figure(go.Heatmap(
+        z=grid,
+        x=[start + timedelta(weeks=week) for week in range(grid.shape[1])],
+        y=['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun'],
+        zmin=0,
+        zmax=most,
+        colorscale=[[0, CHART_COLORS['light_gray']], [1, CHART_COLORS['success']]],
+        xgap=3,
+        ygap=3,
+        showscale=False,
+        hoverongaps=False,
+        hovertemplate='Week of %{x|%b %d}, %{y}: %{z}<extra></extra>'
+    ))
+    fig = create_minimal_chart(fig, height=220)
+    fig.update_xaxes(showgrid=False)
+    fig.update_yaxes(showgrid=False, autorange='reversed')
+    return fig
+
+def mood_trend_figure(days):
+    import plotly.graph_objects as go
+    
+    mood_series = db.get_mood_series(days, max_points=MOOD_CHART_POINTS)
+    if not mood_series:
+        return None
+    x = [point['logged_at'] for point in mood_series]
+    
+    fig = go.Figure()
+    
+    # Min/max band only matters once several entries share a bucket
+    if any(point['entries'] > 1 for point in mood_series):
+        fig.add_trace(go.Scatter(
+            x=x,
+            y=[point['max_score'] for point in mood_series],
+            mode='lines',
+            line=dict(width=0),
+            hoverinfo='skip',
+            showlegend=False
+        ))
+        fig.add_trace(go.Scatter(
+            x=x,
+            y=[point['min_score'] for point in mood_series],
+            mode='lines',
+            line=dict(width=0),
+            fill='tonexty',
+            fillcolor='rgba(92, 107, 192, 0.15)',
+            name='Range'
+        ))
+    
+    fig.add_trace(go.Scatter(
+        x=x, 
+        y=[point['mean_score'] for point in mood_series],
+        mode='lines+markers',
+        name='Mood',
+        line=dict(color=CHART_COLORS['primary'], width=2),
+        marker=dict(size=8 if len(mood_series) <= 60 else 4, color=CHART_COLORS['primary'])
+    ))
+    
+    fig = create_minimal_chart(fig, height=280)
+    fig.update_yaxes(range=[0, 8])
+    return fig
+
+def task_distribution_figure():
+    import plotly.express as px
+    
+    status_counts = analytics.task_status_counts(db)
+    if not status_counts['status']:
+        return None
+    
+    colors = [CHART_COLORS['warning'], CHART_COLORS['primary'], CHART_COLORS['success']]
+    
+    fig = px.pie(
+        values=status_counts['tasks'],
+        names=status_counts['status'],
+        color=status_counts['status'],
+        color_discrete_map=dict(zip(analytics.TASK_STATUSES, colors)),
+        hole=0.4
+    )
+    fig.update_traces(
+        textposition='inside', 
+        textinfo='percent+label',
+        textfont=dict(color='#ffffff', size=12)
+    )
+    return create_minimal_chart(fig, height=280)
+
+def daily_mood_figure():
+    import plotly.express as px
+    
+    daily_mood = analytics.daily_mood_means(db, days=30)
+    if not daily_mood['day']:
+        return None
+    
+    fig = px.line(daily_mood, x='day', y='mean_score', markers=True,
+                  labels={'day': 'date', 'mean_score': 'mood_score'})
+    fig.update_traces(
+        line_color=CHART_COLORS['primary'], 
+        line_width=2,
+        marker_size=6
+    )
+    fig = create_minimal_chart(fig, height=280)
+    fig.update_yaxes(range=[0, 8])
+    return fig
+
+def goal_progress_figure():
+    import pandas as pd
+    import plotly.express as px
+    
+    goal_data = pd.DataFrame([
+        {
+            "Goal": g['title'][:25] + "..." if len(g['title']) > 25 else g['title'],
+            "Progress": g['progress']
+        }
+        for g in db.get_all_goals()
+    ])
+    if goal_data.empty:
+        return None
+    
+    fig = px.bar(
+        goal_data,
+        x='Goal',
+        y='Progress',
+        color='Progress',
+        color_continuous_scale=[[0, CHART_COLORS['light_gray']], [1, CHART_COLORS['success']]],
+        text='Progress'
+    )
+    fig.update_traces(
+        texttemplate='%{text:.0f}%', 
+        textposition='outside', 
+        marker_line_width=0,
+        textfont=dict(color='#1a1a1a', size=11)
+    )
+    fig.update_layout(coloraxis_showscale=False)
+    fig = create_minimal_chart(fig, height=300)
+    fig.update_yaxes(range=[0, 110])
+    return fig
+
+def focus_by_day_figure():
+    import plotly.graph_objects as go
+    
+    days = [date.today() - timedelta(days=i) for i in range(6, -1, -1)]
+    focus = db.get_focus_by_day(days[0].isoformat(), days[-1].isoformat())
+    
+    fig = go.Figure(go.Bar(
+        x=[d.strftime('%a') for d in days],
+        y=[focus.get(d.isoformat(), 0) for d in days],
+        marker_color=CHART_COLORS['primary'],
+        marker_line_width=0
+    ))
+    fig.update_layout(yaxis_title='Minutes')
+    return create_minimal_chart(fig, height=250)
+
+# ============ POMODORO TIMER ============
+
+@st.fragment(run_every=1)
+def pomodoro_countdown():
+    """Countdown for the running session; ticks without rerunning the rest of the page"""
+    session = db.get_active_pomodoro()
+    if session is None:
+        st.rerun()
+    
+    ends_at = datetime.fromisoformat(session['ends_at']).replace(tzinfo=timezone.utc)
+    remaining = (ends_at - datetime.now(timezone.utc)).total_seconds()
+    if remaining <= 0:
+        db.complete_pomodoro(session['id'])
+        st.session_state.pomodoro_finished = True
+        st.rerun()
+    
+    minutes, seconds = divmod(int(remaining), 60)
+    st.markdown(f"<div style='text-align: center; font-size: 4rem; font-weight: 600;'>{minutes:02d}:{seconds:02d}</div>", unsafe_allow_html=True)
+    st.markdown(f"<div style='text-align: center;'>{html.escape(session['task_title'] or 'Free focus')}</div>", unsafe_allow_html=True)
+    st.progress(min(1.0, 1 - remaining / (session['duration_minutes'] * 60)))
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("Complete", type="primary", key="complete_pomodoro_btn", use_container_width=True):
+            db.complete_pomodoro(session['id'])
+            st.rerun()
+    with col2:
+        if st.button("Stop", key="stop_pomodoro_btn", use_container_width=True):
+            db.stop_pomodoro(session['id'])
+            st.rerun()
+
+# ============ FRAGMENTS ============
+# Interactive sections rerun on their own: a widget callback writes, then only that
+# fragment redraws from fresh cached reads. Changes that reshape a whole list
+# (deleting a row, logging a mood) still rerun the page.
+
+# Row fragments draw the page's own rows on a full run and only re-read on their own
+# reruns, so a page of rows costs one query rather than one per row
+st.session_state.drawn_rows = set()
+
+def current_row(kind, row, read):
+    """row as passed in the first time it is drawn this full run, read(row['id']) after that"""
+    drawn = st.session_state.drawn_rows
+    if (kind, row['id']) not in drawn:
+        drawn.add((kind, row['id']))
+        return row
+    return read(row['id'])
+
+@st.fragment(run_every=STATS_REFRESH_SECONDS)
+def sidebar_stats():
+    """Overview metrics; refreshed on a timer so clicks in other fragments show up"""
+    stats = db.get_productivity_stats()
+    
+    st.markdown("##### 📊 Overview")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Tasks", f"{stats['completed_tasks']}/{stats['total_tasks']}")
+    with col2:
+        st.metric("Mood", f"{stats['average_mood']:.1f}")
+    
+    st.metric("Active Goals", stats['active_goals'])
+
+@st.fragment(run_every=STATS_REFRESH_SECONDS)
+def dashboard_metrics():
+    stats = db.get_productivity_stats()
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric(
+            label="Task Completion",
+            value=f"{stats['completion_rate']:.0f}%",
+            delta="Today"
+        )
+    
+    with col2:
+        st.metric(
+            label="Habit Streak",
+            value=stats['total_habit_completions'],
+            delta="Total"
+        )
+    
+    with col3:
+        st.metric(
+            label="Average Mood",
+            value=f"{stats['average_mood']:.1f}/7",
+            delta="30 days"
+        )
+    
+    with col4:
+        st.metric(
+            label="Active Goals",
+            value=stats['active_goals'],
+            delta="In progress"
+        )
+
+@st.fragment
+def dashboard_tasks():
+    st.markdown("##### 📋 Today's Tasks")
+    pending_tasks = db.get_all_tasks(status="pending", limit=5)
+    if pending_tasks:
+        for idx, task in enumerate(pending_tasks):
+            priority_emoji = PRIORITY_COLORS.get(task['priority'], "⚪")
+            
+            with st.container():
+                task_col1, task_col2 = st.columns([0.85, 0.15])
+                with task_col1:
+                    st.markdown(f"{priority_emoji} {task['title']}")
+                with task_col2:
+                    st.button("✓", key=f"complete_dash_task_{task['id']}_{idx}", help="Complete",
+                              on_click=db.update_task_status, args=(task['id'], 'completed'))
+    else:
+        st.success("🎉 All tasks completed!")
+
+@st.fragment
+def dashboard_habits():
+    st.markdown("##### 🔄 Today's Habits")
+    habits = with_schedule_streaks(db.get_all_habits()[:5])
+    if habits:
+        for idx, habit in enumerate(habits):
+            status = "✅" if habit['completed_today'] else "○"
+            streak_text = f" · 🔥{habit['streak']}" if habit['streak'] > 0 else ""
+            
+            with st.container():
+                habit_col1, habit_col2 = st.columns([0.85, 0.15])
+                with habit_col1:
+                    st.markdown(f"{status} {habit['name']}{streak_text}")
+                with habit_col2:
+                    if not habit['completed_today']:
+                        st.button("✓", key=f"complete_dash_habit_{habit['id']}_{idx}", help="Complete",
+                                  on_click=db.log_habit, args=(habit['id'],))
+    else:
+        st.info("No habits yet. Add some!")
+
+def task_columns(task):
+    """Priority and title of a task row; returns its two remaining columns"""
+    col1, col2, col3, col4 = st.columns([0.08, 0.52, 0.3, 0.1])
+    
+    with col1:
+        priority_emoji = PRIORITY_COLORS.get(task['priority'], "⚪")
+        st.markdown(f"{priority_emoji}")
+    
+    with col2:
+        if task['status'] == 'completed':
+            st.markdown(f"~~{task['title']}~~")
+        else:
+            st.markdown(f"**{task['title']}**")
+        if task['description']:
+            st.caption(task['description'][:50] + "..." if len(task['description']) > 50 else task['description'])
+    
+    return col3, col4
+
+def set_task_status(task_id, key):
+    db.update_task_status(task_id, st.session_state[key])
+
+@st.fragment
+def task_row(task, idx):
+    """One editable task; a status change redraws just this row"""
+    task = current_row("task", task, db.get_task)
+    if task is None:
+        # Deleted: the rest of the page and the pagination shift
+        st.rerun()
+    
+    col3, col4 = task_columns(task)
+    
+    with col3:
+        status_key = f"task_status_{task['id']}_{idx}"
+        st.selectbox(
+            "Status",
+            ["pending", "in_progress", "completed"],
+            index=["pending", "in_progress", "completed"].index(task['status']),
+            key=status_key,
+            label_visibility="collapsed",
+            on_change=set_task_status,
+            args=(task['id'], status_key)
+        )
+    
+    with col4:
+        if st.button("×", key=f"del_task_{task['id']}_{idx}", help="Delete"):
+            db.delete_task(task['id'])
+            st.rerun()
+    
+    st.divider()
+
+@st.fragment
+def habit_list():
+    """Habit rows; streaks are worked out over all habits, so completing one redraws the list"""
+    all_habits = with_schedule_streaks(db.get_all_habits())
+    
+    for idx, habit in enumerate(all_habits):
+        col1, col2, col3, col4 = st.columns([0.1, 2.4, 1, 0.5])
+        
+        with col1:
+            status = "✅" if habit['completed_today'] else "○"
+            st.markdown(f"### {status}")
+        
+        with col2:
+            st.markdown(f"**{habit['name']}**")
+            if habit['description']:
+                st.caption(habit['description'])
+        
+        with col3:
+            if habit['streak'] > 0:
+                st.markdown(f"🔥 **{habit['streak']}** {habit['streak_unit']}")
+            else:
+                st.caption("Start streak!")
+            
+            if not habit['completed_today']:
+                st.button("Complete", key=f"complete_habit_{habit['id']}_{idx}", type="primary",
+                          on_click=db.log_habit, args=(habit['id'],))
+        
+        with col4:
+            if st.button("×", key=f"del_habit_{habit['id']}_{idx}"):
+                db.delete_habit(habit['id'])
+                st.rerun()
+        
+        st.divider()
+
+def set_goal_progress(goal_id, key):
+    db.update_goal_progress(goal_id, st.session_state[key])
+
+@st.fragment
+def goal_editor(goal, idx):
+    """One goal's progress bar and editor; an update redraws just this goal"""
+    goal = current_row("goal", goal, db.get_goal)
+    if goal is None:
+        st.rerun()
+    
+    st.markdown(f"**{goal['title']}**")
+    
+    col1, col2, col3 = st.columns([3, 1.5, 0.5])
+    
+    with col1:
+        progress = goal['progress']
+        st.progress(progress / 100)
+        st.caption(f"{goal['current_value']:.0f} / {goal['target_value']} {goal['unit']} ({progress:.0f}%)")
+    
+    with col2:
+        progress_key = f"goal_progress_{goal['id']}_{idx}"
+        st.number_input(
+            "Progress",
+            min_value=0.0,
+            max_value=float(goal['target_value']),
+            value=float(goal['current_value']),
+            key=progress_key,
+            label_visibility="collapsed"
+        )
+        st.button("Update", key=f"update_goal_{goal['id']}_{idx}",
+                  on_click=set_goal_progress, args=(goal['id'], progress_key))
+    
+    with col3:
+        if st.button("×", key=f"del_goal_{goal['id']}_{idx}"):
+            db.delete_goal(goal['id'])
+            st.rerun()
+    
+    if goal['deadline']:
+        days_left = (date.fromisoformat(goal['deadline']) - date.today()).days
+        if days_left > 0:
+            st.caption(f"⏰ {days_left} days left")
+        elif days_left == 0:
+            st.warning("Due today!")
+        else:
+            st.error("Overdue")
+    
+    st.markdown("---")
+
+@st.fragment
+def mood_logger():
+    """Mood slider and notes; moving the slider redraws only the logger"""
+    col1, col2 = st.columns([1, 2])
+    
+    with col1:
+        st.markdown("##### How are you feeling?")
+        mood_score = st.slider(
+            "Mood Level",
+            min_value=1,
+            max_value=7,
+            value=4,
+            help="1 = Very Low, 7 = Excellent",
+            key="mood_slider",
+            label_visibility="collapsed"
+        )
+        st.markdown(f"<div style='text-align: center; font-size: 3rem;'>{MOOD_EMOJIS[mood_score]}</div>", unsafe_allow_html=True)
+    
+    with col2:
+        mood_notes = st.text_area(
+            "Notes",
+            placeholder="What's on your mind today?",
+            height=120,
+            key="mood_notes",
+            label_visibility="collapsed"
+        )
+    
+    if st.button("Log Mood", type="primary", key="log_mood_btn"):
+        # Saved right away with a pending score; the worker fills it in
+        has_notes = bool(mood_notes.strip())
+        entry_id = db.add_mood_entry(mood_score, MOOD_EMOJIS[mood_score], mood_notes,
+                                     None if has_notes else 0.0)
+        if has_notes:
+            # Held so the handle isn't closed before the score is written
+            worker_db = registry.hold(user_id)
+            sentiment_worker.submit(worker_db, entry_id, mood_notes).add_done_callback(
+                lambda _: registry.release(user_id)
+            )
+        st.success("Mood logged!")
+        st.balloons()
+        # The trend chart and recent entries change too
+        st.rerun()
+
+# ============ SIDEBAR ============
+timer.lap("sidebar")
+with st.sidebar:
+    st.markdown("### 🎯 Productivity")
+    st.caption("Your personal dashboard")
+    
+    if not os.environ.get("DASHBOARD_USER"):
+        user_col1, user_col2 = st.columns([0.6, 0.4])
+        with user_col1:
+            st.markdown(f"👤 **{user_id}**")
+        with user_col2:
+            if st.button("Sign out", key="sign_out"):
+                st.session_state.clear()
+                st.rerun()
+    
+    st.markdown("---")
+    
+    # Navigation
+    page = st.radio(
+        "Navigate",
+        ["📊 Dashboard", "✅ Tasks", "⏱️ Pomodoro", "🔄 Habits", "😊 Mood", "🎯 Goals", "🔍 Search", "📈 Analytics"],
+        label_visibility="collapsed"
+    )
+    
+    st.markdown("---")
+    
+    # Today's date
+    st.markdown("##### 📅 Today")
+    st.markdown(f"**{datetime.now().strftime('%B %d, %Y')}**")
+    st.caption(datetime.now().strftime('%A'))
+    
+    st.markdown("---")
+    
+    # Quick stats
+    sidebar_stats()
+
+timer.page = page
+timer.lap("header")
+
+# ============ DASHBOARD PAGE ============
+if page == "📊 Dashboard":
+    st.markdown('<h1 class="main-header"><span>Productivity Dashboard</span></h1>', unsafe_allow_html=True)
+    
+    timer.lap("metrics")
+    # Metrics row
+    dashboard_metrics()
+    
+    st.markdown("---")
+    
+    timer.lap("today")
+    # Today's overview
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        dashboard_tasks()
+    
+    with col2:
+        dashboard_habits()
+    
+    st.markdown("---")
+    
+    timer.lap("weekly chart")
+    # Weekly activity chart
+    st.markdown("##### 📈 Weekly Activity")
+    
+    show_chart('weekly_activity', ('tasks', 'habit_logs', 'daily_activity'), weekly_activity_figure)
+
+# ============ TASKS PAGE ============
+elif page == "✅ Tasks":
+    st.markdown("## ✅ Tasks")
+    st.caption("Manage your to-do list")
+    
+    timer.lap("add form")
+    # Add new task form
+    with st.expander("➕ Add New Task", expanded=False):
+        col1, col2 = st.columns([3, 1])
+        
+        with col1:
+            new_task_title = st.text_input("Title", placeholder="What needs to be done?", key="new_task_title")
+            new_task_desc = st.text_area("Description", height=80, placeholder="Add details...", key="new_task_desc")
+        
+        with col2:
+            new_task_priority = st.selectbox("Priority", ["low", "medium", "high"], key="new_task_priority")
+            new_task_due = st.date_input("Due Date", value=None, key="new_task_due")
+        
+        if st.button("Add Task", type="primary", key="add_task_btn"):
+            if new_task_title:
+                due_date = new_task_due.isoformat() if new_task_due else None
+                db.add_task(new_task_title, new_task_desc, new_task_priority, due_date)
+                st.success("Task added!")
+                st.rerun()
+            else:
+                st.error("Please enter a title")
+    
+    st.markdown("---")
+    
+    timer.lap("task list")
+    # Task filters
+    filter_col1, filter_col2 = st.columns([0.7, 0.3])
+    with filter_col1:
+        status_filter = st.selectbox(
+            "Filter",
+            ["all", "pending", "in_progress", "completed"],
+            key="task_status_filter",
+            label_visibility="collapsed"
+        )
+    with filter_col2:
+        show_archived = st.checkbox("Include archived", key="task_show_archived")
+    
+    # Display tasks one page at a time; the cursor stack holds each visited page's start
+    task_status = status_filter if status_filter != "all" else None
+    if st.session_state.get("task_page_filter") != (status_filter, show_archived):
+        st.session_state.task_page_filter = (status_filter, show_archived)
+        st.session_state.task_page_cursors = []
+    cursors = st.session_state.task_page_cursors
+    
+    page_tasks = db.get_all_tasks(
+        task_status,
+        limit=TASKS_PER_PAGE + 1,
+        after=cursors[-1] if cursors else None,
+        archived=show_archived
+    )
+    has_next = len(page_tasks) > TASKS_PER_PAGE
+    all_tasks = page_tasks[:TASKS_PER_PAGE]
+    
+    if all_tasks:
+        for idx, task in enumerate(all_tasks):
+            # Archived tasks are read-only history
+            if task.get('archived_at'):
+                col3, _ = task_columns(task)
+                with col3:
+                    st.caption(f"📦 Archived {task['archived_at'][:10]}")
+                st.divider()
+            else:
+                task_row(task, idx)
+        
+        # Pagination controls
+        total_tasks = db.count_tasks(task_status, archived=show_archived)
+        first_shown = len(cursors) * TASKS_PER_PAGE + 1
+        
+        nav_col1, nav_col2, nav_col3 = st.columns([0.2, 0.6, 0.2])
+        with nav_col1:
+            if st.button("← Previous", key="task_page_prev", disabled=not cursors):
+                cursors.pop()
+                st.rerun()
+        with nav_col2:
+            st.caption(f"Showing {first_shown}–{first_shown + len(all_tasks) - 1} of {total_tasks}")
+        with nav_col3:
+            if st.button("Next →", key="task_page_next", disabled=not has_next):
+                last = all_tasks[-1]
+                cursors.append((last['created_at'], last['id']))
+                st.rerun()
+    elif cursors:
+        # The current page emptied out (e.g. its last task was deleted)
+        cursors.pop()
+        st.rerun()
+    else:
+        st.info("No tasks found. Add one above!")
+
+# ============ HABITS PAGE ============
+elif page == "🔄 Habits":
+    st.markdown("## 🔄 Habits")
+    st.caption("Track your daily routines")
+    
+    timer.lap("add form")
+    # Add new habit
+    with st.expander("➕ Add New Habit", expanded=False):
+        col1, col2 = st.columns([2, 1])
+        
+        with col1:
+            new_habit_name = st.text_input("Habit Name", placeholder="e.g., Exercise, Read...", key="new_habit_name")
+            new_habit_desc = st.text_input("Description", placeholder="Optional details", key="new_habit_desc")
+        
+        with col2:
+            new_habit_freq = st.selectbox("Frequency", habit_history.FREQUENCIES, key="new_habit_freq")
+        
+        if st.button("Add Habit", type="primary", key="add_habit_btn"):
+            if new_habit_name:
+                db.add_habit(new_habit_name, new_habit_desc, new_habit_freq)
+                st.success("Habit added!")
+                st.rerun()
+    
+    st.markdown("---")
+    
+    timer.lap("habit list")
+    # Display habits
+    all_habits = db.get_all_habits()
+    
+    if all_habits:
+        habit_list()
+        
+        timer.lap("streak chart")
+        # Streak visualization
+        st.markdown("---")
+        st.markdown("##### 🏆 Streaks")
+        
+        show_chart('habit_streaks', ('habits', 'habit_logs', 'habit_streaks'), streak_figure)
+        
+        timer.lap("heatmap")
+        # Completion calendar
+        heatmap_col1, heatmap_col2 = st.columns([0.7, 0.3])
+        with heatmap_col1:
+            st.markdown("##### 📅 Last 12 Months")
+        with heatmap_col2:
+            heatmap_habits = {None: "All habits"}
+            heatmap_habits.update((h['id'], h['name']) for h in all_habits)
+            heatmap_habit = st.selectbox(
+                "Habit",
+                list(heatmap_habits),
+                format_func=heatmap_habits.get,
+                key="heatmap_habit",
+                label_visibility="collapsed"
+            )
+        
+        show_chart('habit_heatmap', ('habits', 'habit_logs'), habit_heatmap_figure, heatmap_habit)
+    else:
+        st.info("No habits yet. Add one above!")
+
+# ============ MOOD PAGE ============
+elif page == "😊 Mood":
+    timer.lap("logger")
+    st.markdown("## 😊 Mood")
+    st.caption("Track how you're feeling")
+    
+    mood_logger()
+    
+    st.markdown("---")
+    
+    timer.lap("trend chart")
+    # Mood history
+    trend_col1, trend_col2 = st.columns([0.7, 0.3])
+    with trend_col1:
+        st.markdown("##### 📈 Mood Trend")
+    with trend_col2:
+        trend_range = st.selectbox(
+            "Range",
+            list(MOOD_RANGES),
+            key="mood_trend_range",
+            label_visibility="collapsed"
+        )
+    
+    mood_entries = db.get_mood_entries(None, limit=5)
+    
+    if mood_entries:
+        if not show_chart('mood_trend', ('mood_entries',), mood_trend_figure, MOOD_RANGES[trend_range]):
+            st.caption("No entries in this range")
+        
+        timer.lap("recent entries")
+        # Recent entries
+        st.markdown("##### 📝 Recent Entries")
+        for idx, entry in enumerate(mood_entries):
+            col1, col2 = st.columns([0.12, 0.88])
+            with col1:
+                st.markdown(f"### {entry['mood_emoji']}")
+            with col2:
+                st.markdown(f"**{entry['logged_at'][:10]}** · {entry['mood_score']}/7 · {sentiment_label(entry['sentiment_score'])}")
+                if entry['notes']:
+                    st.caption(entry['notes'][:80] + "..." if len(entry['notes']) > 80 else entry['notes'])
+            st.divider()
+    else:
+        st.info("No mood entries yet. Log your first mood above!")
+
+# ============ GOALS PAGE ============
+elif page == "🎯 Goals":
+    st.markdown("## 🎯 Goals")
+    st.caption("Track your progress")
+    
+    timer.lap("add form")
+    # Add new goal
+    with st.expander("➕ Add New Goal", expanded=False):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            goal_title = st.text_input("Goal", placeholder="e.g., Read 24 books", key="goal_title")
+            goal_desc = st.text_area("Description", height=80, placeholder="Why is this important?", key="goal_desc")
+        
+        with col2:
+            col2a, col2b = st.columns(2)
+            with col2a:
+                target_value = st.number_input("Target", min_value=1, value=100, key="goal_target")
+            with col2b:
+                unit = st.text_input("Unit", placeholder="books, km...", key="goal_unit")
+            deadline = st.date_input("Deadline", value=None, key="goal_deadline")
+        
+        if st.button("Add Goal", type="primary", key="add_goal_btn"):
+            if goal_title and target_value > 0:
+                deadline_str = deadline.isoformat() if deadline else None
+                db.add_goal(goal_title, target_value, unit, goal_desc, deadline_str)
+                st.success("Goal added!")
+                st.rerun()
+    
+    st.markdown("---")
+    
+    timer.lap("goal list")
+    # Display goals
+    all_goals = db.get_all_goals()
+    
+    if all_goals:
+        for idx, goal in enumerate(all_goals):
+            goal_editor(goal, idx)
+    else:
+        st.info("No goals yet. Set one above!")
+
+# ============ POMODORO PAGE ============
+elif page == "⏱️ Pomodoro":
+    st.markdown("## ⏱️ Pomodoro")
+    st.caption("Focus in timed sessions")
+    
+    timer.lap("timer")
+    if st.session_state.pop("pomodoro_finished", False):
+        st.success("Session complete! Take a short break.")
+    
+    if db.get_active_pomodoro():
+        pomodoro_countdown()
+    else:
+        open_tasks = (db.get_all_tasks(status="in_progress", limit=50)
+                      + db.get_all_tasks(status="pending", limit=50))
+        task_titles = {None: "No task"}
+        task_titles.update((task['id'], task['title']) for task in open_tasks)
+        
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            focus_task = st.selectbox("Task", list(task_titles), format_func=task_titles.get, key="pomodoro_task")
+        with col2:
+            focus_length = st.selectbox("Minutes", POMODORO_LENGTHS, index=1, key="pomodoro_length")
+        
+        if st.button("Start", type="primary", key="start_pomodoro_btn"):
+            db.start_pomodoro(focus_task, focus_length)
+            st.rerun()
+    
+    st.markdown("---")
+    
+    # Focus time
+    timer.lap("focus stats")
+    week_start = date.today() - timedelta(days=6)
+    focus_by_day = db.get_focus_by_day(week_start.isoformat(), date.today().isoformat())
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Focus Today", f"{focus_by_day.get(date.today().isoformat(), 0)} min")
+    with col2:
+        st.metric("Focus This Week", f"{sum(focus_by_day.values())} min")
+    
+    st.markdown("##### 📈 Last 7 Days")
+    show_chart('focus_by_day', ('pomodoro_sessions', 'daily_activity'), focus_by_day_figure)
+    
+    st.markdown("##### 🎯 Focus by Task (30 days)")
+    focus_by_task = db.get_focus_by_task(days=30)
+    if focus_by_task:
+        st.dataframe({
+            "Task": [row['task_title'] or "No task" for row in focus_by_task],
+            "Sessions": [row['sessions'] for row in focus_by_task],
+            "Minutes": [row['focus_minutes'] for row in focus_by_task]
+        }, use_container_width=True, hide_index=True)
+    else:
+        st.info("No completed sessions yet. Start one above!")
+
+# ============ SEARCH PAGE ============
+elif page == "🔍 Search":
+    st.markdown("## 🔍 Search")
+    st.caption("Find tasks, goals and mood notes")
+    
+    col1, col2 = st.columns([0.6, 0.4])
+    with col1:
+        search_text = st.text_input(
+            "Search",
+            placeholder="Search...",
+            key="search_text",
+            label_visibility="collapsed"
+        )
+    with col2:
+        search_kinds = st.multiselect(
+            "Look in",
+            list(SEARCH_KINDS),
+            default=list(SEARCH_KINDS),
+            format_func=SEARCH_KINDS.get,
+            key="search_kinds",
+            label_visibility="collapsed"
+        )
+    
+    timer.lap("results")
+    if search_text.strip():
+        results = db.search(search_text, kinds=tuple(search_kinds), limit=SEARCH_RESULTS)
+        
+        for result in results:
+            day = (result['at'] or "")[:10]
+            if result['kind'] == 'mood_entries':
+                heading = f"{html.escape(result['title'] or '')} {day}"
+                details = [SEARCH_KINDS['mood_entries']]
+            else:
+                heading = f"<strong>{highlighted(result['title'])}</strong>"
+                details = [SEARCH_KINDS[result['kind']], (result['status'] or "").replace('_', ' '), day]
+            
+            # Everything from the database is escaped; only the match marks are markup
+            body = f"<br>{highlighted(result['snippet'])}" if result['snippet'] else ""
+            st.markdown(f"<div class='search-hit'>{heading}{body}</div>", unsafe_allow_html=True)
+            st.caption(" · ".join(d for d in details if d))
+            st.divider()
+        
+        if not results:
+            st.info("No matches. Try fewer or shorter words.")
+
+# ============ ANALYTICS PAGE ============
+elif page == "📈 Analytics":
+    timer.lap("metrics")
+    st.markdown("## 📈 Analytics")
+    st.caption("Your productivity insights")
+    
+    stats = db.get_productivity_stats()
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Total Tasks", stats['total_tasks'])
+    with col2:
+        st.metric("Completed", stats['completed_tasks'])
+    with col3:
+        st.metric("Completion %", f"{stats['completion_rate']:.0f}%")
+    with col4:
+        st.metric("Avg Mood", f"{stats['average_mood']:.1f}")
+    
+    st.markdown("---")
+    
+    timer.lap("charts")
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("##### Task Distribution")
+        if not show_chart('task_distribution', ('tasks',), task_distribution_figure):
+            st.info("No data yet")
+    
+    with col2:
+        st.markdown("##### Mood Trend")
+        if not show_chart('daily_mood', ('mood_entries',), daily_mood_figure):
+            st.info("No data yet")
+    
+    timer.lap("habit table")
+    # Habit performance
+    st.markdown("##### Habit Performance")
+    habit_rates = analytics.habit_completion_rates(db, days=30)
+    
+    if habit_rates['habit_id']:
+        habit_data = {
+            "Habit": habit_rates['name'],
+            "Streak": habit_rates['streak'],
+            "Best": habit_rates['longest_streak'],
+            "Unit": habit_rates['streak_unit'],
+            "30-day %": habit_rates['completion_rate'],
+            "Status": ["✅ Done" if done else "○ Pending" for done in habit_rates['completed_today']]
+        }
+        st.dataframe(habit_data, use_container_width=True, hide_index=True)
+    else:
+        st.info("No habits tracked yet")
+    
+    timer.lap("goal chart")
+    # Goal progress
+    st.markdown("##### Goal Progress")
+    if not show_chart('goal_progress', ('goals',), goal_progress_figure):
+        st.info("No goals set yet")
+
+# Footer
+timer.lap("footer")
+st.markdown("""
+<div class="footer">
+    Productivity Dashboard · Built by Dakxh_69
+</div>
+""", unsafe_allow_html=True)
+
+# ============ DEBUG PANEL ============
+if recorder:
+    render_seconds = timer.finish()
+    sql_ms = sum(query['ms'] for query in timer.queries)
+    
+    with st.sidebar:
+        with st.expander("🛠️ Debug", expanded=False):
+            st.caption(f"{page} · {render_seconds * 1000:.0f} ms · "
+                       f"{len(timer.queries)} queries · {sql_ms:.1f} ms in SQL")
+            st.dataframe({
+                "Section": [section for section, _ in timer.laps],
+                "ms": [round(seconds * 1000, 1) for _, seconds in timer.laps]
+            }, use_container_width=True, hide_index=True)
+            
+            slowest = sorted(timer.queries, key=lambda query: -query['ms'])[:20]
+            st.dataframe({
+                "SQL": [query['sql'] for query in slowest],
+                "ms": [round(query['ms'], 2) for query in slowest],
+                "Rows": [query['rows'] for query in slowest],
+                "Section": [query['section'] for query in slowest]
+            }, use_container_width=True, hide_index=True)
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                st.download_button("JSON", recorder.to_json(), file_name="dashboard-metrics.json",
+                                   mime="application/json", key="debug_json")
+            with col2:
+                st.download_button("Prometheus", recorder.to_prometheus(),
+                                   file_name="dashboard-metrics.prom", mime="text/plain",
+                                   key="debug_prom")
+    
+    if os.environ.get("DASHBOARD_METRICS_FILE"):
+        recorder.export(os.environ["DASHBOARD_METRICS_FILE"])
@@ -0,0 +1,255 @@
+"""
+Benchmark suite for Productivity Dashboard
+Times every Database method and each page's data loading on synthetic datasets
+Usage: python benchmark.py [--scales 1k,100k,1m] [--out bench.json] [--baseline old.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Tuple
+
+import analytics
+import habit_history
+import synthetic
+from database import Database
+
+TASKS_PER_PAGE = 25
+MOOD_CHART_POINTS = 200
+
+# Page -> the reads it makes on a rerun (mirrors app.py; the sidebar loads stats on every page)
+PAGE_LOADS = {
+    "📊 Dashboard": lambda db: (
+        db.get_productivity_stats(), db.get_all_tasks(status="pending", limit=5),
+        db.get_all_habits(), db.get_weekly_activity(),
+    ),
+    "✅ Tasks": lambda db: (
+        db.get_productivity_stats(), db.get_all_tasks(None, limit=TASKS_PER_PAGE),
+        db.count_tasks(None),
+    ),
+    "⏱️ Pomodoro": lambda db: (
+        db.get_productivity_stats(), db.get_active_pomodoro(),
+        db.get_all_tasks(status="in_progress", limit=50), db.get_all_tasks(status="pending", limit=50),
+        db.get_focus_by_day((date.today() - timedelta(days=6)).isoformat(), date.today().isoformat()),
+        db.get_focus_by_task(days=30),
+    ),
+    "🔄 Habits": lambda db: (
+        db.get_productivity_stats(), db.get_all_habits(), habit_history.load_histories(db),
+        habit_history.completion_matrix(db, date.today() - timedelta(days=370), date.today()),
+    ),
+    "😊 Mood": lambda db: (
+        db.get_productivity_stats(), db.get_mood_series(30, max_points=MOOD_CHART_POINTS),
+        db.get_mood_entries(None, limit=5),
+    ),
+    "🎯 Goals": lambda db: (db.get_productivity_stats(), db.get_all_goals()),
+    "🔍 Search": lambda db: (db.get_productivity_stats(), db.search("report", limit=20)),
+    "📈 Analytics": lambda db: (
+        db.get_productivity_stats(), analytics.task_status_counts(db),
+        analytics.daily_mood_means(db, days=30), analytics.habit_completion_rates(db, days=30),
+        db.get_all_goals(),
+    ),
+}
+
+
+def _time(fn: Callable, runs: int) -> Dict:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": round(statistics.median(samples), 3), "min_ms": round(min(samples), 3)}
+
+
+def method_cases(db: Database) -> List[Tuple[str, Callable]]:
+    """(name, call) for every public Database method; writes undo themselves where they can"""
+    habit_id = db.get_all_habits()[0]["id"]
+    task_id = db.get_all_tasks(limit=1)[0]["id"]
+    goal_id = db.get_all_goals()[0]["id"]
+    mood_id = db.get_mood_entries(None, limit=1)[0]["id"]
+    today = date.today()
+    month_ago = (today - timedelta(days=30)).isoformat()
+    five_years_ago = today - timedelta(days=5 * 365)
+    fresh_habit = db.add_habit("Benchmark habit")
+
+    def add_and_delete_task():
+        db.delete_task(db.add_task("Benchmark task"))
+
+    def add_and_delete_habit():
+        db.delete_habit(db.add_habit("Benchmark habit"))
+
+    def add_and_delete_goal():
+        db.delete_goal(db.add_goal("Benchmark goal", 10, "units"))
+
+    def toggle_task_status():
+        db.update_task_status(task_id, "completed")
+        db.update_task_status(task_id, "pending")
+
+    def start_and_stop_pomodoro():
+        db.stop_pomodoro(db.start_pomodoro(task_id))
+
+    def log_habit_backfill():
+        # An older date forces the streak rebuild path for one habit
+        db.log_habit(fresh_habit, (today - timedelta(days=400)).isoformat())
+
+    return [
+        ("add_task+delete_task", add_and_delete_task),
+        ("update_task_status x2", toggle_task_status),
+        ("get_all_tasks", lambda: db.get_all_tasks()),
+        ("get_all_tasks(status)", lambda: db.get_all_tasks(status="pending")),
+        ("get_all_tasks(page)", lambda: db.get_all_tasks(limit=TASKS_PER_PAGE)),
+        ("count_tasks", lambda: db.count_tasks()),
+        ("get_task", lambda: db.get_task(task_id)),
+        ("get_all_tasks(archived page)", lambda: db.get_all_tasks(limit=TASKS_PER_PAGE, archived=True)),
+        ("add_habit+delete_habit", add_and_delete_habit),
+        ("get_all_habits", lambda: db.get_all_habits()),
+        ("log_habit(today)", lambda: db.log_habit(fresh_habit)),
+        ("log_habit(backfill)", log_habit_backfill),
+        ("is_habit_completed_today", lambda: db.is_habit_completed_today(habit_id)),
+        ("calculate_streak", lambda: db.calculate_streak(habit_id)),
+        ("rebuild_habit_streaks(one)", lambda: db.rebuild_habit_streaks(habit_id)),
+        ("rebuild_habit_streaks(all)", lambda: db.rebuild_habit_streaks()),
+        ("add_mood_entry", lambda: db.add_mood_entry(4, "🙂", "", 0.0)),
+        ("get_mood_entries(30)", lambda: db.get_mood_entries(30)),
+        ("get_mood_entries(all)", lambda: db.get_mood_entries(None)),
+        ("get_mood_series(all)", lambda: db.get_mood_series(None)),
+        ("get_unscored_mood_entries", lambda: db.get_unscored_mood_entries(include_scored=True)),
+        ("set_sentiment_scores", lambda: db.set_sentiment_scores([(mood_id, 0.5)])),
+        ("get_cached_sentiments", lambda: db.get_cached_sentiments(["0" * 64])),
+        ("start_pomodoro+stop_pomodoro", start_and_stop_pomodoro),
+        ("get_active_pomodoro", lambda: db.get_active_pomodoro()),
+        ("get_focus_by_task", lambda: db.get_focus_by_task(days=None)),
+        ("get_focus_by_day", lambda: db.get_focus_by_day(month_ago, today.isoformat())),
+        ("add_goal+delete_goal", add_and_delete_goal),
+        ("get_all_goals", lambda: db.get_all_goals()),
+        ("get_goal", lambda: db.get_goal(goal_id)),
+        ("update_goal_progress", lambda: db.update_goal_progress(goal_id, 5)),
+        ("search(word)", lambda: db.search("report")),
+        ("search(prefix)", lambda: db.search("ta")),
+        ("search(words)", lambda: db.search("slept badly")),
+        ("rebuild_search_index", lambda: db.rebuild_search_index()),
+        ("get_productivity_stats", lambda: db.get_productivity_stats()),
+        ("rebuild_stats_counters", lambda: db.rebuild_stats_counters()),
+        ("get_weekly_activity", lambda: db.get_weekly_activity()),
+        ("get_activity(week)", lambda: db.get_activity(month_ago, today.isoformat(), "week")),
+        ("rebuild_daily_activity", lambda: db.rebuild_daily_activity()),
+        ("archive(nothing due)", lambda: db.archive(100_000, 100_000, 100_000)),
+        ("iter_rows(tasks)", lambda: sum(len(chunk) for chunk in db.iter_rows("tasks"))),
+        ("task_status_counts", lambda: analytics.task_status_counts(db)),
+        ("daily_mood_means", lambda: analytics.daily_mood_means(db)),
+        ("habit_completion_rates", lambda: analytics.habit_completion_rates(db)),
+        ("completion_matrix(5y)", lambda: habit_history.completion_matrix(db, five_years_ago, today)),
+    ]
+
+
+def run_scale(scale: str, runs: int, seed: int, workdir: str) -> Dict:
+    """Generate one dataset and time methods (uncached) and page loads (cold and warm cache)"""
+    os.makedirs(workdir, exist_ok=True)
+    path = os.path.join(workdir, f"bench-{scale}.db")
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+    # cache_size=0 keeps every read uncached so methods are timed against SQLite
+    db = Database(path, cache_size=0)
+    start = time.perf_counter()
+    rows = synthetic.generate(db, seed=seed, **synthetic.SCALES[scale])
+    result = {"rows": rows, "generate_s": round(time.perf_counter() - start, 2),
+              "methods": {}, "pages": {}}
+
+    for name, call in method_cases(db):
+        result["methods"][name] = _time(call, runs)
+
+    warm_db = Database(path)
+    for page, load in PAGE_LOADS.items():
+        load(warm_db)
+        result["pages"][page] = {
+            "cold": _time(lambda: load(db), runs),
+            "warm": _time(lambda: load(warm_db), runs),
+        }
+    warm_db.close()
+    db.close()
+    return result
+
+
+def run(scales: List[str], runs: int = 5, seed: int = 42, workdir: str = None) -> Dict:
+    report = {"python": platform.python_version(), "sqlite": sqlite3.sqlite_version,
+              "runs": runs, "seed": seed, "scales": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in scales:
+            report["scales"][scale] = run_scale(scale, runs, seed, workdir or tmp)
+    return report
+
+
+def _medians(report: Dict) -> Dict[str, float]:
+    """Flatten a report to {'scale / name': median_ms}"""
+    flat = {}
+    for scale, result in report.get("scales", {}).items():
+        for name, timing in result.get("methods", {}).items():
+            flat[f"{scale} / {name}"] = timing["median_ms"]
+        for page, timing in result.get("pages", {}).items():
+            for mode in ("cold", "warm"):
+                flat[f"{scale} / {page} ({mode})"] = timing[mode]["median_ms"]
+    return flat
+
+
+def regressions(report: Dict, baseline: Dict, tolerance: float, floor_ms: float) -> List[str]:
+    """Timings that grew more than tolerance (fraction) and more than floor_ms over the baseline"""
+    old = _medians(baseline)
+    problems = []
+    for name, ms in _medians(report).items():
+        before = old.get(name)
+        if before is not None and ms > before * (1 + tolerance) and ms - before > floor_ms:
+            problems.append(f"{name}: {before} ms -> {ms} ms")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Database methods and page loads")
+    parser.add_argument("--scales", default="1k,100k,1m",
+                        help=f"Comma-separated dataset sizes ({', '.join(synthetic.SCALES)})")
+    parser.add_argument("--runs", type=int, default=5, help="Timed calls per method")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workdir", help="Keep the generated databases here")
+    parser.add_argument("--out", help="Write the JSON report here")
+    parser.add_argument("--baseline", help="Earlier report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown (0.25 = 25%%)")
+    parser.add_argument("--floor-ms", type=float, default=1.0,
+                        help="Ignore slowdowns smaller than this many milliseconds")
+    args = parser.parse_args(argv)
+
+    scales = [s.strip().lower() for s in args.scales.split(",") if s.strip()]
+    unknown = set(scales) - set(synthetic.SCALES)
+    if unknown:
+        parser.error(f"unknown scales: {', '.join(sorted(unknown))}")
+
+    report = run(scales, args.runs, args.seed, args.workdir)
+    for scale, result in report["scales"].items():
+        print(f"== {scale}: {sum(result['rows'].values()):,} rows, generated in {result['generate_s']} s")
+        for name, timing in result["methods"].items():
+            print(f"  {name:<32} {timing['median_ms']:>10.2f} ms")
+        for page, timing in result["pages"].items():
+            print(f"  {page:<32} {timing['cold']['median_ms']:>10.2f} ms cold"
+                  f" {timing['warm']['median_ms']:>10.2f} ms warm")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fp:
+            json.dump(report, fp, indent=2, ensure_ascii=False)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fp:
+            problems = regressions(report, json.load(fp), args.tolerance, args.floor_ms)
+        if problems:
+            print("❌ Benchmark regressions:\n  " + "\n  ".join(problems))
+            sys.exit(1)
+        print("✅ Within benchmark baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Read cache for Productivity Dashboard
+Bounded LRU of query results, invalidated per table on write
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Set
+
+MISSING = object()
+
+
+class ReadCache:
+    """Thread-safe LRU whose entries remember which tables they were read from"""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._tables: Dict[Hashable, frozenset] = {}
+        self._by_table: Dict[str, Set[Hashable]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value (marking it recently used) or MISSING"""
+        with self._lock:
+            try:
+                self._entries.move_to_end(key)
+            except KeyError:
+                self.misses += 1
+                return MISSING
+            self.hits += 1
+            return self._entries[key]
+
+    def put(self, key: Hashable, value: Any, tables: Iterable[str]):
+        """Store a value, evicting the least recently used entries beyond maxsize"""
+        tables = frozenset(tables)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = value
+            self._tables[key] = tables
+            for table in tables:
+                self._by_table.setdefault(table, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate(self, tables: Iterable[str]):
+        """Drop exactly the entries that were read from any of the given tables"""
+        with self._lock:
+            for table in tables:
+                for key in list(self._by_table.get(table, ())):
+                    self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tables.clear()
+            self._by_table.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _drop(self, key: Hashable):
+        del self._entries[key]
+        for table in self._tables.pop(key):
+            keys = self._by_table[table]
+            keys.discard(key)
+            if not keys:
+                del self._by_table[table]
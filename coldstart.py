@@ -0,0 +1,117 @@
+"""
+Cold-start import budget for Productivity Dashboard
+Measures per-page import time with `python -X importtime` and flags regressions
+Usage: python coldstart.py [--runs 5] [--out report.json] [--baseline old.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Modules every session imports before a page renders
+BASE_IMPORTS = ("streamlit", "database", "analytics", "habit_history", "instrumentation",
+                "sentiment", "theme")
+
+# Page -> heavy modules it imports lazily (mirrors the chart builders in app.py;
+# a fresh process always misses the figure cache, so builders count in full)
+PAGE_IMPORTS = {
+    "📊 Dashboard": ("plotly.io", "plotly.graph_objects"),
+    "✅ Tasks": (),
+    "⏱️ Pomodoro": ("plotly.io", "plotly.graph_objects"),
+    "🔄 Habits": ("plotly.io", "pandas", "plotly.express", "plotly.graph_objects", "numpy"),
+    "😊 Mood": ("plotly.io", "plotly.graph_objects"),
+    "🎯 Goals": (),
+    "🔍 Search": (),
+    "📈 Analytics": ("plotly.io", "pandas", "plotly.express"),
+}
+
+# Not a page: what a sentiment score costs the first time a mood is logged
+EXTRA_PROBES = {
+    "sentiment (first mood logged)": ("textblob",),
+}
+
+
+def measure(modules: Tuple[str, ...]) -> Tuple[float, List[Tuple[str, float]]]:
+    """Import modules in a fresh interpreter; return total ms and top-level imports by cost"""
+    code = "; ".join(f"import {m}" for m in modules) or "pass"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True, check=True,
+    )
+
+    total_us = 0
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        total_us += int(self_us)
+        depth = len(name) - len(name.lstrip())
+        entries.append((depth, name.strip(), int(cumulative_us)))
+
+    top_depth = min((d for d, _, _ in entries), default=0)
+    top = sorted(((n, c / 1000) for d, n, c in entries if d == top_depth), key=lambda e: -e[1])
+    return total_us / 1000, top
+
+
+def run(runs: int = 5) -> Dict:
+    """Median import time per page over several cold interpreters"""
+    probes = {page: BASE_IMPORTS + mods for page, mods in PAGE_IMPORTS.items()}
+    probes.update(EXTRA_PROBES)
+
+    report = {"python": platform.python_version(), "runs": runs, "pages": {}}
+    for page, modules in probes.items():
+        samples = [measure(modules) for _ in range(runs)]
+        totals = [total for total, _ in samples]
+        report["pages"][page] = {
+            "modules": list(modules),
+            "median_ms": round(statistics.median(totals), 1),
+            "min_ms": round(min(totals), 1),
+            "top_imports_ms": [[n, round(ms, 1)] for n, ms in samples[-1][1][:10]],
+        }
+    return report
+
+
+def regressions(report: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Pages whose median grew more than tolerance (fraction) over the baseline"""
+    problems = []
+    for page, result in report["pages"].items():
+        old = baseline.get("pages", {}).get(page)
+        if old and result["median_ms"] > old["median_ms"] * (1 + tolerance):
+            problems.append(f"{page}: {old['median_ms']} ms -> {result['median_ms']} ms")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-page cold-start import report")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per page")
+    parser.add_argument("--out", help="Write the JSON report here")
+    parser.add_argument("--baseline", help="Earlier report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    report = run(args.runs)
+    for page, result in report["pages"].items():
+        print(f"{page:<32} {result['median_ms']:>8.1f} ms")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fp:
+            json.dump(report, fp, indent=2, ensure_ascii=False)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fp:
+            problems = regressions(report, json.load(fp), args.tolerance)
+        if problems:
+            print("❌ Cold-start regressions:\n  " + "\n  ".join(problems))
+            sys.exit(1)
+        print("✅ Within cold-start budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Streaming import/export for Productivity Dashboard
+Moves tables in and out as chunked CSV or NDJSON in constant memory
+"""
+
+import csv
+import json
+import os
+from itertools import chain, islice
+from typing import Callable, Dict, IO, Iterator, List, Optional, Sequence
+
+from database import Database
+
+FORMATS = ("csv", "ndjson")
+
+# CSV has no NULL, so it is written as \N (the PostgreSQL COPY convention)
+CSV_NULL = "\\N"
+
+ProgressCallback = Callable[[str, int], None]
+
+
+def export_table(db: Database, table: str, fp: IO[str], fmt: str = "ndjson",
+                 chunk_size: int = 1000, progress: Optional[ProgressCallback] = None) -> int:
+    """Write one table to an open text file and return the number of rows written"""
+    columns = db.table_columns(table)
+    if fmt == "csv":
+        writer = csv.writer(fp)
+        writer.writerow(columns)
+    elif fmt != "ndjson":
+        raise ValueError(f"Unknown format: {fmt}")
+
+    written = 0
+    for chunk in db.iter_rows(table, chunk_size):
+        if fmt == "csv":
+            writer.writerows([CSV_NULL if v is None else v for v in row] for row in chunk)
+        else:
+            fp.writelines(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n" for row in chunk)
+        written += len(chunk)
+        if progress:
+            progress(table, written)
+    return written
+
+
+def _read_csv(fp: IO[str]) -> Iterator[Dict]:
+    for record in csv.DictReader(fp):
+        yield {k: None if v == CSV_NULL else v for k, v in record.items()}
+
+
+def _read_ndjson(fp: IO[str]) -> Iterator[Dict]:
+    for line in fp:
+        if line.strip():
+            yield json.loads(line)
+
+
+def import_table(db: Database, table: str, fp: IO[str], fmt: str = "ndjson",
+                 batch_size: int = 1000, on_conflict: str = "abort",
+                 progress: Optional[ProgressCallback] = None) -> int:
+    """Load one table from an open text file, committing every batch_size rows"""
+    if fmt == "csv":
+        records = _read_csv(fp)
+    elif fmt == "ndjson":
+        records = _read_ndjson(fp)
+    else:
+        raise ValueError(f"Unknown format: {fmt}")
+
+    first = next(records, None)
+    if first is None:
+        return 0
+    columns: List[str] = list(first)
+    records = chain([first], records)
+
+    loaded = 0
+    while True:
+        batch = [tuple(r.get(c) for c in columns) for r in islice(records, batch_size)]
+        if not batch:
+            break
+        db.insert_rows(table, columns, batch, on_conflict=on_conflict)
+        loaded += len(batch)
+        if progress:
+            progress(table, loaded)
+
+    if table in ("habit_logs", "habit_logs_archive"):
+        db.rebuild_habit_streaks()
+    # Archive tables have no triggers, and REPLACE deletes rows without firing delete
+    # triggers, so the replaced rows' counts and index entries would be left behind
+    if table.endswith("_archive") or on_conflict == "replace":
+        db.rebuild_stats_counters()
+        db.rebuild_daily_activity()
+    if on_conflict == "replace" and table in db.SEARCH_TABLES:
+        db.rebuild_search_index(table)
+    return loaded
+
+
+def _path(directory: str, table: str, fmt: str) -> str:
+    return os.path.join(directory, f"{table}.{'csv' if fmt == 'csv' else 'ndjson'}")
+
+
+def export_all(db: Database, directory: str, fmt: str = "ndjson",
+               tables: Sequence[str] = Database.DATA_TABLES, chunk_size: int = 1000,
+               progress: Optional[ProgressCallback] = None) -> Dict[str, int]:
+    """Export tables to <directory>/<table>.<fmt>, one file per table"""
+    os.makedirs(directory, exist_ok=True)
+    counts = {}
+    for table in tables:
+        with open(_path(directory, table, fmt), "w", encoding="utf-8", newline="") as fp:
+            counts[table] = export_table(db, table, fp, fmt, chunk_size, progress)
+    return counts
+
+
+def import_all(db: Database, directory: str, fmt: str = "ndjson",
+               tables: Sequence[str] = Database.DATA_TABLES, batch_size: int = 1000,
+               on_conflict: str = "abort",
+               progress: Optional[ProgressCallback] = None) -> Dict[str, int]:
+    """Import every <directory>/<table>.<fmt> that exists, parents before children"""
+    counts = {}
+    for table in (t for t in Database.DATA_TABLES if t in tables):
+        path = _path(directory, table, fmt)
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding="utf-8", newline="") as fp:
+            counts[table] = import_table(db, table, fp, fmt, batch_size, on_conflict, progress)
+    return counts
@@ -1,375 +1,1605 @@
-"""
-Database module for Productivity Dashboard
-Handles all SQLite operations
-"""
-
-import sqlite3
-from datetime import datetime, date, timedelta
-from typing import List, Dict, Optional
-import json
-
-
-class Database:
-    """SQLite database handler for all productivity data"""
-    
-    def __init__(self, db_name: str = "productivity.db"):
-        """Initialize database connection and create tables"""
-        self.db_name = db_name
-        self.conn = sqlite3.connect(db_name, check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row
-        self.create_tables()
-    
-    def create_tables(self):
-        """Create all necessary tables if they don't exist"""
-        cursor = self.conn.cursor()
-        
-        # Tasks table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS tasks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                description TEXT,
-                priority TEXT DEFAULT 'medium',
-                status TEXT DEFAULT 'pending',
-                due_date TEXT,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                completed_at TEXT
-            )
-        ''')
-        
-        # Habits table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS habits (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                description TEXT,
-                frequency TEXT DEFAULT 'daily',
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Habit logs table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS habit_logs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                habit_id INTEGER,
-                logged_date TEXT,
-                completed INTEGER DEFAULT 0,
-                FOREIGN KEY (habit_id) REFERENCES habits (id)
-            )
-        ''')
-        
-        # Mood entries table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS mood_entries (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                mood_score INTEGER,
-                mood_emoji TEXT,
-                notes TEXT,
-                sentiment_score REAL,
-                logged_at TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Goals table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS goals (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                description TEXT,
-                target_value REAL,
-                current_value REAL DEFAULT 0,
-                unit TEXT,
-                deadline TEXT,
-                status TEXT DEFAULT 'active',
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Pomodoro sessions table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS pomodoro_sessions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                task_id INTEGER,
-                duration_minutes INTEGER DEFAULT 25,
-                completed INTEGER DEFAULT 0,
-                started_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (task_id) REFERENCES tasks (id)
-            )
-        ''')
-        
-        self.conn.commit()
-    
-    # ============ TASK METHODS ============
-    
-    def add_task(self, title: str, description: str = "", 
-                 priority: str = "medium", due_date: str = None) -> int:
-        """Add a new task and return its ID"""
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            INSERT INTO tasks (title, description, priority, due_date)
-            VALUES (?, ?, ?, ?)
-        ''', (title, description, priority, due_date))
-        self.conn.commit()
-        return cursor.lastrowid
-    
-    def get_all_tasks(self, status: str = None) -> List[Dict]:
-        """Get all tasks, optionally filtered by status"""
-        cursor = self.conn.cursor()
-        if status:
-            cursor.execute('SELECT * FROM tasks WHERE status = ? ORDER BY created_at DESC', (status,))
-        else:
-            cursor.execute('SELECT * FROM tasks ORDER BY created_at DESC')
-        return [dict(row) for row in cursor.fetchall()]
-    
-    def update_task_status(self, task_id: int, status: str):
-        """Update task status (pending, in_progress, completed)"""
-        cursor = self.conn.cursor()
-        completed_at = datetime.now().isoformat() if status == 'completed' else None
-        cursor.execute('''
-            UPDATE tasks SET status = ?, completed_at = ? WHERE id = ?
-        ''', (status, completed_at, task_id))
-        self.conn.commit()
-    
-    def delete_task(self, task_id: int):
-        """Delete a task by ID"""
-        cursor = self.conn.cursor()
-        cursor.execute('DELETE FROM tasks WHERE id = ?', (task_id,))
-        self.conn.commit()
-    
-    # ============ HABIT METHODS ============
-    
-    def add_habit(self, name: str, description: str = "", 
-                  frequency: str = "daily") -> int:
-        """Add a new habit to track"""
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            INSERT INTO habits (name, description, frequency)
-            VALUES (?, ?, ?)
-        ''', (name, description, frequency))
-        self.conn.commit()
-        return cursor.lastrowid
-    
-    def get_all_habits(self) -> List[Dict]:
-        """Get all habits with their current streak"""
-        cursor = self.conn.cursor()
-        cursor.execute('SELECT * FROM habits ORDER BY created_at DESC')
-        habits = [dict(row) for row in cursor.fetchall()]
-        
-        # Calculate streak for each habit
-        for habit in habits:
-            habit['streak'] = self.calculate_streak(habit['id'])
-            habit['completed_today'] = self.is_habit_completed_today(habit['id'])
-        
-        return habits
-    
-    def log_habit(self, habit_id: int, logged_date: str = None):
-        """Log a habit completion for a specific date"""
-        if logged_date is None:
-            logged_date = date.today().isoformat()
-        
-        cursor = self.conn.cursor()
-        # Check if already logged
-        cursor.execute('''
-            SELECT id FROM habit_logs 
-            WHERE habit_id = ? AND logged_date = ?
-        ''', (habit_id, logged_date))
-        
-        if not cursor.fetchone():
-            cursor.execute('''
-                INSERT INTO habit_logs (habit_id, logged_date, completed)
-                VALUES (?, ?, 1)
-            ''', (habit_id, logged_date))
-            self.conn.commit()
-    
-    def is_habit_completed_today(self, habit_id: int) -> bool:
-        """Check if habit is completed today"""
-        cursor = self.conn.cursor()
-        today = date.today().isoformat()
-        cursor.execute('''
-            SELECT id FROM habit_logs 
-            WHERE habit_id = ? AND logged_date = ? AND completed = 1
-        ''', (habit_id, today))
-        return cursor.fetchone() is not None
-    
-    def calculate_streak(self, habit_id: int) -> int:
-        """Calculate current streak for a habit"""
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            SELECT logged_date FROM habit_logs 
-            WHERE habit_id = ? AND completed = 1
-            ORDER BY logged_date DESC
-        ''', (habit_id,))
-        
-        logs = cursor.fetchall()
-        if not logs:
-            return 0
-        
-        streak = 0
-        current_date = date.today()
-        
-        for log in logs:
-            log_date = date.fromisoformat(log[0])
-            expected_date = current_date - timedelta(days=streak)
-            
-            if log_date == expected_date:
-                streak += 1
-            elif log_date == expected_date - timedelta(days=1):
-                streak += 1
-                current_date = log_date + timedelta(days=streak - 1)
-            else:
-                break
-        
-        return streak
-    
-    def delete_habit(self, habit_id: int):
-        """Delete a habit and its logs"""
-        cursor = self.conn.cursor()
-        cursor.execute('DELETE FROM habit_logs WHERE habit_id = ?', (habit_id,))
-        cursor.execute('DELETE FROM habits WHERE id = ?', (habit_id,))
-        self.conn.commit()
-    
-    # ============ MOOD METHODS ============
-    
-    def add_mood_entry(self, mood_score: int, mood_emoji: str, 
-                       notes: str = "", sentiment_score: float = 0.0) -> int:
-        """Add a mood entry with optional notes"""
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            INSERT INTO mood_entries (mood_score, mood_emoji, notes, sentiment_score)
-            VALUES (?, ?, ?, ?)
-        ''', (mood_score, mood_emoji, notes, sentiment_score))
-        self.conn.commit()
-        return cursor.lastrowid
-    
-    def get_mood_entries(self, days: int = 30) -> List[Dict]:
-        """Get mood entries for the last N days"""
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            SELECT * FROM mood_entries 
-            ORDER BY logged_at DESC 
-            LIMIT ?
-        ''', (days,))
-        return [dict(row) for row in cursor.fetchall()]
-    
-    # ============ GOAL METHODS ============
-    
-    def add_goal(self, title: str, target_value: float, unit: str,
-                 description: str = "", deadline: str = None) -> int:
-        """Add a new goal"""
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            INSERT INTO goals (title, description, target_value, unit, deadline)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (title, description, target_value, unit, deadline))
-        self.conn.commit()
-        return cursor.lastrowid
-    
-    def get_all_goals(self, status: str = "active") -> List[Dict]:
-        """Get all goals with progress percentage"""
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            SELECT * FROM goals WHERE status = ?
-            ORDER BY created_at DESC
-        ''', (status,))
-        goals = [dict(row) for row in cursor.fetchall()]
-        
-        for goal in goals:
-            if goal['target_value'] > 0:
-                goal['progress'] = min(100, (goal['current_value'] / goal['target_value']) * 100)
-            else:
-                goal['progress'] = 0
-        
-        return goals
-    
-    def update_goal_progress(self, goal_id: int, current_value: float):
-        """Update goal progress"""
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            UPDATE goals SET current_value = ? WHERE id = ?
-        ''', (current_value, goal_id))
-        self.conn.commit()
-    
-    def delete_goal(self, goal_id: int):
-        """Delete a goal"""
-        cursor = self.conn.cursor()
-        cursor.execute('DELETE FROM goals WHERE id = ?', (goal_id,))
-        self.conn.commit()
-    
-    # ============ ANALYTICS METHODS ============
-    
-    def get_productivity_stats(self) -> Dict:
-        """Get overall productivity statistics"""
-        cursor = self.conn.cursor()
-        
-        # Task stats
-        cursor.execute('SELECT COUNT(*) FROM tasks WHERE status = "completed"')
-        completed_tasks = cursor.fetchone()[0]
-        
-        cursor.execute('SELECT COUNT(*) FROM tasks')
-        total_tasks = cursor.fetchone()[0]
-        
-        # Habit stats
-        cursor.execute('SELECT COUNT(*) FROM habit_logs WHERE completed = 1')
-        total_habit_completions = cursor.fetchone()[0]
-        
-        # Mood average
-        cursor.execute('SELECT AVG(mood_score) FROM mood_entries')
-        avg_mood = cursor.fetchone()[0] or 0
-        
-        # Goals stats
-        cursor.execute('SELECT COUNT(*) FROM goals WHERE status = "active"')
-        active_goals = cursor.fetchone()[0]
-        
-        return {
-            'completed_tasks': completed_tasks,
-            'total_tasks': total_tasks,
-            'completion_rate': (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0,
-            'total_habit_completions': total_habit_completions,
-            'average_mood': round(avg_mood, 1),
-            'active_goals': active_goals
-        }
-    
-    def get_weekly_activity(self) -> Dict:
-        """Get activity data for the past week"""
-        cursor = self.conn.cursor()
-        week_ago = (datetime.now() - timedelta(days=7)).isoformat()
-        
-        # Tasks completed this week
-        cursor.execute('''
-            SELECT DATE(completed_at) as day, COUNT(*) as count
-            FROM tasks 
-            WHERE completed_at >= ? AND status = 'completed'
-            GROUP BY DATE(completed_at)
-        ''', (week_ago,))
-        tasks_by_day = {row[0]: row[1] for row in cursor.fetchall()}
-        
-        # Habits completed this week
-        cursor.execute('''
-            SELECT logged_date, COUNT(*) as count
-            FROM habit_logs 
-            WHERE logged_date >= ?
-            GROUP BY logged_date
-        ''', (week_ago[:10],))
-        habits_by_day = {row[0]: row[1] for row in cursor.fetchall()}
-        
-        return {
-            'tasks_by_day': tasks_by_day,
-            'habits_by_day': habits_by_day
-        }
-
-
-# Test the database if run directly
-if __name__ == "__main__":
-    db = Database()
-    print("✅ Database created successfully!")
-    print("✅ All tables initialized!")
-    
-    # Test adding a task
-    task_id = db.add_task("Test Task", "This is a test", "high")
-    print(f"✅ Test task created with ID: {task_id}")
-    
-    # Clean up test
-    db.delete_task(task_id)
-    print("✅ Test task deleted")
+"""
+Database module for Productivity Dashboard
+Handles all SQLite operations
+"""
+
+import sqlite3
+import functools
+import itertools
+import re
+import threading
+from contextlib import contextmanager
+from datetime import datetime, date, timedelta
+from typing import List, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+from cache import MISSING, ReadCache
+from pool import ConnectionPool
+
+
+# Source of data_version() values, shared by every Database in the process so that
+# a database that is closed and reopened never hands out a version seen before
+_version_clock = itertools.count(1)
+
+
+def cached_read(*tables: str):
+    """Serve a read method from the Database read cache until one of tables is written"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            key = (method.__name__, args, tuple(sorted(kwargs.items())))
+            return self._read_through(key, tables, lambda: method(self, *args, **kwargs))
+        return wrapper
+    return decorator
+
+
+# Condition on insert/delete triggers of archived tables: rows moving to or from
+# the archive are still the same data, so counters and rollups must not change
+_UNLESS_MOVING = "WHEN NOT EXISTS (SELECT 1 FROM archive_state WHERE moving = 1)"
+
+
+def _rollup_triggers(table: str, day: str, metrics: Sequence[Tuple[str, str]],
+                     watched: str, guard: str = "") -> List[str]:
+    """Triggers that keep daily_activity in step with one source table
+    
+    day and each metric expression use {r} for the NEW/OLD row; an update is
+    applied as removing the old row's contribution and adding the new one's.
+    guard is an optional WHEN clause for the insert and delete triggers.
+    """
+    def add(r):
+        columns = ", ".join(col for col, _ in metrics)
+        values = ", ".join(expr.format(r=r) for _, expr in metrics)
+        updates = ", ".join(f"{col} = {col} + excluded.{col}" for col, _ in metrics)
+        return (f"INSERT INTO daily_activity (day, {columns}) "
+                f"SELECT {day.format(r=r)}, {values} WHERE {day.format(r=r)} IS NOT NULL "
+                f"ON CONFLICT (day) DO UPDATE SET {updates};")
+    
+    def remove(r):
+        updates = ", ".join(f"{col} = {col} - {expr.format(r=r)}" for col, expr in metrics)
+        return f"UPDATE daily_activity SET {updates} WHERE day = {day.format(r=r)};"
+    
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS activity_{table}_insert AFTER INSERT ON {table} {guard} "
+        f"BEGIN {add('NEW')} END",
+        f"CREATE TRIGGER IF NOT EXISTS activity_{table}_delete AFTER DELETE ON {table} {guard} "
+        f"BEGIN {remove('OLD')} END",
+        f"CREATE TRIGGER IF NOT EXISTS activity_{table}_update AFTER UPDATE OF {watched} ON {table} "
+        f"BEGIN {remove('OLD')} {add('NEW')} END",
+    ]
+
+
+def _search_triggers(table: str, columns: Sequence[str]) -> List[str]:
+    """Triggers that keep the external-content FTS5 table {table}_fts in step with table
+    
+    External-content tables remove a row by replaying its old values through
+    the special 'delete' command, so updates delete the old row and add the new.
+    """
+    fts = f"{table}_fts"
+    names = ", ".join(columns)
+    
+    def add(r):
+        values = ", ".join(f"{r}.{col}" for col in columns)
+        return f"INSERT INTO {fts} (rowid, {names}) VALUES ({r}.id, {values});"
+    
+    def remove(r):
+        values = ", ".join(f"{r}.{col}" for col in columns)
+        return f"INSERT INTO {fts} ({fts}, rowid, {names}) VALUES ('delete', {r}.id, {values});"
+    
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS search_{table}_insert AFTER INSERT ON {table} "
+        f"BEGIN {add('NEW')} END",
+        f"CREATE TRIGGER IF NOT EXISTS search_{table}_delete AFTER DELETE ON {table} "
+        f"BEGIN {remove('OLD')} END",
+        f"CREATE TRIGGER IF NOT EXISTS search_{table}_update AFTER UPDATE OF {names} ON {table} "
+        f"BEGIN {remove('OLD')} {add('NEW')} END",
+    ]
+
+
+_SEARCH_TERM = re.compile(r"\w+")
+
+
+def fts_query(text: str) -> Optional[str]:
+    """Turn free text into an FTS5 query matching every word, or None if it has no words
+    
+    Each word is quoted, so FTS5 operators and punctuation typed by the user
+    are taken literally instead of raising syntax errors. The last word may
+    still be being typed, so it matches as a prefix unless the text ends
+    after it or it is a single character (which would match nearly everything).
+    """
+    text = text or ""
+    words = _SEARCH_TERM.findall(text)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    if len(words[-1]) > 1 and _SEARCH_TERM.match(text[-1]):
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+def _detach(value):
+    """Copy the dict/list structure of a cached result so callers can't mutate the cache"""
+    if isinstance(value, list):
+        return [_detach(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _detach(v) for k, v in value.items()}
+    return value
+
+
+def _with_progress(goal: Dict) -> Dict:
+    """Set a goal's progress percentage, capped at 100"""
+    if goal['target_value'] > 0:
+        goal['progress'] = min(100, (goal['current_value'] / goal['target_value']) * 100)
+    else:
+        goal['progress'] = 0
+    return goal
+
+
+class Database:
+    """SQLite database handler for all productivity data"""
+    
+    # Gaps-and-islands form of the streak rule: walking a habit's completed
+    # logs newest first, a row stays in the same island while it is 1 or 2
+    # days older than the previous one. Island 0 is the most recent chain.
+    _STREAK_ISLANDS = '''
+        gaps AS (
+            SELECT habit_id, logged_date,
+                   julianday(LAG(logged_date, 1, date(logged_date, '+1 day')) OVER (
+                       PARTITION BY habit_id ORDER BY logged_date DESC
+                   )) - julianday(logged_date) AS gap
+            FROM {logs}
+            WHERE completed = 1 {where}
+        ),
+        islands AS (
+            SELECT habit_id, logged_date,
+                   SUM(CASE WHEN gap IN (1, 2) THEN 0 ELSE 1 END) OVER (
+                       PARTITION BY habit_id ORDER BY logged_date DESC
+                       ROWS UNBOUNDED PRECEDING
+                   ) AS island
+            FROM gaps
+        ),
+        sizes AS (
+            SELECT habit_id, island, COUNT(*) AS size, MAX(logged_date) AS last_date
+            FROM islands
+            GROUP BY habit_id, island
+        )
+    '''
+    
+    def __init__(self, db_name: str = "productivity.db", max_readers: int = 4,
+                 busy_timeout_ms: int = 5000, cache_size: int = 256,
+                 connection_factory: type = sqlite3.Connection):
+        """Initialize the connection pool and read cache, then create tables
+        
+        connection_factory is passed to sqlite3.connect, e.g. to trace queries.
+        """
+        self.db_name = db_name
+        self._pool = ConnectionPool(db_name, max_readers=max_readers,
+                                    busy_timeout_ms=busy_timeout_ms,
+                                    factory=connection_factory)
+        self._cache = ReadCache(maxsize=cache_size)
+        self._versions: Dict[str, int] = {}
+        self._opened_version = next(_version_clock)
+        self._versions_lock = threading.Lock()
+        self._external_version = None
+        self._local = threading.local()
+        self._archive_ready = False
+        self.create_tables()
+    
+    def close(self):
+        """Close all pooled connections"""
+        self._pool.close()
+    
+    def data_version(self, *tables: str) -> Tuple[int, ...]:
+        """Per-table data versions; any committed write to a table gives it a new one
+        
+        Versions are unique within the process, including across instances, so
+        they can key caches that outlive this Database. A commit made by another
+        connection to the file (another process or Database) renews them all.
+        """
+        self._check_external_writes()
+        return tuple(self._versions.get(table, self._opened_version) for table in tables)
+    
+    def _check_external_writes(self):
+        """Drop every cached read once someone else has committed to the database file"""
+        seen = self._pool.external_version()
+        if seen is None or seen == self._external_version:
+            return
+        with self._versions_lock:
+            if self._external_version is not None:
+                # Which tables changed is unknown, so every table gets a new version
+                self._versions.clear()
+                self._opened_version = next(_version_clock)
+                self._cache.clear()
+            self._external_version = seen
+    
+    def _read_through(self, key: Tuple, tables: Sequence[str], fetch):
+        """Return fetch() through the read cache, keyed on key and the versions of tables"""
+        # Reads inside a write transaction may see uncommitted rows; never cache those
+        if self._pool.in_write_transaction:
+            return fetch()
+        
+        # Today's date is part of the key because streaks and windows depend on it
+        key = key + (self.data_version(*tables), date.today())
+        value = self._cache.get(key)
+        if value is MISSING:
+            value = fetch()
+            self._cache.put(key, value, tables)
+        return _detach(value)
+    
+    @contextmanager
+    def _write(self, *tables: str):
+        """Pool write transaction that bumps versions of tables once the outermost one commits"""
+        outermost = not self._pool.in_write_transaction
+        if outermost:
+            self._local.touched = set()
+        try:
+            with self._pool.writer() as conn:
+                # An archive shares its table's data version: readers see both through *_all
+                self._local.touched.update(self._ARCHIVE_OF.get(table, table) for table in tables)
+                yield conn
+            if outermost and self._local.touched:
+                with self._versions_lock:
+                    for table in self._local.touched:
+                        self._versions[table] = next(_version_clock)
+                self._cache.invalidate(self._local.touched)
+        finally:
+            if outermost:
+                self._local.touched = set()
+    
+    @contextmanager
+    def transaction(self):
+        """Group any number of calls into a single commit (rolled back on error)"""
+        with self._write():
+            yield self
+    
+    def create_tables(self):
+        """Create all necessary tables and bring the schema up to date"""
+        self.migrate()
+    
+    # ============ SCHEMA MIGRATIONS ============
+    
+    def migrate(self):
+        """Apply pending migrations, tracking the schema version in PRAGMA user_version"""
+        with self._pool.reader() as conn:
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            self._archive_ready = self._has_archive(conn)
+        
+        for target in range(version + 1, len(self._MIGRATIONS) + 1):
+            with self._write() as conn:
+                cursor = conn.cursor()
+                # Another process may have upgraded the file since the read above; under
+                # BEGIN IMMEDIATE the version cannot move, so skip steps it already ran
+                if cursor.execute('PRAGMA user_version').fetchone()[0] >= target:
+                    self._archive_ready = self._has_archive(conn)
+                    continue
+                self._MIGRATIONS[target - 1](self, cursor)
+                cursor.execute(f'PRAGMA user_version = {target:d}')
+    
+    @staticmethod
+    def _has_archive(conn) -> bool:
+        return conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'view' AND name = 'habit_logs_all'"
+        ).fetchone() is not None
+    
+    def _migrate_base_tables(self, cursor):
+        """v1: original schema (a no-op for databases that predate user_version)"""
+        # Tasks table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT NOT NULL,
+                description TEXT,
+                priority TEXT DEFAULT 'medium',
+                status TEXT DEFAULT 'pending',
+                due_date TEXT,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                completed_at TEXT
+            )
+        ''')
+        
+        # Habits table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS habits (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                description TEXT,
+                frequency TEXT DEFAULT 'daily',
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Habit logs table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS habit_logs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                habit_id INTEGER,
+                logged_date TEXT,
+                completed INTEGER DEFAULT 0,
+                FOREIGN KEY (habit_id) REFERENCES habits (id)
+            )
+        ''')
+        
+        # Mood entries table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS mood_entries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                mood_score INTEGER,
+                mood_emoji TEXT,
+                notes TEXT,
+                sentiment_score REAL,
+                logged_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Goals table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS goals (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT NOT NULL,
+                description TEXT,
+                target_value REAL,
+                current_value REAL DEFAULT 0,
+                unit TEXT,
+                deadline TEXT,
+                status TEXT DEFAULT 'active',
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Pomodoro sessions table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS pomodoro_sessions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                task_id INTEGER,
+                duration_minutes INTEGER DEFAULT 25,
+                completed INTEGER DEFAULT 0,
+                started_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (task_id) REFERENCES tasks (id)
+            )
+        ''')
+    
+    def _migrate_habit_streaks(self, cursor):
+        """v2: incrementally maintained habit streaks"""
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS habit_streaks (
+                habit_id INTEGER PRIMARY KEY,
+                current_streak INTEGER DEFAULT 0,
+                longest_streak INTEGER DEFAULT 0,
+                last_logged_date TEXT,
+                FOREIGN KEY (habit_id) REFERENCES habits (id)
+            )
+        ''')
+        self.rebuild_habit_streaks()
+    
+    def _migrate_indexes(self, cursor):
+        """v3: secondary indexes and one log per habit per day"""
+        # Keep a single row per (habit_id, logged_date), preferring a completed one
+        cursor.execute('''
+            DELETE FROM habit_logs WHERE id NOT IN (
+                SELECT id FROM (
+                    SELECT id, ROW_NUMBER() OVER (
+                        PARTITION BY habit_id, logged_date ORDER BY completed DESC, id
+                    ) AS rn
+                    FROM habit_logs
+                ) WHERE rn = 1
+            )
+        ''')
+        cursor.execute('''
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_habit_logs_habit_date
+            ON habit_logs (habit_id, logged_date)
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_habit_logs_date ON habit_logs (logged_date)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_tasks_status_created ON tasks (status, created_at)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_tasks_created ON tasks (created_at)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_tasks_completed ON tasks (completed_at)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_mood_logged_at ON mood_entries (logged_at)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_goals_status_created ON goals (status, created_at)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_pomodoro_task ON pomodoro_sessions (task_id)')
+        self.rebuild_habit_streaks()
+    
+    # Each trigger adjusts the single stats_counters row by the row's contribution
+    _STATS_TRIGGERS = (
+        f'''
+        CREATE TRIGGER IF NOT EXISTS stats_tasks_insert AFTER INSERT ON tasks {_UNLESS_MOVING} BEGIN
+            UPDATE stats_counters SET total_tasks = total_tasks + 1,
+                completed_tasks = completed_tasks + (NEW.status IS 'completed')
+            WHERE id = 1;
+        END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS stats_tasks_delete AFTER DELETE ON tasks {_UNLESS_MOVING} BEGIN
+            UPDATE stats_counters SET total_tasks = total_tasks - 1,
+                completed_tasks = completed_tasks - (OLD.status IS 'completed')
+            WHERE id = 1;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS stats_tasks_update AFTER UPDATE OF status ON tasks BEGIN
+            UPDATE stats_counters SET completed_tasks = completed_tasks
+                + (NEW.status IS 'completed') - (OLD.status IS 'completed')
+            WHERE id = 1;
+        END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS stats_habit_logs_insert AFTER INSERT ON habit_logs {_UNLESS_MOVING} BEGIN
+            UPDATE stats_counters SET habit_completions = habit_completions + (NEW.completed IS 1)
+            WHERE id = 1;
+        END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS stats_habit_logs_delete AFTER DELETE ON habit_logs {_UNLESS_MOVING} BEGIN
+            UPDATE stats_counters SET habit_completions = habit_completions - (OLD.completed IS 1)
+            WHERE id = 1;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS stats_habit_logs_update AFTER UPDATE OF completed ON habit_logs BEGIN
+            UPDATE stats_counters SET habit_completions = habit_completions
+                + (NEW.completed IS 1) - (OLD.completed IS 1)
+            WHERE id = 1;
+        END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS stats_mood_insert AFTER INSERT ON mood_entries {_UNLESS_MOVING} BEGIN
+            UPDATE stats_counters SET mood_sum = mood_sum + IFNULL(NEW.mood_score, 0),
+                mood_count = mood_count + (NEW.mood_score IS NOT NULL)
+            WHERE id = 1;
+        END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS stats_mood_delete AFTER DELETE ON mood_entries {_UNLESS_MOVING} BEGIN
+            UPDATE stats_counters SET mood_sum = mood_sum - IFNULL(OLD.mood_score, 0),
+                mood_count = mood_count - (OLD.mood_score IS NOT NULL)
+            WHERE id = 1;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS stats_mood_update AFTER UPDATE OF mood_score ON mood_entries BEGIN
+            UPDATE stats_counters
+            SET mood_sum = mood_sum + IFNULL(NEW.mood_score, 0) - IFNULL(OLD.mood_score, 0),
+                mood_count = mood_count + (NEW.mood_score IS NOT NULL) - (OLD.mood_score IS NOT NULL)
+            WHERE id = 1;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS stats_goals_insert AFTER INSERT ON goals BEGIN
+            UPDATE stats_counters SET active_goals = active_goals + (NEW.status IS 'active')
+            WHERE id = 1;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS stats_goals_delete AFTER DELETE ON goals BEGIN
+            UPDATE stats_counters SET active_goals = active_goals - (OLD.status IS 'active')
+            WHERE id = 1;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS stats_goals_update AFTER UPDATE OF status ON goals BEGIN
+            UPDATE stats_counters SET active_goals = active_goals
+                + (NEW.status IS 'active') - (OLD.status IS 'active')
+            WHERE id = 1;
+        END
+        ''',
+    )
+    
+    def _migrate_stats_counters(self, cursor):
+        """v4: trigger-maintained counters behind get_productivity_stats"""
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS stats_counters (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                completed_tasks INTEGER NOT NULL DEFAULT 0,
+                total_tasks INTEGER NOT NULL DEFAULT 0,
+                habit_completions INTEGER NOT NULL DEFAULT 0,
+                mood_sum REAL NOT NULL DEFAULT 0,
+                mood_count INTEGER NOT NULL DEFAULT 0,
+                active_goals INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        for trigger in self._STATS_TRIGGERS:
+            cursor.execute(trigger)
+        self.rebuild_stats_counters()
+    
+    # Source table -> (day expression, [(rollup column, per-row contribution)], watched columns)
+    _ACTIVITY_SOURCES = {
+        'tasks': ("DATE({r}.completed_at)",
+                  [('tasks_completed', "({r}.status IS 'completed')")],
+                  "status, completed_at"),
+        'habit_logs': ("DATE({r}.logged_date)",
+                       [('habits_logged', "1")],
+                       "logged_date"),
+        'mood_entries': ("DATE({r}.logged_at)",
+                         [('mood_sum', "IFNULL({r}.mood_score, 0)"),
+                          ('mood_count', "({r}.mood_score IS NOT NULL)")],
+                         "mood_score, logged_at"),
+        # started_at is UTC (CURRENT_TIMESTAMP); focus days are local, like date.today()
+        'pomodoro_sessions': ("DATE({r}.started_at, 'localtime')",
+                              [('pomodoro_minutes',
+                                "(CASE WHEN {r}.completed IS 1 THEN IFNULL({r}.duration_minutes, 0) ELSE 0 END)")],
+                              "completed, duration_minutes, started_at"),
+    }
+    
+    def _migrate_daily_activity(self, cursor):
+        """v5: per-day activity rollup maintained by triggers"""
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS daily_activity (
+                day TEXT PRIMARY KEY,
+                tasks_completed INTEGER NOT NULL DEFAULT 0,
+                habits_logged INTEGER NOT NULL DEFAULT 0,
+                mood_sum REAL NOT NULL DEFAULT 0,
+                mood_count INTEGER NOT NULL DEFAULT 0,
+                pomodoro_minutes INTEGER NOT NULL DEFAULT 0
+            ) WITHOUT ROWID
+        ''')
+        self._create_rollup_triggers(cursor)
+        self.rebuild_daily_activity()
+    
+    def _create_rollup_triggers(self, cursor):
+        for table, (day, metrics, watched) in self._ACTIVITY_SOURCES.items():
+            guard = _UNLESS_MOVING if table in self.ARCHIVED_TABLES else ""
+            for trigger in _rollup_triggers(table, day, metrics, watched, guard):
+                cursor.execute(trigger)
+    
+    def _migrate_sentiment_cache(self, cursor):
+        """v6: sentiment scores keyed by a hash of the note text"""
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS sentiment_cache (
+                text_hash TEXT PRIMARY KEY,
+                score REAL NOT NULL
+            ) WITHOUT ROWID
+        ''')
+    
+    # Sessions from before v7 were never tracked live, so they are closed where they
+    # would have ended (a stopped one at its start, so it adds no focus time)
+    _CLOSE_UNTRACKED_POMODOROS = '''
+        UPDATE pomodoro_sessions
+        SET ended_at = CASE WHEN completed = 1
+                            THEN datetime(started_at, '+' || IFNULL(duration_minutes, 0) || ' minutes')
+                            ELSE started_at END
+        WHERE ended_at IS NULL {where}
+    '''
+    
+    def _migrate_pomodoro_end(self, cursor):
+        """v7: pomodoro sessions record when they ended; a running session has no ended_at"""
+        cursor.execute('ALTER TABLE pomodoro_sessions ADD COLUMN ended_at TEXT')
+        cursor.execute(self._CLOSE_UNTRACKED_POMODOROS.format(where=""))
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_pomodoro_running
+            ON pomodoro_sessions (started_at) WHERE ended_at IS NULL
+        ''')
+    
+    # Tables with a full-text index, in the order search() lists its kinds
+    SEARCH_TABLES = ('tasks', 'goals', 'mood_entries')
+    
+    # Source table -> indexed text columns, title first, with their bm25 weights
+    _SEARCH_SOURCES = {
+        'tasks': (('title', 10.0), ('description', 1.0)),
+        'goals': (('title', 10.0), ('description', 1.0)),
+        'mood_entries': (('notes', 1.0),),
+    }
+    
+    def _migrate_search_index(self, cursor):
+        """v8: FTS5 full-text indexes over task, goal and mood text kept in sync by triggers"""
+        for table, columns in self._SEARCH_SOURCES.items():
+            names = [col for col, _ in columns]
+            # Indexing prefixes up to 6 characters keeps search-as-you-type close to
+            # exact-term speed for about half again the index size
+            cursor.execute(f'''
+                CREATE VIRTUAL TABLE IF NOT EXISTS {table}_fts USING fts5(
+                    {", ".join(names)},
+                    content='{table}', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2', prefix='2 3 4 5 6'
+                )
+            ''')
+            # Make ORDER BY rank use the column weights
+            weights = ", ".join(str(weight) for _, weight in columns)
+            cursor.execute(f"INSERT INTO {table}_fts ({table}_fts, rank) VALUES ('rank', 'bm25({weights})')")
+            for trigger in _search_triggers(table, names):
+                cursor.execute(trigger)
+        self.rebuild_search_index()
+    
+    # Tables whose old rows can move to {table}_archive, and the columns that move
+    ARCHIVED_TABLES = ('tasks', 'habit_logs', 'mood_entries')
+    _ARCHIVE_COLUMNS = {
+        'tasks': ('id', 'title', 'description', 'priority', 'status', 'due_date',
+                  'created_at', 'completed_at'),
+        'habit_logs': ('id', 'habit_id', 'logged_date', 'completed'),
+        'mood_entries': ('id', 'mood_score', 'mood_emoji', 'notes', 'sentiment_score', 'logged_at'),
+    }
+    _ARCHIVE_OF = {f'{table}_archive': table for table in ARCHIVED_TABLES}
+    
+    # Insert/delete triggers that gained the _UNLESS_MOVING guard in v9
+    _GUARDED_TRIGGERS = (
+        'stats_tasks_insert', 'stats_tasks_delete',
+        'stats_habit_logs_insert', 'stats_habit_logs_delete',
+        'stats_mood_insert', 'stats_mood_delete',
+        'activity_tasks_insert', 'activity_tasks_delete',
+        'activity_habit_logs_insert', 'activity_habit_logs_delete',
+        'activity_mood_entries_insert', 'activity_mood_entries_delete',
+    )
+    
+    def _migrate_archive(self, cursor):
+        """v9: archive tables for old rows, *_all views over both, and guarded triggers"""
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS tasks_archive (
+                id INTEGER PRIMARY KEY,
+                title TEXT NOT NULL,
+                description TEXT,
+                priority TEXT,
+                status TEXT,
+                due_date TEXT,
+                created_at TEXT,
+                completed_at TEXT,
+                archived_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS habit_logs_archive (
+                id INTEGER PRIMARY KEY,
+                habit_id INTEGER,
+                logged_date TEXT,
+                completed INTEGER,
+                archived_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS mood_entries_archive (
+                id INTEGER PRIMARY KEY,
+                mood_score INTEGER,
+                mood_emoji TEXT,
+                notes TEXT,
+                sentiment_score REAL,
+                logged_at TEXT,
+                archived_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_tasks_archive_created ON tasks_archive (created_at)')
+        cursor.execute('''
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_habit_logs_archive_habit_date
+            ON habit_logs_archive (habit_id, logged_date)
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_habit_logs_archive_date ON habit_logs_archive (logged_date)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_mood_archive_logged_at ON mood_entries_archive (logged_at)')
+        
+        for table, columns in self._ARCHIVE_COLUMNS.items():
+            names = ", ".join(columns)
+            cursor.execute(f'''
+                CREATE VIEW IF NOT EXISTS {table}_all AS
+                SELECT {names}, NULL AS archived_at FROM {table}
+                UNION ALL
+                SELECT {names}, archived_at FROM {table}_archive
+            ''')
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS archive_state (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                moving INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        cursor.execute('INSERT OR IGNORE INTO archive_state (id, moving) VALUES (1, 0)')
+        for trigger in self._GUARDED_TRIGGERS:
+            cursor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        for trigger in self._STATS_TRIGGERS:
+            cursor.execute(trigger)
+        self._create_rollup_triggers(cursor)
+        self._archive_ready = True
+    
+    def _migrate_local_focus_days(self, cursor):
+        """v10: bucket focus minutes by local day instead of UTC day"""
+        for event in ('insert', 'delete', 'update'):
+            cursor.execute(f'DROP TRIGGER IF EXISTS activity_pomodoro_sessions_{event}')
+        self._create_rollup_triggers(cursor)
+        self.rebuild_daily_activity()
+    
+    # Applied in order; a database at user_version N has run the first N
+    _MIGRATIONS = (
+        _migrate_base_tables,
+        _migrate_habit_streaks,
+        _migrate_indexes,
+        _migrate_stats_counters,
+        _migrate_daily_activity,
+        _migrate_sentiment_cache,
+        _migrate_pomodoro_end,
+        _migrate_search_index,
+        _migrate_archive,
+        _migrate_local_focus_days,
+    )
+    
+    # ============ TASK METHODS ============
+    
+    def add_task(self, title: str, description: str = "", 
+                 priority: str = "medium", due_date: str = None) -> int:
+        """Add a new task and return its ID"""
+        with self._write('tasks') as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO tasks (title, description, priority, due_date)
+                VALUES (?, ?, ?, ?)
+            ''', (title, description, priority, due_date))
+            return cursor.lastrowid
+    
+    def add_tasks_bulk(self, tasks: Iterable[Dict]) -> int:
+        """Insert many tasks (add_task fields plus status, created_at, completed_at)"""
+        rows = (
+            (t['title'], t.get('description', ""), t.get('priority', "medium"),
+             t.get('status', "pending"), t.get('due_date'), t.get('created_at'),
+             t.get('completed_at'))
+            for t in tasks
+        )
+        with self._write('tasks') as conn:
+            cursor = conn.cursor()
+            cursor.executemany('''
+                INSERT INTO tasks (title, description, priority, status, due_date,
+                                   created_at, completed_at)
+                VALUES (?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP), ?)
+            ''', rows)
+            return cursor.rowcount
+    
+    @cached_read('tasks')
+    def get_all_tasks(self, status: str = None, limit: int = None,
+                      after: Tuple[str, int] = None, archived: bool = False) -> List[Dict]:
+        """Get tasks newest first, optionally filtered by status
+        
+        Pass limit for one page and after=(created_at, id) of the previous
+        page's last task to continue from it (keyset pagination). archived
+        includes archived tasks, which have an archived_at.
+        """
+        clauses, params = [], []
+        if status:
+            clauses.append('status = ?')
+            params.append(status)
+        if after:
+            clauses.append('(created_at, id) < (?, ?)')
+            params.extend(after)
+        
+        where = ' WHERE ' + ' AND '.join(clauses) if clauses else ''
+        order = ' ORDER BY created_at DESC, id DESC'
+        page = ''
+        if limit is not None:
+            page = ' LIMIT ?'
+            params.append(limit)
+        
+        if archived:
+            # SQLite can't use either table's index through the tasks_all view and would sort
+            # every task ever made, so each table yields its own page and the two are merged
+            names = ", ".join(self._ARCHIVE_COLUMNS['tasks'])
+            sql = f'''
+                SELECT * FROM (SELECT {names}, NULL AS archived_at FROM tasks{where}{order}{page})
+                UNION ALL
+                SELECT * FROM (SELECT {names}, archived_at FROM tasks_archive{where}{order}{page})
+            ''' + order + page
+            params = params * 2 + ([limit] if limit is not None else [])
+        else:
+            sql = f'SELECT * FROM tasks{where}{order}{page}'
+        
+        with self._pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            return [dict(row) for row in cursor.fetchall()]
+    
+    @cached_read('tasks')
+    def count_tasks(self, status: str = None, archived: bool = False) -> int:
+        """Count tasks, optionally filtered by status and including archived ones"""
+        source = "tasks_all" if archived else "tasks"
+        with self._pool.reader() as conn:
+            cursor = conn.cursor()
+            if status:
+                cursor.execute(f'SELECT COUNT(*) FROM {source} WHERE status = ?', (status,))
+            else:
+                cursor.execute(f'SELECT COUNT(*) FROM {source}')
+            return cursor.fetchone()[0]
+    
+    @cached_read('tasks')
+    def get_task(self, task_id: int) -> Optional[Dict]:
+        """Get one live task by ID, or None if it was deleted or archived"""
+        with self._pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT * FROM tasks WHERE id = ?', (task_id,))
+            row = cursor.fetchone()
+            return dict(row) if row else None
+    
+    def update_task_status(self, task_id: int, status: str):
+        """Update task status (pending, in_progress, completed)"""
+        with self._write('tasks') as conn:
+            cursor = conn.cursor()
+            completed_at = datetime.now().isoformat() if status == 'completed' else None
+            cursor.execute('''
+                UPDATE tasks SET status = ?, completed_at = ? WHERE id = ?
+            ''', (status, completed_at, task_id))
+    
+    def delete_task(self, task_id: int):
+        """Delete a task by ID"""
+        with self._write('tasks') as conn:
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM tasks WHERE id = ?', (task_id,))
+    
+    # ============ HABIT METHODS ============
+    
+    def add_habit(self, name: str, description: str = "", 
+                  frequency: str = "daily") -> int:
+        """Add a new habit to track"""
+        with self._write('habits') as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO habits (name, description, frequency)
+                VALUES (?, ?, ?)
+            ''', (name, description, frequency))
+            return cursor.lastrowid
+    
+    @cached_read('habits', 'habit_logs', 'habit_streaks')
+    def get_all_habits(self) -> List[Dict]:
+        """Get all habits with their current streak and today's status in one query"""
+        today = date.today().isoformat()
+        with self._pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT h.*,
+                       CASE WHEN julianday(:today) - julianday(s.last_logged_date) IN (0, 1)
+                            THEN s.current_streak ELSE 0 END AS streak,
+                       COALESCE(s.longest_streak, 0) AS longest_streak,
+                       EXISTS (
+                           SELECT 1 FROM habit_logs l
+                           WHERE l.habit_id = h.id AND l.logged_date = :today AND l.completed = 1
+                       ) AS completed_today
+                FROM habits h
+                LEFT JOIN habit_streaks s ON s.habit_id = h.id
+                ORDER BY h.created_at DESC
+            ''', {'today': today})
+            
+            habits = [dict(row) for row in cursor.fetchall()]
+            for habit in habits:
+                habit['completed_today'] = bool(habit['completed_today'])
+            
+            return habits
+    
+    # Days already in the archive are settled history, so logging them again changes nothing
+    _LOG_HABIT = '''
+        INSERT INTO habit_logs (habit_id, logged_date, completed)
+        SELECT :habit_id, :day, 1
+        WHERE NOT EXISTS (
+            SELECT 1 FROM habit_logs_archive WHERE habit_id = :habit_id AND logged_date = :day
+        )
+        ON CONFLICT (habit_id, logged_date) DO UPDATE SET completed = 1
+        WHERE completed = 0
+    '''
+    
+    def log_habit(self, habit_id: int, logged_date: str = None):
+        """Log a habit completion for a specific date and update its streak"""
+        if logged_date is None:
+            logged_date = date.today().isoformat()
+        
+        with self._write('habit_logs', 'habit_streaks') as conn:
+            cursor = conn.cursor()
+            # Idempotent: a second log for the same day changes nothing
+            cursor.execute(self._LOG_HABIT, {'habit_id': habit_id, 'day': logged_date})
+            
+            if cursor.rowcount:
+                self._advance_streak(habit_id, logged_date)
+    
+    def log_habits_bulk(self, logs: Iterable[Tuple[int, str]]) -> int:
+        """Log many (habit_id, logged_date) completions and refresh the touched streaks"""
+        touched = set()
+        
+        def rows():
+            for habit_id, logged_date in logs:
+                touched.add(habit_id)
+                yield {'habit_id': habit_id, 'day': logged_date}
+        
+        with self._write('habit_logs', 'habit_streaks') as conn:
+            cursor = conn.cursor()
+            cursor.executemany(self._LOG_HABIT, rows())
+            
+            for habit_id in touched:
+                self.rebuild_habit_streaks(habit_id)
+            return cursor.rowcount
+    
+    def _advance_streak(self, habit_id: int, logged_date: str):
+        """Fold one new completion into habit_streaks within the caller's transaction"""
+        with self._write('habit_streaks') as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT current_streak, longest_streak, last_logged_date
+                FROM habit_streaks WHERE habit_id = ?
+            ''', (habit_id,))
+            row = cursor.fetchone()
+            
+            if row is None or row['last_logged_date'] is None:
+                current, longest = 1, 1
+            elif logged_date > row['last_logged_date']:
+                gap = (date.fromisoformat(logged_date) - date.fromisoformat(row['last_logged_date'])).days
+                current = row['current_streak'] + 1 if gap in (1, 2) else 1
+                longest = max(row['longest_streak'], current)
+            else:
+                # Backfilled an older date: the chain may have been bridged, recompute it
+                self.rebuild_habit_streaks(habit_id)
+                return
+            
+            cursor.execute('''
+                INSERT OR REPLACE INTO habit_streaks
+                    (habit_id, current_streak, longest_streak, last_logged_date)
+                VALUES (?, ?, ?, ?)
+            ''', (habit_id, current, longest, logged_date))
+    
+    def rebuild_habit_streaks(self, habit_id: int = None):
+        """Recompute habit_streaks from habit_logs for one habit or all of them"""
+        with self._write('habit_streaks') as conn:
+            cursor = conn.cursor()
+            if habit_id is None:
+                cursor.execute('DELETE FROM habit_streaks')
+                where, params = '', ()
+            else:
+                cursor.execute('DELETE FROM habit_streaks WHERE habit_id = ?', (habit_id,))
+                where, params = 'AND habit_id = ?', (habit_id,)
+            
+            cursor.execute(f'''
+                WITH {self._STREAK_ISLANDS.format(logs=self._with_archive('habit_logs'), where=where)}
+                INSERT INTO habit_streaks
+                    (habit_id, current_streak, longest_streak, last_logged_date)
+                SELECT habit_id,
+                       SUM(CASE WHEN island = 0 THEN size ELSE 0 END),
+                       MAX(size),
+                       MAX(last_date)
+                FROM sizes
+                GROUP BY habit_id
+            ''', params)
+    
+    def is_habit_completed_today(self, habit_id: int) -> bool:
+        """Check if habit is completed today"""
+        with self._pool.reader() as conn:
+            cursor = conn.cursor()
+            today = date.today().isoformat()
+            cursor.execute('''
+                SELECT id FROM habit_logs 
+                WHERE habit_id = ? AND logged_date = ? AND completed = 1
+            ''', (habit_id, today))
+            return cursor.fetchone() is not None
+    
+    def calculate_streak(self, habit_id: int) -> int:
+        """Get the current streak for a habit from habit_streaks"""
+        with self._pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT current_streak, last_logged_date FROM habit_streaks
+                WHERE habit_id = ?
+            ''', (habit_id,))
+            
+            row = cursor.fetchone()
+            if row is None or row['last_logged_date'] is None:
+                return 0
+            
+            # The stored chain ends at the last log; it only counts while that is today or yesterday
+            days_since = (date.today() - date.fromisoformat(row['last_logged_date'])).days
+            return row['current_streak'] if days_since in (0, 1) else 0
+    
+    def delete_habit(self, habit_id: int):
+        """Delete a habit, its logs and its streak"""
+        with self._write('habits', 'habit_logs', 'habit_logs_archive', 'habit_streaks') as conn:
+            cursor = conn.cursor()
+            # Bring archived logs back first so their delete updates the totals
+            self._move_rows(conn, 'habit_logs_archive', 'habit_logs', 'habit_logs',
+                            'habit_id = ?', (habit_id,))
+            cursor.execute('DELETE FROM habit_logs WHERE habit_id = ?', (habit_id,))
+            cursor.execute('DELETE FROM habit_streaks WHERE habit_id = ?', (habit_id,))
+            cursor.execute('DELETE FROM habits WHERE id = ?', (habit_id,))
+    
+    # ============ MOOD METHODS ============
+    
+    def add_mood_entry(self, mood_score: int, mood_emoji: str, 
+                       notes: str = "", sentiment_score: Optional[float] = 0.0) -> int:
+        """Add a mood entry with optional notes (a None sentiment_score means scoring is pending)"""
+        with self._write('mood_entries') as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO mood_entries (mood_score, mood_emoji, notes, sentiment_score)
+                VALUES (?, ?, ?, ?)
+            ''', (mood_score, mood_emoji, notes, sentiment_score))
+            return cursor.lastrowid
+    
+    def add_mood_entries_bulk(self, entries: Iterable[Dict]) -> int:
+        """Insert many mood entries (mood_score, mood_emoji, notes, sentiment_score, logged_at)"""
+        rows = (
+            (e['mood_score'], e.get('mood_emoji'), e.get('notes', ""),
+             e.get('sentiment_score', 0.0), e.get('logged_at'))
+            for e in entries
+        )
+        with self._write('mood_entries') as conn:
+            cursor = conn.cursor()
+            cursor.executemany('''
+                INSERT INTO mood_entries (mood_score, mood_emoji, notes, sentiment_score, logged_at)
+                VALUES (?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+            ''', rows)
+            return cursor.rowcount
+    
+    @cached_read('mood_entries')
+    def get_mood_entries(self, days: Optional[int] = 30, limit: int = None,
+                         archived: bool = False) -> List[Dict]:
+        """Get mood entries from the last N days (all time if None), newest first
+        
+        archived includes archived entries, which have an archived_at.
+        """
+        clauses, params = [], []
+        if days is not None:
+            # logged_at defaults to CURRENT_TIMESTAMP, so the cutoff is computed the same way
+            clauses.append("logged_at >= datetime('now', ?)")
+            params.append(f'-{int(days)} days')
+        
+        sql = f'SELECT * FROM {"mood_entries_all" if archived else "mood_entries"}'
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += ' ORDER BY logged_at DESC'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        
+        with self._pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            return [dict(row) for row in cursor.fetchall()]
+    
+    @cached_read('mood_entries')
+    def get_mood_series(self, days: Optional[int] = None, max_points: int = 200) -> List[Dict]:
+        """Downsample mood scores from the last N days (all time if None) to at most max_points
+        
+        The window is split into max_points equal time buckets; each non-empty
+        bucket becomes one point with its mean time and min/mean/max score.
+        """
+        with self._pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                WITH bounds AS (
+                    SELECT julianday(COALESCE(datetime('now', :since), MIN(first))) AS lo,
+                           julianday('now') AS hi
+                    FROM (SELECT MIN(logged_at) AS first FROM mood_entries
+                          UNION ALL
+                          SELECT MIN(logged_at) FROM mood_entries_archive)
+                ),
+                -- Each table is filtered on its own index; SQLite can't push the bound into a view
+                scores AS (
+                    SELECT logged_at, mood_score FROM mood_entries
+                    WHERE logged_at >= (SELECT datetime(lo) FROM bounds) AND mood_score IS NOT NULL
+                    UNION ALL
+                    SELECT logged_at, mood_score FROM mood_entries_archive
+                    WHERE logged_at >= (SELECT datetime(lo) FROM bounds) AND mood_score IS NOT NULL
+                )
+                SELECT datetime(AVG(julianday(m.logged_at))) AS logged_at,
+                       MIN(m.mood_score) AS min_score,
+                       AVG(m.mood_score) AS mean_score,
+                       MAX(m.mood_score) AS max_score,
+                       COUNT(*) AS entries
+                FROM scores m, bounds b
+                GROUP BY MIN(CAST((julianday(m.logged_at) - b.lo) * :points
+                                  / MAX(b.hi - b.lo, 1e-9) AS INTEGER), :points - 1)
+                ORDER BY 1
+            ''', {'since': None if days is None else f'-{int(days)} days',
+                  'points': max_points})
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def get_unscored_mood_entries(self, limit: int = 500, after_id: int = 0,
+                                  include_scored: bool = False) -> List[Dict]:
+        """Get the next batch of (id, notes) mood entries still awaiting a sentiment score"""
+        with self._pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT id, notes FROM mood_entries
+                WHERE id > ? {'' if include_scored else 'AND sentiment_score IS NULL'}
+                ORDER BY id
+                LIMIT ?
+            ''', (after_id, limit))
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def set_sentiment_scores(self, scores: Iterable[Tuple[int, float]]):
+        """Fill in sentiment scores for many (entry_id, score) pairs"""
+        with self._write('mood_entries') as conn:
+            conn.executemany(
+                'UPDATE mood_entries SET sentiment_score = ? WHERE id = ?',
+                ((score, entry_id) for entry_id, score in scores)
+            )
+    
+    def get_cached_sentiments(self, text_hashes: Sequence[str]) -> Dict[str, float]:
+        """Look up previously computed scores by note hash"""
+        if not text_hashes:
+            return {}
+        with self._pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT text_hash, score FROM sentiment_cache
+                WHERE text_hash IN ({", ".join("?" for _ in text_hashes)})
+            ''', list(text_hashes))
+            return {row['text_hash']: row['score'] for row in cursor.fetchall()}
+    
+    def cache_sentiments(self, scores: Iterable[Tuple[str, float]]):
+        """Remember (text_hash, score) pairs for future entries with the same note"""
+        with self._write('sentiment_cache') as conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO sentiment_cache (text_hash, score) VALUES (?, ?)',
+                scores
+            )
+    
+    # ============ GOAL METHODS ============
+    
+    def add_goal(self, title: str, target_value: float, unit: str,
+                 description: str = "", deadline: str = None) -> int:
+        """Add a new goal"""
+        with self._write('goals') as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO goals (title, description, target_value, unit, deadline)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (title, description, target_value, unit, deadline))
+            return cursor.lastrowid
+    
+    def add_goals_bulk(self, goals: Iterable[Dict]) -> int:
+        """Insert many goals (title, target_value, unit, description, deadline, current_value)"""
+        rows = (
+            (g['title'], g.get('description', ""), g['target_value'], g.get('current_value', 0),
+             g.get('unit'), g.get('deadline'))
+            for g in goals
+        )
+        with self._write('goals') as conn:
+            cursor = conn.cursor()
+            cursor.executemany('''
+                INSERT INTO goals (title, description, target_value, current_value, unit, deadline)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', rows)
+            return cursor.rowcount
+    
+    @cached_read('goals')
+    def get_all_goals(self, status: str = "active") -> List[Dict]:
+        """Get all goals with progress percentage"""
+        with self._pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT * FROM goals WHERE status = ?
+                ORDER BY created_at DESC
+            ''', (status,))
+            return [_with_progress(dict(row)) for row in cursor.fetchall()]
+    
+    @cached_read('goals')
+    def get_goal(self, goal_id: int) -> Optional[Dict]:
+        """Get one goal with progress percentage, or None if it was deleted"""
+        with self._pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT * FROM goals WHERE id = ?', (goal_id,))
+            row = cursor.fetchone()
+            return _with_progress(dict(row)) if row else None
+    
+    def update_goal_progress(self, goal_id: int, current_value: float):
+        """Update goal progress"""
+        with self._write('goals') as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                UPDATE goals SET current_value = ? WHERE id = ?
+            ''', (current_value, goal_id))
+    
+    def update_goal_progress_bulk(self, updates: Iterable[Tuple[int, float]]):
+        """Update progress for many (goal_id, current_value) pairs in one commit"""
+        with self._write('goals') as conn:
+            conn.executemany('''
+                UPDATE goals SET current_value = ? WHERE id = ?
+            ''', ((value, goal_id) for goal_id, value in updates))
+    
+    def delete_goal(self, goal_id: int):
+        """Delete a goal"""
+        with self._write('goals') as conn:
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM goals WHERE id = ?', (goal_id,))
+    
+    # ============ POMODORO METHODS ============
+    
+    # A session is running until it is completed (counts as focus time) or
+    # stopped early (an interrupted pomodoro does not count)
+    
+    def start_pomodoro(self, task_id: int = None, duration_minutes: int = 25) -> int:
+        """Start a session, optionally for a task, and return its ID"""
+        with self._write('pomodoro_sessions') as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT 1 FROM pomodoro_sessions WHERE ended_at IS NULL LIMIT 1')
+            if cursor.fetchone():
+                raise ValueError("A pomodoro session is already running")
+            cursor.execute('''
+                INSERT INTO pomodoro_sessions (task_id, duration_minutes, completed)
+                VALUES (?, ?, 0)
+            ''', (task_id, duration_minutes))
+            return cursor.lastrowid
+    
+    @cached_read('pomodoro_sessions', 'tasks')
+    def get_active_pomodoro(self) -> Optional[Dict]:
+        """Get the running session (with its task title and UTC end time), or None"""
+        with self._pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT p.*, t.title AS task_title,
+                       datetime(p.started_at, '+' || p.duration_minutes || ' minutes') AS ends_at
+                FROM pomodoro_sessions p
+                LEFT JOIN tasks t ON t.id = p.task_id
+                WHERE p.ended_at IS NULL
+                ORDER BY p.started_at DESC
+                LIMIT 1
+            ''')
+            row = cursor.fetchone()
+            return dict(row) if row else None
+    
+    def complete_pomodoro(self, session_id: int) -> bool:
+        """Finish a running session as completed; returns False if it wasn't running"""
+        with self._write('pomodoro_sessions') as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                UPDATE pomodoro_sessions SET completed = 1, ended_at = CURRENT_TIMESTAMP
+                WHERE id = ? AND ended_at IS NULL
+            ''', (session_id,))
+            return cursor.rowcount > 0
+    
+    def stop_pomodoro(self, session_id: int) -> bool:
+        """End a running session early without counting it; returns False if it wasn't running"""
+        with self._write('pomodoro_sessions') as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                UPDATE pomodoro_sessions SET ended_at = CURRENT_TIMESTAMP
+                WHERE id = ? AND ended_at IS NULL
+            ''', (session_id,))
+            return cursor.rowcount > 0
+    
+    @cached_read('pomodoro_sessions', 'tasks')
+    def get_focus_by_task(self, days: Optional[int] = 30, limit: int = 10) -> List[Dict]:
+        """Focus minutes and completed sessions per task over the last N days (all time if None)"""
+        clauses, params = ['p.completed = 1'], []
+        if days is not None:
+            clauses.append("p.started_at >= datetime('now', ?)")
+            params.append(f'-{int(days)} days')
+        params.append(limit)
+        
+        with self._pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT f.*,
+                       COALESCE((SELECT title FROM tasks WHERE id = f.task_id),
+                                (SELECT title FROM tasks_archive WHERE id = f.task_id)) AS task_title
+                FROM (
+                    SELECT p.task_id,
+                           COUNT(*) AS sessions,
+                           SUM(p.duration_minutes) AS focus_minutes
+                    FROM pomodoro_sessions p
+                    WHERE {' AND '.join(clauses)}
+                    GROUP BY p.task_id
+                    ORDER BY focus_minutes DESC
+                    LIMIT ?
+                ) f
+                ORDER BY f.focus_minutes DESC
+            ''', params)
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def get_focus_by_day(self, start: str, end: str) -> Dict[str, int]:
+        """Focus minutes per local day between two ISO dates (inclusive), from the activity rollup"""
+        return {row['period']: row['pomodoro_minutes'] or 0
+                for row in self.get_activity(start, end, "day")}
+    
+    # ============ ARCHIVE METHODS ============
+    
+    # Old rows move to {table}_archive so the hot tables and their indexes stay
+    # small. Totals, rollups and streaks still count archived rows; history-wide
+    # reads go through the {table}_all views. Search only covers hot rows.
+    
+    def _with_archive(self, table: str) -> str:
+        """What to read for all of a table's rows (the archive only exists from v9 on)"""
+        return f'{table}_all' if self._archive_ready else table
+    
+    def _move_rows(self, conn, source: str, target: str, table: str, where: str, params) -> int:
+        """Move rows matching where between a table and its archive without touching totals"""
+        names = ", ".join(self._ARCHIVE_COLUMNS[table])
+        conn.execute('UPDATE archive_state SET moving = 1')
+        conn.execute(f'INSERT INTO {target} ({names}) SELECT {names} FROM {source} WHERE {where}', params)
+        moved = conn.execute(f'DELETE FROM {source} WHERE {where}', params).rowcount
+        conn.execute('UPDATE archive_state SET moving = 0')
+        return moved
+    
+    def archive(self, task_age_days: Optional[int] = 90, log_retention_days: Optional[int] = 365,
+                mood_retention_days: Optional[int] = 365) -> Dict[str, int]:
+        """Move old rows into the archive tables and return how many moved per table
+        
+        Completed tasks go once they were completed more than task_age_days ago,
+        habit logs and mood entries once they are older than their retention.
+        None leaves that table alone.
+        """
+        today = date.today()
+        # Plain date cutoffs compare correctly against every timestamp format in use
+        rules = {
+            'tasks': (task_age_days, "status = 'completed' AND completed_at < ?"),
+            'habit_logs': (log_retention_days, "logged_date < ?"),
+            'mood_entries': (mood_retention_days, "logged_at < ?"),
+        }
+        moved = {}
+        with self._write(*rules, *(f'{table}_archive' for table in rules)) as conn:
+            for table, (days, where) in rules.items():
+                if days is None:
+                    continue
+                if days < 0:
+                    raise ValueError(f"Retention can't be negative: {days}")
+                cutoff = (today - timedelta(days=days)).isoformat()
+                moved[table] = self._move_rows(conn, table, f'{table}_archive', table, where, (cutoff,))
+        return moved
+    
+    def archive_counts(self) -> Dict[str, int]:
+        """Rows currently in each archive table"""
+        with self._pool.reader() as conn:
+            return {table: conn.execute(f'SELECT COUNT(*) FROM {table}_archive').fetchone()[0]
+                    for table in self.ARCHIVED_TABLES}
+    
+    # ============ IMPORT / EXPORT METHODS ============
+    
+    # User data tables in foreign-key order (parents before children), then the archives
+    DATA_TABLES = ('tasks', 'habits', 'habit_logs', 'mood_entries', 'goals', 'pomodoro_sessions',
+                   'tasks_archive', 'habit_logs_archive', 'mood_entries_archive')
+    
+    def table_columns(self, table: str) -> List[str]:
+        """Get the column names of a data table"""
+        if table not in self.DATA_TABLES:
+            raise ValueError(f"Unknown table: {table}")
+        with self._pool.reader() as conn:
+            return [row['name'] for row in conn.execute(f'PRAGMA table_info({table})')]
+    
+    def iter_rows(self, table: str, chunk_size: int = 1000) -> Iterator[List[Tuple]]:
+        """Stream a table in id order as chunks of row tuples from one consistent snapshot"""
+        columns = self.table_columns(table)
+        with self._pool.reader() as conn:
+            cursor = conn.execute(f'SELECT {", ".join(columns)} FROM {table} ORDER BY id')
+            while True:
+                chunk = cursor.fetchmany(chunk_size)
+                if not chunk:
+                    break
+                yield [tuple(row) for row in chunk]
+    
+    def insert_rows(self, table: str, columns: Sequence[str], rows: Iterable[Sequence],
+                    on_conflict: str = "abort") -> int:
+        """Insert raw rows into a data table in one transaction (on_conflict: abort, ignore, replace)
+        
+        Derived tables are not touched; call rebuild_habit_streaks() after loading habit_logs.
+        Loading an archive table moves its hot table's id counter past the archived ids.
+        Pomodoro sessions loaded without ended_at (a dump from before v7) are closed the
+        way the v7 migration closed them, so they don't all count as running.
+        """
+        unknown = set(columns) - set(self.table_columns(table))
+        if unknown:
+            raise ValueError(f"Unknown columns for {table}: {', '.join(sorted(unknown))}")
+        if on_conflict not in ('abort', 'ignore', 'replace'):
+            raise ValueError(f"Unknown conflict policy: {on_conflict}")
+        
+        untracked = table == 'pomodoro_sessions' and 'ended_at' not in columns
+        with self._write(table) as conn:
+            cursor = conn.cursor()
+            if untracked:
+                running = [row[0] for row in cursor.execute(
+                    'SELECT id FROM pomodoro_sessions WHERE ended_at IS NULL')]
+            cursor.executemany(f'''
+                INSERT OR {on_conflict.upper()} INTO {table} ({", ".join(columns)})
+                VALUES ({", ".join("?" for _ in columns)})
+            ''', rows)
+            inserted = cursor.rowcount
+            if table in self._ARCHIVE_OF:
+                self._reserve_archived_ids(cursor, self._ARCHIVE_OF[table])
+            if untracked:
+                cursor.execute(self._CLOSE_UNTRACKED_POMODOROS.format(
+                    where=f"AND id NOT IN ({', '.join('?' for _ in running)})"), running)
+            return inserted
+    
+    def _reserve_archived_ids(self, cursor, table: str):
+        """Move table's AUTOINCREMENT counter past its archive's ids so new rows never reuse one
+        
+        archive() keeps the counter, but rows loaded straight into an archive never
+        went through the hot table, so it knows nothing of their ids.
+        """
+        highest = cursor.execute(f'SELECT MAX(id) FROM {table}_archive').fetchone()[0]
+        if highest is None:
+            return
+        cursor.execute('UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?', (highest, table))
+        if not cursor.rowcount:
+            cursor.execute('INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)', (table, highest))
+    
+    # ============ SEARCH METHODS ============
+    
+    # Marks around matched terms in search results; callers escape the text, then swap these for markup
+    HIGHLIGHT_START, HIGHLIGHT_END = "\x02", "\x03"
+    
+    # FTS5 ranks every match with bm25 and keeps the best :limit, so old rows are found too
+    _SEARCH_QUERY = '''
+        SELECT '{table}' AS kind, s.id, {title} AS title,
+               snippet({table}_fts, {body}, :start, :end, '…', 16) AS snippet,
+               {status} AS status, s.{at} AS at, {table}_fts.rank AS rank
+        FROM {table}_fts JOIN {table} s ON s.id = {table}_fts.rowid
+        WHERE {table}_fts MATCH :query
+        ORDER BY {table}_fts.rank LIMIT :limit
+    '''
+    
+    # Source table -> how its rows fill the result columns (body is the snippet's FTS column)
+    _SEARCH_RESULTS = {
+        'tasks': dict(title="highlight(tasks_fts, 0, :start, :end)", body=1,
+                      status="s.status", at="created_at"),
+        'goals': dict(title="highlight(goals_fts, 0, :start, :end)", body=1,
+                      status="s.status", at="created_at"),
+        'mood_entries': dict(title="s.mood_emoji", body=0, status="NULL", at="logged_at"),
+    }
+    
+    @cached_read('tasks', 'goals', 'mood_entries')
+    def search(self, text: str, kinds: Sequence[str] = SEARCH_TABLES, limit: int = 20) -> List[Dict]:
+        """Best matches for free text across tasks, goals and mood notes, best first
+        
+        Every word must match, the last one as a prefix. title and snippet carry the
+        matched terms between HIGHLIGHT_START and HIGHLIGHT_END.
+        """
+        unknown = set(kinds) - set(self._SEARCH_RESULTS)
+        if unknown:
+            raise ValueError(f"Unknown search kinds: {', '.join(sorted(unknown))}")
+        query = fts_query(text)
+        if query is None or not kinds:
+            return []
+        
+        # Each source is cut to its own top results before the merge
+        sources = " UNION ALL ".join(
+            f"SELECT * FROM ({self._SEARCH_QUERY.format(table=kind, **columns)})"
+            for kind, columns in self._SEARCH_RESULTS.items() if kind in kinds
+        )
+        with self._pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'SELECT * FROM ({sources}) ORDER BY rank LIMIT :limit', {
+                'query': query, 'limit': limit,
+                'start': self.HIGHLIGHT_START, 'end': self.HIGHLIGHT_END,
+            })
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def rebuild_search_index(self, *tables: str):
+        """Rebuild the full-text indexes of tables (all of them if none) from their source rows"""
+        tables = tables or self.SEARCH_TABLES
+        unknown = set(tables) - set(self.SEARCH_TABLES)
+        if unknown:
+            raise ValueError(f"No search index for: {', '.join(sorted(unknown))}")
+        with self._write(*tables) as conn:
+            for table in tables:
+                conn.execute(f"INSERT INTO {table}_fts ({table}_fts) VALUES ('rebuild')")
+    
+    # ============ ANALYTICS METHODS ============
+    
+    def query_columns(self, sql: str, params=(),
+                      tables: Sequence[str] = ()) -> Dict[str, List]:
+        """Run a read-only query and return its result as {column: [values]}
+        
+        The result is cached until one of tables is written, so tables must
+        name every table the query reads.
+        """
+        def fetch():
+            with self._pool.reader() as conn:
+                cursor = conn.execute(sql, params)
+                names = [col[0] for col in cursor.description]
+                rows = cursor.fetchall()
+            return {name: [row[i] for row in rows] for i, name in enumerate(names)}
+        
+        key = tuple(sorted(params.items())) if isinstance(params, dict) else tuple(params)
+        return self._read_through(('query_columns', sql, key), tables, fetch)
+    
+    @cached_read('tasks', 'habit_logs', 'mood_entries', 'goals', 'stats_counters')
+    def get_productivity_stats(self) -> Dict:
+        """Get overall productivity statistics from the trigger-maintained counters"""
+        with self._pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT * FROM stats_counters WHERE id = 1')
+            counters = cursor.fetchone()
+        
+        completed_tasks = counters['completed_tasks']
+        total_tasks = counters['total_tasks']
+        avg_mood = counters['mood_sum'] / counters['mood_count'] if counters['mood_count'] else 0
+        
+        return {
+            'completed_tasks': completed_tasks,
+            'total_tasks': total_tasks,
+            'completion_rate': (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0,
+            'total_habit_completions': counters['habit_completions'],
+            'average_mood': round(avg_mood, 1),
+            'active_goals': counters['active_goals']
+        }
+    
+    def rebuild_stats_counters(self):
+        """Recompute stats_counters from the source tables, archived rows included"""
+        with self._write('stats_counters') as conn:
+            conn.execute('''
+                INSERT OR REPLACE INTO stats_counters
+                    (id, completed_tasks, total_tasks, habit_completions,
+                     mood_sum, mood_count, active_goals)
+                SELECT 1,
+                       (SELECT COUNT(*) FROM {tasks} WHERE status = 'completed'),
+                       (SELECT COUNT(*) FROM {tasks}),
+                       (SELECT COUNT(*) FROM {habit_logs} WHERE completed = 1),
+                       (SELECT IFNULL(SUM(mood_score), 0) FROM {mood_entries}),
+                       (SELECT COUNT(mood_score) FROM {mood_entries}),
+                       (SELECT COUNT(*) FROM goals WHERE status = 'active')
+            '''.format(**{table: self._with_archive(table) for table in self.ARCHIVED_TABLES}))
+    
+    @cached_read('tasks', 'habit_logs', 'daily_activity')
+    def get_weekly_activity(self) -> Dict:
+        """Get activity data for the past week from the daily_activity rollup"""
+        week_ago = (date.today() - timedelta(days=7)).isoformat()
+        with self._pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT day, tasks_completed, habits_logged
+                FROM daily_activity
+                WHERE day >= ?
+            ''', (week_ago,))
+            rows = cursor.fetchall()
+        
+        return {
+            'tasks_by_day': {row['day']: row['tasks_completed'] for row in rows if row['tasks_completed']},
+            'habits_by_day': {row['day']: row['habits_logged'] for row in rows if row['habits_logged']}
+        }
+    
+    # Bucket start for each granularity, computed from a daily_activity day
+    _ACTIVITY_BUCKETS = {
+        'day': "day",
+        'week': "date(day, 'weekday 0', '-6 days')",
+        'month': "strftime('%Y-%m-01', day)",
+    }
+    
+    @cached_read('tasks', 'habit_logs', 'mood_entries', 'pomodoro_sessions', 'daily_activity')
+    def get_activity(self, start: str, end: str, granularity: str = "day") -> List[Dict]:
+        """Get activity totals between two ISO dates (inclusive) in day, week or month buckets
+        
+        Buckets are labelled by their first day (Monday for weeks); buckets
+        without any activity are omitted.
+        """
+        if granularity not in self._ACTIVITY_BUCKETS:
+            raise ValueError(f"Unknown granularity: {granularity}")
+        
+        bucket = self._ACTIVITY_BUCKETS[granularity]
+        with self._pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT {bucket} AS period,
+                       SUM(tasks_completed) AS tasks_completed,
+                       SUM(habits_logged) AS habits_logged,
+                       SUM(mood_sum) / NULLIF(SUM(mood_count), 0) AS mood_avg,
+                       SUM(pomodoro_minutes) AS pomodoro_minutes
+                FROM daily_activity
+                WHERE day BETWEEN ? AND ?
+                GROUP BY period
+                HAVING SUM(tasks_completed) OR SUM(habits_logged)
+                    OR SUM(mood_count) OR SUM(pomodoro_minutes)
+                ORDER BY period
+            ''', (str(start), str(end)))
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def rebuild_daily_activity(self):
+        """Recompute the daily_activity rollup from the source tables, archived rows included"""
+        with self._write('daily_activity') as conn:
+            conn.execute('DELETE FROM daily_activity')
+            conn.execute('''
+                INSERT INTO daily_activity
+                    (day, tasks_completed, habits_logged, mood_sum, mood_count, pomodoro_minutes)
+                SELECT day, SUM(tasks), SUM(habits), SUM(mood_sum), SUM(mood_count), SUM(minutes)
+                FROM (
+                    SELECT DATE(completed_at) AS day, COUNT(*) AS tasks, 0 AS habits,
+                           0 AS mood_sum, 0 AS mood_count, 0 AS minutes
+                    FROM {tasks} WHERE status = 'completed' AND completed_at IS NOT NULL
+                    GROUP BY day
+                    UNION ALL
+                    SELECT DATE(logged_date), 0, COUNT(*), 0, 0, 0
+                    FROM {habit_logs} GROUP BY 1
+                    UNION ALL
+                    SELECT DATE(logged_at), 0, 0, IFNULL(SUM(mood_score), 0), COUNT(mood_score), 0
+                    FROM {mood_entries} GROUP BY 1
+                    UNION ALL
+                    SELECT DATE(started_at, 'localtime'), 0, 0, 0, 0, SUM(duration_minutes)
+                    FROM pomodoro_sessions WHERE completed = 1 GROUP BY 1
+                )
+                WHERE day IS NOT NULL
+                GROUP BY day
+            '''.format(**{table: self._with_archive(table) for table in self.ARCHIVED_TABLES}))
+
+
+# Test the database if run directly
+if __name__ == "__main__":
+    db = Database()
+    print("✅ Database created successfully!")
+    print("✅ All tables initialized!")
+    
+    # Test adding a task
+    task_id = db.add_task("Test Task", "This is a test", "high")
+    print(f"✅ Test task created with ID: {task_id}")
+    
+    # Clean up test
+    db.delete_task(task_id)
+    print("✅ Test task deleted")
     print("\n🎉 Database is working correctly!")
\ No newline at end of file
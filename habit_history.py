@@ -0,0 +1,241 @@
+"""
+Habit history engine for Productivity Dashboard
+Keeps each habit's completion days as a bitmap and answers streak questions with bit operations
+"""
+
+import re
+from datetime import date, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+from database import Database
+
+_PER_WEEK = re.compile(r"^\s*(\d+)\s*/\s*week\s*$")
+
+# Offered in the Habits page; any "N/week" with 1 <= N <= 7 is accepted
+FREQUENCIES = ("daily", "weekly", "2/week", "3/week", "4/week", "5/week")
+
+
+def parse_frequency(frequency: Optional[str]) -> Tuple[int, int]:
+    """(times, period_days) for 'daily', 'weekly' or 'N/week'; unknown values count as daily"""
+    frequency = (frequency or "daily").strip().lower()
+    if frequency == "weekly":
+        return 1, 7
+    match = _PER_WEEK.match(frequency)
+    if match and 1 <= int(match.group(1)) <= 7:
+        return int(match.group(1)), 7
+    return 1, 1
+
+
+def _popcount(bits: int) -> int:
+    return bin(bits).count("1")
+
+
+def _trailing_ones(bits: int) -> int:
+    return (~bits & (bits + 1)).bit_length() - 1
+
+
+class HabitHistory:
+    """Completion days of one habit as of a given day
+
+    Bit i of the bitmap is set when the habit was completed i days before
+    as_of, so the most recent days are the low bits. Completions after as_of
+    are ignored. Instances are immutable.
+    """
+
+    __slots__ = ("bits", "as_of", "times", "period_days")
+
+    def __init__(self, bits: int, as_of: date, frequency: str = "daily"):
+        self.bits = bits
+        self.as_of = as_of
+        self.times, self.period_days = parse_frequency(frequency)
+
+    @classmethod
+    def from_ages(cls, ages: Iterable[int], as_of: date, frequency: str = "daily") -> "HabitHistory":
+        """Build from day offsets (0 = as_of); the bitmap is filled in a bytearray first"""
+        ages = [age for age in ages if age >= 0]
+        buffer = bytearray(max(ages, default=-1) // 8 + 1)
+        for age in ages:
+            buffer[age >> 3] |= 1 << (age & 7)
+        return cls(int.from_bytes(buffer, "little"), as_of, frequency)
+
+    @classmethod
+    def from_dates(cls, days: Iterable, as_of: date = None, frequency: str = "daily") -> "HabitHistory":
+        as_of = as_of or date.today()
+        return cls.from_ages(((as_of - _as_date(d)).days for d in days), as_of, frequency)
+
+    @property
+    def is_daily(self) -> bool:
+        return self.period_days == 1
+
+    @property
+    def unit(self) -> str:
+        return "days" if self.is_daily else "weeks"
+
+    def completed(self, day) -> bool:
+        age = (self.as_of - _as_date(day)).days
+        return age >= 0 and bool(self.bits >> age & 1)
+
+    # ---- Daily: the app's streak rule ----
+
+    def _gap_pairs(self, bits: int) -> int:
+        """Bit i set where days i and i+1 are both missed; that pair ends a daily chain"""
+        width = bits.bit_length() + 2
+        missed = ~bits & ((1 << width) - 1)
+        return missed & (missed >> 1)
+
+    def _daily_chain(self, bits: int) -> int:
+        """Completions in the chain starting at bit 0 (one missed day is bridged, two are not)"""
+        pairs = self._gap_pairs(bits)
+        end = (pairs & -pairs).bit_length() - 1
+        return _popcount(bits & ((1 << end) - 1))
+
+    def _daily_longest(self) -> int:
+        bits, best = self.bits, 0
+        while bits:
+            bits >>= (bits & -bits).bit_length() - 1
+            pairs = self._gap_pairs(bits)
+            end = (pairs & -pairs).bit_length() - 1
+            best = max(best, _popcount(bits & ((1 << end) - 1)))
+            bits >>= end
+        return best
+
+    # ---- Weekly and N per week ----
+
+    def _met_periods(self) -> Tuple[int, int]:
+        """(bitmap, count): bit k set when the k-th most recent week reached its target
+
+        Weeks run Monday to Sunday; week 0 is the one containing as_of.
+        """
+        first = self.as_of.weekday() + 1
+        bits, met, k = self.bits, 0, 0
+        size = first
+        while bits:
+            if _popcount(bits & ((1 << size) - 1)) >= self.times:
+                met |= 1 << k
+            bits >>= size
+            size = self.period_days
+            k += 1
+        return met, max(k, 1)
+
+    # ---- Public ----
+
+    def current_streak(self) -> int:
+        """Current streak in days (daily habits) or weeks
+
+        A week still in progress extends the streak once it reaches its
+        target and does not break it before then.
+        """
+        if self.is_daily:
+            return self._daily_chain(self.bits)
+        met, _ = self._met_periods()
+        return _trailing_ones(met) if met & 1 else _trailing_ones(met >> 1)
+
+    def longest_streak(self) -> int:
+        """Longest streak in days (daily habits) or weeks"""
+        if self.is_daily:
+            return self._daily_longest()
+        met, best = self._met_periods()[0], 0
+        while met:
+            met &= met >> 1
+            best += 1
+        return best
+
+    def completion_rate(self, periods: int = 30) -> float:
+        """Percentage of the last N days (daily) or weeks, including the current one, that hit the target"""
+        if self.is_daily:
+            return 100.0 * _popcount(self.bits & ((1 << periods) - 1)) / periods
+        met, _ = self._met_periods()
+        return 100.0 * _popcount(met & ((1 << periods) - 1)) / periods
+
+    def completions(self, days: int = None) -> int:
+        """Completed days, in total or within the last N days"""
+        return _popcount(self.bits if days is None else self.bits & ((1 << days) - 1))
+
+
+def _as_date(day) -> date:
+    return day if isinstance(day, date) else date.fromisoformat(str(day))
+
+
+def load_histories(db: Database, as_of: date = None,
+                   habit_ids: Iterable[int] = None) -> Dict[int, HabitHistory]:
+    """HabitHistory for every habit, or only for habit_ids, from two cached column queries
+
+    Reading every habit means reading every log; daily streaks already come from
+    the habit_streaks counters, so callers pass just their weekly and N-per-week habits.
+    """
+    as_of = as_of or date.today()
+    params = {'as_of': as_of.isoformat()}
+    only_habits = only_logs = ''
+    if habit_ids is not None:
+        ids = {f'habit{n}': habit_id for n, habit_id in enumerate(sorted(set(habit_ids)))}
+        if not ids:
+            return {}
+        params.update(ids)
+        placeholders = ', '.join(f':{name}' for name in ids)
+        only_habits = f'WHERE id IN ({placeholders})'
+        only_logs = f'AND habit_id IN ({placeholders})'
+
+    habits = db.query_columns(f'SELECT id, frequency FROM habits {only_habits}', params,
+                              tables=('habits',))
+    # Hot and archived logs are read separately, which is faster than the habit_logs_all view
+    logs = db.query_columns(f'''
+        SELECT habit_id, CAST(julianday(:as_of) - julianday(logged_date) AS INTEGER) AS age
+        FROM habit_logs
+        WHERE completed = 1 AND logged_date <= :as_of {only_logs}
+        UNION ALL
+        SELECT habit_id, CAST(julianday(:as_of) - julianday(logged_date) AS INTEGER)
+        FROM habit_logs_archive
+        WHERE completed = 1 AND logged_date <= :as_of {only_logs}
+    ''', params, tables=('habit_logs',))
+
+    ages: Dict[int, list] = {}
+    for habit_id, age in zip(logs['habit_id'], logs['age']):
+        ages.setdefault(habit_id, []).append(age)
+    return {
+        habit_id: HabitHistory.from_ages(ages.get(habit_id, ()), as_of, frequency)
+        for habit_id, frequency in zip(habits['id'], habits['frequency'])
+    }
+
+
+def completion_matrix(db: Database, start: date, end: date):
+    """(habit_ids, matrix) with matrix[h, d] True when habit_ids[h] was completed on start + d days
+
+    One range query over habit_logs; the day-by-habit matrix is filled with
+    a single vectorized scatter. Habits are in id order.
+    """
+    import numpy as np
+
+    habits = db.query_columns('SELECT id FROM habits ORDER BY id', tables=('habits',))
+    logs = db.query_columns('''
+        SELECT habit_id, CAST(julianday(logged_date) - julianday(:start) AS INTEGER) AS day
+        FROM habit_logs
+        WHERE completed = 1 AND logged_date BETWEEN :start AND :end
+        UNION ALL
+        SELECT habit_id, CAST(julianday(logged_date) - julianday(:start) AS INTEGER)
+        FROM habit_logs_archive
+        WHERE completed = 1 AND logged_date BETWEEN :start AND :end
+    ''', {'start': start.isoformat(), 'end': end.isoformat()}, tables=('habit_logs',))
+
+    habit_ids = np.asarray(habits['id'], dtype=np.int64)
+    matrix = np.zeros((len(habit_ids), (end - start).days + 1), dtype=bool)
+    if len(habit_ids) and logs['habit_id']:
+        log_habits = np.asarray(logs['habit_id'], dtype=np.int64)
+        rows = np.minimum(np.searchsorted(habit_ids, log_habits), len(habit_ids) - 1)
+        known = habit_ids[rows] == log_habits
+        matrix[rows[known], np.asarray(logs['day'], dtype=np.int64)[known]] = True
+    return habit_ids, matrix
+
+
+def week_grid(daily, start: date):
+    """Reshape per-day values starting on a Monday into a 7 x weeks grid (rows Monday..Sunday)
+
+    Days past the end of daily are NaN so they render as blanks.
+    """
+    import numpy as np
+
+    if start.weekday() != 0:
+        raise ValueError("week_grid needs a Monday start")
+    daily = np.asarray(daily, dtype=float)
+    padded = np.concatenate([daily, np.full(-len(daily) % 7, np.nan)])
+    return padded.reshape(-1, 7).T
+
@@ -0,0 +1,248 @@
+"""
+Instrumentation for Productivity Dashboard
+Records SQL statements and render sections, exportable as JSON or Prometheus text
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(sql: str) -> str:
+    """Collapse whitespace so the same statement always aggregates under one key"""
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+class Recorder:
+    """Thread-safe store of query and render timings
+
+    Keeps the most recent queries individually and running totals per
+    statement and per (page, section).
+    """
+
+    def __init__(self, keep: int = 500):
+        self.started_at = time.time()
+        self.recent: deque = deque(maxlen=keep)
+        self.statements: Dict[str, List] = {}
+        self.sections: Dict[Tuple[str, str], List] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    # ---- SQL ----
+
+    def connection_factory(self):
+        """sqlite3.Connection subclass whose cursors report to this recorder"""
+        recorder = self
+
+        class TracedCursor(sqlite3.Cursor):
+            _record = None
+
+            def execute(self, sql, parameters=()):
+                start = time.perf_counter()
+                try:
+                    return super().execute(sql, parameters)
+                finally:
+                    self._record = recorder.record_query(
+                        sql, time.perf_counter() - start, max(self.rowcount, 0))
+
+            def executemany(self, sql, seq_of_parameters):
+                start = time.perf_counter()
+                try:
+                    return super().executemany(sql, seq_of_parameters)
+                finally:
+                    self._record = recorder.record_query(
+                        sql, time.perf_counter() - start, max(self.rowcount, 0))
+
+            # SQLite produces rows while they are fetched, so fetch time counts too
+            def fetchone(self):
+                start = time.perf_counter()
+                row = super().fetchone()
+                recorder.record_fetch(self._record, time.perf_counter() - start, row is not None)
+                return row
+
+            def fetchmany(self, size=None):
+                start = time.perf_counter()
+                rows = super().fetchmany(self.arraysize if size is None else size)
+                recorder.record_fetch(self._record, time.perf_counter() - start, len(rows))
+                return rows
+
+            def fetchall(self):
+                start = time.perf_counter()
+                rows = super().fetchall()
+                recorder.record_fetch(self._record, time.perf_counter() - start, len(rows))
+                return rows
+
+            def __next__(self):
+                start = time.perf_counter()
+                try:
+                    row = super().__next__()
+                except StopIteration:
+                    recorder.record_fetch(self._record, time.perf_counter() - start, 0)
+                    raise
+                recorder.record_fetch(self._record, time.perf_counter() - start, 1)
+                return row
+
+        class TracedConnection(sqlite3.Connection):
+            def cursor(self, factory=TracedCursor):
+                return super().cursor(factory)
+
+            # The C implementations of these bypass cursor(), so route them through it
+            def execute(self, sql, parameters=()):
+                return self.cursor().execute(sql, parameters)
+
+            def executemany(self, sql, seq_of_parameters):
+                return self.cursor().executemany(sql, seq_of_parameters)
+
+        return TracedConnection
+
+    def record_query(self, sql: str, seconds: float, rows: int) -> Dict:
+        """Log one executed statement; returns the record so fetches can add to it"""
+        render = getattr(self._local, "render", None)
+        record = {
+            "sql": normalize_sql(sql),
+            "ms": seconds * 1000,
+            "rows": rows,
+            "thread": threading.current_thread().name,
+            "section": render.section if render else None,
+            "at": time.time(),
+        }
+        with self._lock:
+            self.recent.append(record)
+            totals = self.statements.setdefault(record["sql"], [0, 0.0, 0])
+            totals[0] += 1
+            totals[1] += seconds
+            totals[2] += rows
+        if render:
+            render.queries.append(record)
+        return record
+
+    def record_fetch(self, record: Optional[Dict], seconds: float, rows: int):
+        """Add fetch time and fetched rows to the statement that produced them"""
+        if record is None:
+            return
+        with self._lock:
+            record["ms"] += seconds * 1000
+            record["rows"] += rows
+            totals = self.statements[record["sql"]]
+            totals[1] += seconds
+            totals[2] += rows
+
+    # ---- Rendering ----
+
+    def render(self, page: str = None) -> "RenderTimer":
+        """Start timing a script run on the calling thread"""
+        timer = RenderTimer(self, page)
+        self._local.render = timer
+        return timer
+
+    def record_section(self, page: str, section: str, seconds: float):
+        with self._lock:
+            totals = self.sections.setdefault((page, section), [0, 0.0])
+            totals[0] += 1
+            totals[1] += seconds
+
+    # ---- Export ----
+
+    def snapshot(self) -> Dict:
+        """Totals and recent queries as plain data"""
+        with self._lock:
+            return {
+                "started_at": self.started_at,
+                "statements": [
+                    {"sql": sql, "calls": calls, "seconds": seconds, "rows": rows}
+                    for sql, (calls, seconds, rows) in self.statements.items()
+                ],
+                "sections": [
+                    {"page": page, "section": section, "calls": calls, "seconds": seconds}
+                    for (page, section), (calls, seconds) in self.sections.items()
+                ],
+                "recent_queries": [dict(record) for record in self.recent],
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2, ensure_ascii=False)
+
+    def to_prometheus(self) -> str:
+        """Totals in the Prometheus text exposition format"""
+        snap = self.snapshot()
+        lines = [
+            "# HELP dashboard_sql_calls_total SQL statements executed.",
+            "# TYPE dashboard_sql_calls_total counter",
+        ]
+        lines += [f'dashboard_sql_calls_total{{statement="{_label(s["sql"])}"}} {s["calls"]}'
+                  for s in snap["statements"]]
+        lines += [
+            "# HELP dashboard_sql_seconds_total Time spent executing and fetching SQL.",
+            "# TYPE dashboard_sql_seconds_total counter",
+        ]
+        lines += [f'dashboard_sql_seconds_total{{statement="{_label(s["sql"])}"}} {s["seconds"]:.6f}'
+                  for s in snap["statements"]]
+        lines += [
+            "# HELP dashboard_sql_rows_total Rows returned or changed by SQL.",
+            "# TYPE dashboard_sql_rows_total counter",
+        ]
+        lines += [f'dashboard_sql_rows_total{{statement="{_label(s["sql"])}"}} {s["rows"]}'
+                  for s in snap["statements"]]
+        lines += [
+            "# HELP dashboard_render_seconds Time spent rendering each page section.",
+            "# TYPE dashboard_render_seconds summary",
+        ]
+        for s in snap["sections"]:
+            labels = f'page="{_label(s["page"] or "")}",section="{_label(s["section"])}"'
+            lines.append(f"dashboard_render_seconds_sum{{{labels}}} {s['seconds']:.6f}")
+            lines.append(f"dashboard_render_seconds_count{{{labels}}} {s['calls']}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: str):
+        """Write to path as Prometheus text (.prom/.txt) or JSON (anything else)"""
+        text = self.to_prometheus() if path.endswith((".prom", ".txt")) else self.to_json()
+        with open(path, "w", encoding="utf-8") as fp:
+            fp.write(text)
+
+
+def _label(value: str) -> str:
+    """Escape a Prometheus label value"""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class RenderTimer:
+    """Splits one script run into named sections; queries are tagged with the running section"""
+
+    def __init__(self, recorder: Recorder, page: str = None):
+        self.recorder = recorder
+        self.page = page
+        self.section = "setup"
+        self.laps: List[Tuple[str, float]] = []
+        self.queries: List[Dict] = []
+        self._started = self._last = time.perf_counter()
+
+    def lap(self, section: str):
+        """Close the running section and start the next one"""
+        now = time.perf_counter()
+        self.laps.append((self.section, now - self._last))
+        self.recorder.record_section(self.page, self.section, now - self._last)
+        self.section, self._last = section, now
+
+    def finish(self) -> float:
+        """Close the last section; returns the total run time in seconds"""
+        self.lap(None)
+        self.recorder._local.render = None
+        return self._last - self._started
+
+
+class NullTimer:
+    """Stand-in for RenderTimer when instrumentation is off"""
+
+    page = None
+
+    def lap(self, section: str):
+        pass
+
+    def finish(self) -> float:
+        return 0.0
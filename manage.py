@@ -0,0 +1,175 @@
+"""
+Maintenance commands for Productivity Dashboard
+Usage: python manage.py (--db PATH | --user NAME) <command>   (--user defaults to $DASHBOARD_USER)
+"""
+
+import argparse
+import getpass
+import os
+import sys
+
+import data_io
+import sentiment
+from accounts import ACCOUNTS_FILE, AccountStore
+from database import Database
+from registry import DatabaseRegistry, copy_database, normalize_user_id
+
+
+def rebuild_streaks(db: Database, args):
+    """Recompute the habit_streaks table from habit_logs"""
+    db.rebuild_habit_streaks()
+    print("✅ Habit streaks rebuilt")
+
+
+def rebuild_counters(db: Database, args):
+    """Recompute the stats_counters row from the source tables"""
+    db.rebuild_stats_counters()
+    print("✅ Stats counters rebuilt")
+
+
+def rebuild_activity(db: Database, args):
+    """Recompute the daily_activity rollup from the source tables"""
+    db.rebuild_daily_activity()
+    print("✅ Daily activity rollup rebuilt")
+
+
+def rebuild_search(db: Database, args):
+    """Recompute the full-text search indexes from the source tables"""
+    db.rebuild_search_index()
+    print("✅ Search indexes rebuilt")
+
+
+def archive(db: Database, args):
+    """Move old completed tasks, habit logs and mood entries into the archive tables"""
+    moved = db.archive(args.task_age, args.log_retention, args.mood_retention)
+    for table, rows in moved.items():
+        print(f"  {table}: {rows:,} rows")
+    print(f"✅ Archived {sum(moved.values()):,} rows")
+
+
+def adopt(db_path: str, args):
+    """Copy an older single-file database in as the target database"""
+    if args.force:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+    try:
+        copy_database(args.legacy, db_path)
+    except FileExistsError:
+        sys.exit(f"❌ {db_path} already exists; pass --force to replace it")
+    Database(db_path).close()  # brings the copy's schema up to date
+    print(f"✅ Copied {args.legacy} to {db_path}")
+
+
+def set_password(db_path: str, args):
+    """Create a user's sign-in account or change its password"""
+    if not args.user:
+        sys.exit("❌ set-password needs --user NAME")
+    password = getpass.getpass(f"New password for {args.user}: ")
+    if password != getpass.getpass("Repeat it: "):
+        sys.exit("❌ The passwords don't match")
+    try:
+        AccountStore(os.path.join(args.data_dir, ACCOUNTS_FILE)).set_password(args.user, password)
+    except ValueError as exc:
+        sys.exit(f"❌ {exc}")
+    print(f"✅ Password set for {normalize_user_id(args.user)}")
+
+
+def backfill_sentiment(db: Database, args):
+    """Batch-score mood entries whose sentiment is still pending"""
+    done = sentiment.backfill(
+        db, batch_size=args.batch_size, rescore=args.all,
+        progress=lambda rows: _report("mood_entries", rows)
+    )
+    print(file=sys.stderr)
+    print(f"✅ Scored {done:,} mood entries")
+
+
+def _report(table: str, rows: int, _last=[None]):
+    """Progress line per table, rewritten in place as chunks land"""
+    if _last[0] not in (None, table):
+        print(file=sys.stderr)
+    _last[0] = table
+    print(f"\r  {table}: {rows:,} rows", end="", file=sys.stderr, flush=True)
+
+
+def export_data(db: Database, args):
+    """Stream tables out to one CSV/NDJSON file per table"""
+    counts = data_io.export_all(db, args.dir, args.format, args.tables,
+                                chunk_size=args.batch_size, progress=_report)
+    print(file=sys.stderr)
+    print(f"✅ Exported {sum(counts.values()):,} rows to {args.dir}")
+
+
+def import_data(db: Database, args):
+    """Stream CSV/NDJSON files back in using batched transactions"""
+    counts = data_io.import_all(db, args.dir, args.format, args.tables,
+                                batch_size=args.batch_size, on_conflict=args.on_conflict,
+                                progress=_report)
+    print(file=sys.stderr)
+    print(f"✅ Imported {sum(counts.values()):,} rows from {args.dir}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Productivity Dashboard maintenance")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--db", help="Path to the SQLite database")
+    target.add_argument("--user", default=os.environ.get("DASHBOARD_USER"),
+                        help="Work on this user's database (default: $DASHBOARD_USER)")
+    parser.add_argument("--data-dir", default=os.environ.get("DASHBOARD_DATA_DIR", os.path.join("data", "users")),
+                        help="Where per-user databases live (with --user)")
+    parser.set_defaults(open_db=True)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("rebuild-streaks", help="Repair the habit_streaks table").set_defaults(func=rebuild_streaks)
+    commands.add_parser("rebuild-counters", help="Repair the stats_counters row").set_defaults(func=rebuild_counters)
+    commands.add_parser("rebuild-activity", help="Repair the daily_activity rollup").set_defaults(func=rebuild_activity)
+    commands.add_parser("rebuild-search", help="Repair the full-text search indexes").set_defaults(func=rebuild_search)
+
+    archiver = commands.add_parser("archive", help="Move old rows out of the live tables")
+    archiver.add_argument("--task-age", type=int, default=90,
+                          help="Archive tasks completed more than this many days ago")
+    archiver.add_argument("--log-retention", type=int, default=365,
+                          help="Archive habit logs older than this many days")
+    archiver.add_argument("--mood-retention", type=int, default=365,
+                          help="Archive mood entries older than this many days")
+    archiver.set_defaults(func=archive)
+
+    adopter = commands.add_parser("adopt", help="Copy an older single-file database in")
+    adopter.add_argument("legacy", nargs="?", default="productivity.db",
+                         help="Database to copy (default: productivity.db)")
+    adopter.add_argument("--force", action="store_true",
+                         help="Replace the target if it exists (stop the app first)")
+    adopter.set_defaults(func=adopt, open_db=False)
+
+    commands.add_parser("set-password", help="Create a user's account or change its password").set_defaults(
+        func=set_password, open_db=False)
+
+    backfill = commands.add_parser("backfill-sentiment", help="Score pending mood entries")
+    backfill.add_argument("--all", action="store_true", help="Also re-apply scores to already scored entries")
+    backfill.add_argument("--batch-size", type=int, default=500)
+    backfill.set_defaults(func=backfill_sentiment)
+
+    for name, func, help_text in (("export", export_data, "Export tables to a directory"),
+                                  ("import", import_data, "Import tables from a directory")):
+        sub = commands.add_parser(name, help=help_text)
+        sub.add_argument("dir", help="Directory holding one file per table")
+        sub.add_argument("--format", choices=data_io.FORMATS, default="ndjson")
+        sub.add_argument("--tables", nargs="+", choices=Database.DATA_TABLES, default=Database.DATA_TABLES)
+        sub.add_argument("--batch-size", type=int, default=1000, help="Rows per chunk / transaction")
+        sub.set_defaults(func=func)
+        if name == "import":
+            sub.add_argument("--on-conflict", choices=("abort", "ignore", "replace"), default="abort")
+
+    args = parser.parse_args(argv)
+    if args.db:
+        db_path = args.db
+    elif args.user:
+        db_path = DatabaseRegistry(args.data_dir).path_for(args.user)
+    else:
+        parser.error("pass --db PATH or --user NAME (or set DASHBOARD_USER)")
+    args.func(Database(db_path) if args.open_db else db_path, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Connection pool for Productivity Dashboard
+One serialized writer connection plus a bounded set of WAL readers
+"""
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Optional
+
+
+class ConnectionPool:
+    """Thread-safe SQLite connections: a single writer and up to max_readers readers"""
+
+    def __init__(self, db_name: str, max_readers: int = 4, busy_timeout_ms: int = 5000,
+                 factory: type = sqlite3.Connection):
+        """Open the writer connection and switch the database to WAL journaling"""
+        self.db_name = db_name
+        self.max_readers = max_readers
+        self.busy_timeout_ms = busy_timeout_ms
+        self.factory = factory
+        # An in-memory database is private to its connection, so readers share the writer
+        self.shared = db_name == ":memory:" or db_name.startswith("file::memory:")
+
+        self._write_lock = threading.RLock()
+        self._local = threading.local()
+        self._writer = self._connect()
+        self._writer.execute("PRAGMA journal_mode = WAL")
+        self._writer.execute("PRAGMA synchronous = NORMAL")
+
+        self._readers = queue.LifoQueue()
+        self._reader_count = 0
+        self._reader_lock = threading.Lock()
+        self.closed = False
+
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        """Open a connection; transactions are managed explicitly by writer()"""
+        conn = sqlite3.connect(
+            self.db_name,
+            timeout=self.busy_timeout_ms / 1000,
+            check_same_thread=False,
+            isolation_level=None,
+            factory=self.factory,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        if read_only:
+            conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    @property
+    def _depth(self) -> int:
+        return getattr(self._local, "depth", 0)
+
+    @property
+    def in_write_transaction(self) -> bool:
+        """Whether the calling thread is inside writer()"""
+        return self._depth > 0
+
+    def _check_open(self):
+        if self.closed:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed connection pool.")
+
+    @contextmanager
+    def writer(self):
+        """Yield the write connection inside a transaction; nested calls join the outer one"""
+        with self._write_lock:
+            self._check_open()
+            outermost = self._depth == 0
+            if outermost:
+                self._writer.execute("BEGIN IMMEDIATE")
+            self._local.depth = self._depth + 1
+            try:
+                yield self._writer
+            except BaseException:
+                if outermost:
+                    self._writer.rollback()
+                raise
+            else:
+                if outermost:
+                    self._writer.commit()
+            finally:
+                self._local.depth -= 1
+
+    def external_version(self) -> Optional[int]:
+        """PRAGMA data_version of the writer, which only moves when another connection commits
+
+        Returns None rather than waiting while this pool is writing.
+        """
+        if not self._write_lock.acquire(blocking=False):
+            return None
+        try:
+            self._check_open()
+            return self._writer.execute("PRAGMA data_version").fetchone()[0]
+        finally:
+            self._write_lock.release()
+
+    @contextmanager
+    def reader(self):
+        """Yield a read connection; WAL lets it run alongside the writer without blocking"""
+        self._check_open()
+        if self._depth or self.shared:
+            # Inside a write transaction reads must see its uncommitted rows
+            with self._write_lock:
+                self._check_open()
+                yield self._writer
+            return
+
+        conn = self._checkout()
+        try:
+            yield conn
+        finally:
+            self._checkin(conn)
+
+    def _checkout(self) -> sqlite3.Connection:
+        """Take an idle reader, opening a new one while under max_readers"""
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            with self._reader_lock:
+                self._check_open()
+                if self._reader_count < self.max_readers:
+                    self._reader_count += 1
+                    return self._connect(read_only=True)
+            conn = self._readers.get()
+        if conn is None:
+            # close() leaves None behind so that waiting threads wake up and fail
+            self._readers.put(None)
+            self._check_open()
+        return conn
+
+    def _checkin(self, conn: sqlite3.Connection):
+        """Return a reader to the pool, or close it if the pool closed while it was out"""
+        with self._reader_lock:
+            if not self.closed:
+                self._readers.put(conn)
+                return
+            self._reader_count -= 1
+        conn.close()
+
+    def close(self):
+        """Close every connection owned by the pool; later reader()/writer() calls raise"""
+        with self._write_lock, self._reader_lock:
+            if self.closed:
+                return
+            self.closed = True
+            while True:
+                try:
+                    conn = self._readers.get_nowait()
+                except queue.Empty:
+                    break
+                if conn is not None:
+                    conn.close()
+                    self._reader_count -= 1
+            # Wakes threads blocked waiting for a reader so they raise instead of hanging
+            self._readers.put(None)
+            self._writer.close()
@@ -0,0 +1,185 @@
+"""
+Per-user databases for Productivity Dashboard
+Maps user ids to their own SQLite file and keeps a bounded LRU of open handles
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict
+
+from database import Database
+
+_USER_ID = re.compile(r"^[a-z0-9][a-z0-9._@-]{0,63}$")
+
+
+def normalize_user_id(user_id: str) -> str:
+    """Canonical form of a user id; raises ValueError if it can't be one"""
+    normalized = (user_id or "").strip().lower()
+    if not _USER_ID.match(normalized):
+        raise ValueError("User names are 1-64 letters, digits, '.', '_', '@' or '-'")
+    return normalized
+
+
+def copy_database(source: str, target: str):
+    """Copy a SQLite database, including changes still in its WAL, to a file that doesn't exist yet"""
+    if not os.path.exists(source):
+        raise FileNotFoundError(f"No database at {source}")
+    if os.path.exists(target):
+        raise FileExistsError(f"{target} already exists")
+    src, dst = sqlite3.connect(source), sqlite3.connect(target)
+    try:
+        src.backup(dst)
+    finally:
+        dst.close()
+        src.close()
+
+
+class _Handle:
+    __slots__ = ("db", "refs", "last_used")
+
+    def __init__(self, db: Database):
+        self.db = db
+        self.refs = 0
+        self.last_used = time.monotonic()
+
+
+class UserDatabase:
+    """One user's Database, looked up in the registry on every method call
+
+    Each call holds the handle only while it runs, so a holder that outlives a
+    script run (a fragment, a widget callback) never pins a handle open, and a
+    handle closed while it was idle is simply reopened.
+    """
+
+    __slots__ = ("user_id", "_registry")
+
+    def __init__(self, registry: "DatabaseRegistry", user_id: str):
+        self.user_id = normalize_user_id(user_id)
+        self._registry = registry
+
+    def __getattr__(self, name: str):
+        if not callable(getattr(Database, name, None)):
+            return getattr(self._registry.get(self.user_id), name)
+
+        def call(*args, **kwargs):
+            with self._registry.acquire(self.user_id) as db:
+                return getattr(db, name)(*args, **kwargs)
+        return call
+
+
+class DatabaseRegistry:
+    """Thread-safe LRU of open per-user Database handles
+
+    max_open is a soft limit: a handle is only closed once nothing holds it
+    and it has been idle for idle_grace seconds, so a script run that fetched
+    a handle with get() can finish with it.
+    """
+
+    def __init__(self, data_dir: str = os.path.join("data", "users"), max_open: int = 32,
+                 idle_grace: float = 60.0, **db_kwargs):
+        """db_kwargs are passed to every Database the registry opens"""
+        self.data_dir = data_dir
+        self.max_open = max_open
+        self.idle_grace = idle_grace
+        self.db_kwargs = db_kwargs
+        self._open: "OrderedDict[str, _Handle]" = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(data_dir, exist_ok=True)
+
+    def path_for(self, user_id: str) -> str:
+        """Database file of a user; the hash keeps distinct ids from sharing a file"""
+        user_id = normalize_user_id(user_id)
+        slug = re.sub(r"[^a-z0-9_-]", "_", user_id)
+        digest = hashlib.sha256(user_id.encode("utf-8")).hexdigest()[:8]
+        return os.path.join(self.data_dir, f"{slug}-{digest}.db")
+
+    def adopt(self, user_id: str, source: str) -> str:
+        """Copy an existing database file (such as a single-user productivity.db) in as a user's
+
+        Raises FileExistsError if the user already has a database; returns its path.
+        """
+        user_id = normalize_user_id(user_id)
+        with self._lock:
+            if user_id in self._open:
+                raise FileExistsError(f"{user_id}'s database is open")
+            target = self.path_for(user_id)
+            copy_database(source, target)
+        return target
+
+    def get(self, user_id: str) -> Database:
+        """Open or reuse a user's database and mark it as just used"""
+        with self._lock:
+            return self._touch(normalize_user_id(user_id)).db
+
+    def hold(self, user_id: str) -> Database:
+        """Like get(), but the handle stays open until a matching release()"""
+        with self._lock:
+            handle = self._touch(normalize_user_id(user_id))
+            handle.refs += 1
+            return handle.db
+
+    def release(self, user_id: str):
+        with self._lock:
+            handle = self._open.get(normalize_user_id(user_id))
+            if handle is not None:
+                handle.refs -= 1
+                handle.last_used = time.monotonic()
+            self._evict()
+
+    def bind(self, user_id: str) -> UserDatabase:
+        """A stand-in for a user's Database that never keeps its handle open between calls"""
+        return UserDatabase(self, user_id)
+
+    @contextmanager
+    def acquire(self, user_id: str):
+        """hold() for the duration of a with block"""
+        db = self.hold(user_id)
+        try:
+            yield db
+        finally:
+            self.release(user_id)
+
+    def close_all(self):
+        """Close every open handle, held or not (for shutdown)"""
+        with self._lock:
+            while self._open:
+                self._open.popitem(last=False)[1].db.close()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"open": len(self._open),
+                    "held": sum(1 for h in self._open.values() if h.refs)}
+
+    def __len__(self) -> int:
+        return len(self._open)
+
+    def _touch(self, user_id: str) -> _Handle:
+        handle = self._open.get(user_id)
+        if handle is None:
+            handle = _Handle(Database(self.path_for(user_id), **self.db_kwargs))
+            self._open[user_id] = handle
+        else:
+            self._open.move_to_end(user_id)
+        handle.last_used = time.monotonic()
+        self._evict(keep=user_id)
+        return handle
+
+    def _evict(self, keep: str = None):
+        """Close least recently used idle handles, other than keep's, while over max_open"""
+        excess = len(self._open) - self.max_open
+        if excess <= 0:
+            return
+        cutoff = time.monotonic() - self.idle_grace
+        for user_id, handle in list(self._open.items()):
+            if excess <= 0:
+                break
+            if handle.refs == 0 and handle.last_used <= cutoff and user_id != keep:
+                del self._open[user_id]
+                handle.db.close()
+                excess -= 1
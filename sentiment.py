@@ -0,0 +1,102 @@
+"""
+Sentiment scoring for Productivity Dashboard
+Scores mood notes on background threads, caching results by note hash
+"""
+
+import hashlib
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from database import Database
+
+logger = logging.getLogger(__name__)
+
+# Stored when scoring fails, so the entry doesn't stay "Analyzing..." forever
+FALLBACK_SCORE = 0.0
+
+_textblob_lock = threading.Lock()
+_TextBlob = None
+
+
+def note_hash(text: str) -> str:
+    """Stable cache key for a note"""
+    return hashlib.sha256(text.strip().encode("utf-8")).hexdigest()
+
+
+def score_text(text: str) -> float:
+    """Polarity of text in [-1, 1]; TextBlob is only imported on first use"""
+    global _TextBlob
+    if not text or not text.strip():
+        return 0.0
+    if _TextBlob is None:
+        with _textblob_lock:
+            if _TextBlob is None:
+                from textblob import TextBlob
+                _TextBlob = TextBlob
+    return _TextBlob(text).sentiment.polarity
+
+
+def score_notes(db: Database, notes: Sequence[str]) -> List[float]:
+    """Score many notes, reusing cached results and caching the new ones"""
+    hashes = [note_hash(n or "") for n in notes]
+    cached = db.get_cached_sentiments(sorted(set(hashes)))
+    fresh: Dict[str, float] = {}
+    scores = []
+    for text, key in zip(notes, hashes):
+        if key in cached:
+            scores.append(cached[key])
+            continue
+        if key not in fresh:
+            fresh[key] = score_text(text or "")
+        scores.append(fresh[key])
+    if fresh:
+        db.cache_sentiments(fresh.items())
+    return scores
+
+
+class SentimentWorker:
+    """Background pool that fills in sentiment_score for freshly logged mood entries"""
+
+    def __init__(self, max_workers: int = 2):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sentiment")
+
+    def submit(self, db: Database, entry_id: int, notes: str) -> Future:
+        """Queue one entry for scoring; the future resolves to its score"""
+        return self._executor.submit(self._score, db, entry_id, notes)
+
+    @staticmethod
+    def _score(db: Database, entry_id: int, notes: str) -> float:
+        try:
+            score = score_notes(db, [notes])[0]
+        except Exception:
+            # Not cached, so `manage.py backfill-sentiment --all` scores it properly later
+            logger.exception("Scoring mood entry %s failed; storing a neutral score", entry_id)
+            score = FALLBACK_SCORE
+        try:
+            db.set_sentiment_scores([(entry_id, score)])
+        except Exception:
+            logger.exception("Saving the sentiment score of mood entry %s failed", entry_id)
+            raise
+        return score
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+
+def backfill(db: Database, batch_size: int = 500, rescore: bool = False,
+             progress: Optional[Callable[[int], None]] = None) -> int:
+    """Score historical mood entries in batches; rescore=True redoes already scored ones"""
+    done, after_id = 0, 0
+    while True:
+        batch = db.get_unscored_mood_entries(batch_size, after_id, include_scored=rescore)
+        if not batch:
+            return done
+        scores = score_notes(db, [row["notes"] for row in batch])
+        updates: List[Tuple[int, float]] = [(row["id"], s) for row, s in zip(batch, scores)]
+        db.set_sentiment_scores(updates)
+        after_id = batch[-1]["id"]
+        done += len(batch)
+        if progress:
+            progress(done)
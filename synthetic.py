@@ -0,0 +1,151 @@
+"""
+Synthetic data for Productivity Dashboard
+Fills a database with a reproducible dataset of a given size
+Usage: python synthetic.py bench.db [--scale 100k] [--seed 42]
+"""
+
+import argparse
+import random
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, Optional
+
+from database import Database
+
+# Roughly 1k / 100k / 1M rows in total; habit_logs is habits * days * ~0.75
+SCALES = {
+    "1k": dict(tasks=300, habits=3, days=120, mood_entries=250, goals=20, pomodoro_sessions=150),
+    "100k": dict(tasks=30_000, habits=30, days=1_095, mood_entries=25_000, goals=500,
+                 pomodoro_sessions=20_000),
+    "1m": dict(tasks=300_000, habits=100, days=3_650, mood_entries=250_000, goals=5_000,
+               pomodoro_sessions=170_000),
+}
+
+MOOD_EMOJIS = ["😢", "😔", "😐", "🙂", "😊", "😄", "🤩"]
+NOTES = [
+    "", "", "Productive morning", "Slept badly", "Great workout",
+    "Too many meetings", "Finished the report", "Feeling a bit stressed",
+]
+
+
+def _moment(rng: random.Random, today: date, days: int) -> datetime:
+    """A random time within the last N days"""
+    start = datetime.combine(today - timedelta(days=days - 1), datetime.min.time())
+    return start + timedelta(seconds=rng.randrange(days * 86_400))
+
+
+def _stamp(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _tasks(rng: random.Random, count: int, today: date, days: int) -> Iterator[Dict]:
+    for i in range(count):
+        created = _moment(rng, today, days)
+        status = rng.choices(("pending", "in_progress", "completed"), (3, 1, 6))[0]
+        completed_at = None
+        if status == "completed":
+            completed_at = _stamp(min(created + timedelta(hours=rng.randrange(1, 240)),
+                                      datetime.combine(today, datetime.max.time())))
+        due = created.date() + timedelta(days=rng.randrange(1, 30))
+        yield {
+            "title": f"Task {i + 1}",
+            "description": rng.choice(NOTES),
+            "priority": rng.choice(("low", "medium", "high")),
+            "status": status,
+            "due_date": due.isoformat() if rng.random() < 0.6 else None,
+            "created_at": _stamp(created),
+            "completed_at": completed_at,
+        }
+
+
+def _habit_logs(rng: random.Random, habit_ids, today: date, days: int) -> Iterator:
+    """Daily logs with habit-specific reliability, so streaks of every length occur"""
+    for habit_id in habit_ids:
+        reliability = rng.uniform(0.55, 0.95)
+        for offset in range(days - 1, -1, -1):
+            if rng.random() < reliability:
+                yield habit_id, (today - timedelta(days=offset)).isoformat()
+
+
+def _mood_entries(rng: random.Random, count: int, today: date, days: int) -> Iterator[Dict]:
+    for _ in range(count):
+        score = min(7, max(1, round(rng.gauss(4.5, 1.3))))
+        notes = rng.choice(NOTES)
+        yield {
+            "mood_score": score,
+            "mood_emoji": MOOD_EMOJIS[score - 1],
+            "notes": notes,
+            "sentiment_score": round(rng.uniform(-1, 1), 3) if notes else 0.0,
+            "logged_at": _stamp(_moment(rng, today, days)),
+        }
+
+
+def _goals(rng: random.Random, count: int, today: date) -> Iterator[Dict]:
+    for i in range(count):
+        target = rng.choice((10, 12, 24, 50, 100, 365))
+        yield {
+            "title": f"Goal {i + 1}",
+            "description": rng.choice(NOTES),
+            "target_value": target,
+            "current_value": round(target * rng.random(), 1),
+            "unit": rng.choice(("books", "km", "sessions", "hours")),
+            "deadline": (today + timedelta(days=rng.randrange(7, 365))).isoformat(),
+        }
+
+
+def _pomodoro_sessions(rng: random.Random, count: int, task_count: int, today: date,
+                       days: int) -> Iterator:
+    for _ in range(count):
+        task_id = rng.randrange(1, task_count + 1) if task_count and rng.random() < 0.8 else None
+        duration = rng.choice((15, 25, 25, 25, 50))
+        started = _moment(rng, today, days)
+        completed = rng.random() < 0.85
+        # Stopped sessions end part way through
+        ended = started + timedelta(minutes=duration if completed else rng.randrange(1, duration))
+        yield task_id, duration, int(completed), _stamp(started), _stamp(ended)
+
+
+def generate(db: Database, tasks: int, habits: int, days: int, mood_entries: int,
+             goals: int, pomodoro_sessions: int, seed: int = 42,
+             today: Optional[date] = None) -> Dict[str, int]:
+    """Insert a synthetic dataset spread over the last N days; return rows added per table
+
+    The same seed and today always produce the same rows.
+    """
+    rng = random.Random(seed)
+    today = today or date.today()
+    counts = {}
+
+    counts["tasks"] = db.add_tasks_bulk(_tasks(rng, tasks, today, days))
+
+    habit_ids = [db.add_habit(f"Habit {i + 1}", rng.choice(NOTES)) for i in range(habits)]
+    counts["habits"] = len(habit_ids)
+    counts["habit_logs"] = db.log_habits_bulk(_habit_logs(rng, habit_ids, today, days))
+
+    counts["mood_entries"] = db.add_mood_entries_bulk(_mood_entries(rng, mood_entries, today, days))
+    counts["goals"] = db.add_goals_bulk(_goals(rng, goals, today))
+    counts["pomodoro_sessions"] = db.insert_rows(
+        "pomodoro_sessions", ("task_id", "duration_minutes", "completed", "started_at", "ended_at"),
+        _pomodoro_sessions(rng, pomodoro_sessions, tasks, today, days),
+    )
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fill a database with synthetic data")
+    parser.add_argument("db", help="Database file to create or extend")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="1k")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    db = Database(args.db)
+    try:
+        counts = generate(db, seed=args.seed, **SCALES[args.scale])
+    finally:
+        db.close()
+    for table, rows in counts.items():
+        print(f"{table:<20} {rows:>10,}")
+    print(f"✅ {sum(counts.values()):,} rows written to {args.db}")
+
+
+if __name__ == "__main__":
+    main()
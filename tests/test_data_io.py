@@ -0,0 +1,45 @@
+from datetime import date, timedelta
+
+import data_io
+from database import Database
+
+
+def old_rows(db):
+    """A task that stays, then two tasks and a habit's logs old enough to archive"""
+    db.add_task("Current")
+    long_ago = (date.today() - timedelta(days=400)).isoformat()
+    habit_id = db.add_habit("Stretch")
+    db.log_habits_bulk((habit_id, (date.today() - timedelta(days=400 + n)).isoformat())
+                       for n in range(3))
+    for title in ("Old report", "Old invoice"):
+        task_id = db.add_task(title)
+        db.update_task_status(task_id, "completed")
+        with db._write('tasks') as conn:
+            conn.execute('UPDATE tasks SET completed_at = ? WHERE id = ?', (long_ago, task_id))
+    return habit_id
+
+
+def test_round_trip_after_archive_does_not_reuse_archived_ids(tmp_path):
+    source = Database(str(tmp_path / "source.db"))
+    habit_id = old_rows(source)
+    source.archive()
+    assert source.archive_counts() == {'tasks': 2, 'habit_logs': 3, 'mood_entries': 0}
+    data_io.export_all(source, str(tmp_path / "dump"))
+    source.close()
+
+    db = Database(str(tmp_path / "restored.db"))
+    try:
+        data_io.import_all(db, str(tmp_path / "dump"))
+
+        new_id = db.add_task("Added after the import")
+        ids = [task['id'] for task in db.get_all_tasks(archived=True, limit=10)]
+        assert sorted(ids) == sorted(set(ids))
+        assert new_id > max(i for i in ids if i != new_id)
+        db.log_habit(habit_id)
+
+        # Archived logs move back into habit_logs, which fails on a reused id
+        db.delete_habit(habit_id)
+        assert db.get_all_habits() == []
+        assert db.archive_counts()['habit_logs'] == 0
+    finally:
+        db.close()
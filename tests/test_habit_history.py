@@ -0,0 +1,123 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+import habit_history
+from habit_history import HabitHistory
+
+TODAY = date(2026, 10, 14)
+
+
+def random_days(rng, as_of):
+    """A random set of completion days up to as_of, from sparse to dense"""
+    span = rng.choice((3, 10, 40, 400))
+    count = int(span * rng.random())
+    return {as_of - timedelta(days=rng.randrange(span)) for _ in range(count)}
+
+
+def naive_daily(days, as_of):
+    """(current, longest): runs of completions where no two days in a row are missed"""
+    runs, last = [], None
+    for day in sorted(days):
+        if last is not None and (day - last).days <= 2:
+            runs[-1].append(day)
+        else:
+            runs.append([day])
+        last = day
+    longest = max((len(run) for run in runs), default=0)
+    current = len(runs[-1]) if runs and (as_of - runs[-1][-1]).days <= 1 else 0
+    return current, longest
+
+
+def naive_weekly(days, as_of, times):
+    """(current, longest) in Monday-to-Sunday weeks with at least `times` completions"""
+    counts = {}
+    for day in days:
+        monday = day - timedelta(days=day.weekday())
+        counts[monday] = counts.get(monday, 0) + 1
+    met = {monday for monday, count in counts.items() if count >= times}
+
+    week = as_of - timedelta(days=as_of.weekday())
+    if week not in met:
+        # The week in progress doesn't break the streak before it is over
+        week -= timedelta(days=7)
+    current = 0
+    while week in met:
+        current += 1
+        week -= timedelta(days=7)
+
+    longest = 0
+    for monday in met:
+        if monday - timedelta(days=7) not in met:
+            run = 1
+            while monday + timedelta(days=7 * run) in met:
+                run += 1
+            longest = max(longest, run)
+    return current, longest
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_daily_streaks_match_date_sets(seed):
+    rng = random.Random(seed)
+    for _ in range(200):
+        as_of = TODAY - timedelta(days=rng.randrange(7))
+        days = random_days(rng, as_of)
+        history = HabitHistory.from_dates(days, as_of)
+
+        expected = naive_daily(days, as_of)
+        assert (history.current_streak(), history.longest_streak()) == expected, sorted(days)
+        assert history.completions() == len(days)
+        assert all(history.completed(day) for day in days)
+
+
+@pytest.mark.parametrize("frequency", habit_history.FREQUENCIES[1:])
+def test_weekly_streaks_match_date_sets(frequency):
+    times, _ = habit_history.parse_frequency(frequency)
+    rng = random.Random(frequency)
+    for _ in range(300):
+        # Every weekday as "today", so weeks in progress of every length are covered
+        as_of = TODAY - timedelta(days=rng.randrange(7))
+        days = random_days(rng, as_of)
+        history = HabitHistory.from_dates(days, as_of, frequency)
+
+        expected = naive_weekly(days, as_of, times)
+        assert (history.current_streak(), history.longest_streak()) == expected, sorted(days)
+        assert history.unit == "weeks"
+
+
+def test_completions_after_as_of_are_ignored():
+    history = HabitHistory.from_dates([TODAY, TODAY + timedelta(days=1)], TODAY)
+
+    assert history.completions() == 1
+    assert not history.completed(TODAY + timedelta(days=1))
+
+
+def test_daily_streaks_match_database(db):
+    rng = random.Random(7)
+    today = date.today()
+    for case in range(200):
+        days = random_days(rng, today)
+        habit_id = db.add_habit(f"Case {case}")
+        db.log_habits_bulk((habit_id, day.isoformat()) for day in days)
+
+        history = habit_history.load_histories(db, habit_ids=[habit_id])[habit_id]
+        expected_longest = db.get_all_habits()[0]['longest_streak'] if days else 0
+        assert history.current_streak() == db.calculate_streak(habit_id), sorted(days)
+        assert history.longest_streak() == expected_longest, sorted(days)
+        db.delete_habit(habit_id)
+
+
+def test_load_histories_reads_only_the_named_habits(db):
+    today = date.today()
+    daily = db.add_habit("Read")
+    weekly = db.add_habit("Run", frequency="3/week")
+    db.log_habits_bulk((habit_id, (today - timedelta(days=n)).isoformat())
+                       for habit_id in (daily, weekly) for n in range(20))
+
+    everything = habit_history.load_histories(db)
+    only_weekly = habit_history.load_histories(db, habit_ids=[weekly])
+
+    assert set(only_weekly) == {weekly}
+    assert only_weekly[weekly].bits == everything[weekly].bits
+    assert habit_history.load_histories(db, habit_ids=[]) == {}
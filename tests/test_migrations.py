@@ -0,0 +1,31 @@
+import threading
+
+from database import Database
+
+
+def test_concurrent_upgrades_skip_steps_already_applied(tmp_path):
+    # Every opener reads user_version 0 and races to apply the same steps
+    path = str(tmp_path / "shared.db")
+    start = threading.Barrier(4)
+    errors = []
+
+    def open_database():
+        start.wait()
+        try:
+            Database(path).close()
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=open_database) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    db = Database(path)
+    try:
+        with db._pool.reader() as conn:
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == len(Database._MIGRATIONS)
+    finally:
+        db.close()
@@ -0,0 +1,32 @@
+from registry import DatabaseRegistry
+
+
+def test_idle_sessions_do_not_keep_handles_open(tmp_path):
+    registry = DatabaseRegistry(str(tmp_path), max_open=8, idle_grace=0)
+    try:
+        # Each browser session keeps its bound database for as long as it lives
+        sessions = [registry.bind(f"user{n}") for n in range(100)]
+        for n, db in enumerate(sessions):
+            db.add_task(f"Task {n}")
+            assert len(registry) <= 8
+
+        assert registry.stats() == {"open": 8, "held": 0}
+        # A session whose handle was closed while idle reopens it on its next call
+        assert [task["title"] for task in sessions[0].get_all_tasks()] == ["Task 0"]
+        assert len(registry) <= 8
+    finally:
+        registry.close_all()
+
+
+def test_handle_is_held_while_a_call_runs(tmp_path):
+    registry = DatabaseRegistry(str(tmp_path), max_open=1, idle_grace=0)
+    try:
+        db = registry.bind("alex")
+        with registry.acquire("alex"):
+            # Another user's call can't close a handle that is in use
+            registry.bind("sam").get_all_tasks()
+            assert registry.stats()["held"] == 1
+            assert db.db_name == registry.path_for("alex")
+        assert db.add_task("Still open") > 0
+    finally:
+        registry.close_all()
@@ -0,0 +1,30 @@
+from datetime import date, timedelta
+
+
+def test_archived_pages_match_the_tasks_all_order(db):
+    long_ago = (date.today() - timedelta(days=400)).isoformat()
+    # Shared created_at values make the id tie-break matter across both tables
+    db.add_tasks_bulk(
+        dict(title=f"Task {n}", created_at=f"2026-01-{n // 3 + 1:02d} 09:00:00",
+             status="completed" if n % 3 else "pending",
+             completed_at=long_ago if n % 3 else None)
+        for n in range(40)
+    )
+    db.archive(task_age_days=90, log_retention_days=None, mood_retention_days=None)
+    assert db.archive_counts()['tasks'] > 0
+
+    for status in (None, "completed", "pending"):
+        with db._pool.reader() as conn:
+            expected = [dict(row) for row in conn.execute(
+                f'''SELECT * FROM tasks_all {"WHERE status = ?" if status else ""}
+                    ORDER BY created_at DESC, id DESC''', (status,) if status else ())]
+
+        pages, after = [], None
+        while True:
+            page = db.get_all_tasks(status, limit=7, after=after, archived=True)
+            pages.extend(page)
+            if len(page) < 7:
+                break
+            after = (page[-1]['created_at'], page[-1]['id'])
+        assert pages == expected
+        assert db.get_all_tasks(status, archived=True) == expected
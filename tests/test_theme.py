@@ -0,0 +1,49 @@
+import base64
+import json
+import re
+
+import theme
+
+
+def injected_css(markup):
+    """The stylesheet text the component script puts in the page <head>"""
+    match = re.search(r"style\.textContent = (\".*?(?<!\\)\");</script>$", markup)
+    assert match, markup
+    return json.loads(match.group(1))
+
+
+def test_markup_installs_every_rule():
+    css = theme.build_stylesheet()
+    markup = theme.theme_markup(css)
+
+    assert injected_css(markup) == css
+    assert markup.count("<script>") == 1
+    assert ".stApp{background-color:#f8f9fa}" in css
+    with open(theme.SOURCE, encoding="utf-8") as fp:
+        source = fp.read()
+    assert css.count("{") == source.count("{")
+
+
+def test_unbundled_font_is_not_referenced_by_url(tmp_path, monkeypatch):
+    monkeypatch.setattr(theme, "FONTS_DIR", str(tmp_path))
+    css = theme.build_stylesheet()
+
+    assert "url(" not in css
+    assert "src:local('Inter'),local('Inter Regular')}" in css
+
+
+def test_bundled_font_is_inlined(tmp_path, monkeypatch):
+    (tmp_path / "Inter-Variable.woff2").write_bytes(b"wOF2 font bytes")
+    monkeypatch.setattr(theme, "FONTS_DIR", str(tmp_path))
+    css = theme.build_stylesheet()
+
+    data = base64.b64encode(b"wOF2 font bytes").decode("ascii")
+    assert f"url(data:font/woff2;base64,{data}) format('woff2')" in css
+    assert "fonts/" not in css
+
+
+def test_closing_tag_in_css_cannot_end_the_script():
+    markup = theme.theme_markup("/* </script><script>alert(1) */")
+
+    assert markup.count("</script>") == 1
+    assert injected_css(markup) == "/* </script><script>alert(1) */"
@@ -0,0 +1,75 @@
+"""
+Theme stylesheet for Productivity Dashboard
+Minifies assets/theme.css, inlines bundled fonts, and wraps it for the page <head>
+"""
+
+import base64
+import json
+import os
+import re
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE = os.path.join(BASE_DIR, "assets", "theme.css")
+FONTS_DIR = os.path.join(BASE_DIR, "assets", "fonts")
+
+# id of the <style> element, so a repeat injection replaces rather than duplicates it
+STYLE_ID = "dashboard-theme"
+
+# A non-first font source such as `, url('fonts/Inter-Variable.woff2') format('woff2')`
+_FONT_SOURCE = re.compile(r",\s*url\('fonts/([^']+)'\)\s*format\('(\w+)'\)")
+
+
+def minify_css(css: str) -> str:
+    """Strip comments and insignificant whitespace from a stylesheet"""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    # Spaces before ':' are kept: in selectors they mean a descendant pseudo-class
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r":\s+", ":", css)
+    css = css.replace(";}", "}")
+    return css.strip()
+
+
+def inline_fonts(css: str) -> str:
+    """Embed fonts bundled in assets/fonts as data: URIs and drop sources that aren't bundled
+
+    Streamlit's static serving sends fonts and stylesheets as text/plain, so nothing
+    the theme needs may be fetched by URL.
+    """
+    def embed(match):
+        path = os.path.join(FONTS_DIR, match.group(1))
+        if not os.path.exists(path):
+            return ""
+        with open(path, "rb") as fp:
+            data = base64.b64encode(fp.read()).decode("ascii")
+        return f", url(data:font/{match.group(2)};base64,{data}) format('{match.group(2)}')"
+
+    return _FONT_SOURCE.sub(embed, css)
+
+
+def build_stylesheet() -> str:
+    """The minified theme with its fonts inlined"""
+    with open(SOURCE, encoding="utf-8") as fp:
+        return minify_css(inline_fonts(fp.read()))
+
+
+def theme_markup(css: str) -> str:
+    """HTML for a zero-height component that installs css in the app page's <head>
+
+    The <style> element outlives the component, so it only needs sending once
+    per session rather than on every rerun.
+    """
+    # "</" would end the script early if it appeared in the stylesheet
+    literal = json.dumps(css).replace("</", "<\\/")
+    return (
+        "<script>"
+        "const doc = window.parent.document;"
+        f"let style = doc.getElementById({json.dumps(STYLE_ID)});"
+        "if (!style) {"
+        "style = doc.createElement('style');"
+        f"style.id = {json.dumps(STYLE_ID)};"
+        "doc.head.appendChild(style);"
+        "}"
+        f"style.textContent = {literal};"
+        "</script>"
+    )